@@ -10,9 +10,27 @@ export const api = axios.create({
   timeout: 10000, // 10 second timeout
 });
 
+// Read-your-writes: for a few seconds after a write, ask the backend to
+// serve reads from the primary database instead of a lagging replica
+const READ_PRIMARY_MS = 5000;
+let lastWriteAt = 0;
+
+api.interceptors.request.use((config) => {
+  if (Date.now() - lastWriteAt < READ_PRIMARY_MS) {
+    config.headers.set("X-Read-Primary", "1");
+  }
+  return config;
+});
+
 // Add response interceptor for error handling
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const method = (response.config.method || "get").toLowerCase();
+    if (method !== "get" && method !== "head") {
+      lastWriteAt = Date.now();
+    }
+    return response;
+  },
   (error) => {
     const message = error.response?.data?.detail || error.message;
     console.error("API Error:", message);
@@ -117,8 +117,8 @@ export default function CustomerDetail() {
                     {loans.map((loan: any) => (
                       <TableRow key={loan.id}>
                         <TableCell className="font-mono text-sm">{loan.id.slice(0, 8)}</TableCell>
-                        <TableCell>₹{loan.principal_amount.toLocaleString()}</TableCell>
-                        <TableCell>₹{loan.total_amount.toLocaleString()}</TableCell>
+                        <TableCell>₹{Number(loan.principal_amount).toLocaleString()}</TableCell>
+                        <TableCell>₹{Number(loan.total_amount).toLocaleString()}</TableCell>
                         <TableCell>{new Date(loan.start_date).toLocaleDateString()}</TableCell>
                         <TableCell>
                           <span className="rounded-full bg-success/10 px-2 py-1 text-xs text-success">
@@ -150,15 +150,15 @@ export default function CustomerDetail() {
                       <div className="grid grid-cols-2 md:grid-cols-4 gap-2 text-sm">
                         <div>
                           <span className="text-muted-foreground">Total:</span>{" "}
-                          ₹{loan.total_amount.toLocaleString()}
+                          ₹{Number(loan.total_amount).toLocaleString()}
                         </div>
                         <div>
                           <span className="text-muted-foreground">Paid:</span>{" "}
-                          <span className="text-success">₹{loan.total_paid.toLocaleString()}</span>
+                          <span className="text-success">₹{Number(loan.total_paid).toLocaleString()}</span>
                         </div>
                         <div>
                           <span className="text-muted-foreground">Remaining:</span>{" "}
-                          <span className="text-warning">₹{loan.remaining_amount.toLocaleString()}</span>
+                          <span className="text-warning">₹{Number(loan.remaining_amount).toLocaleString()}</span>
                         </div>
                         <div>
                           <span className="text-muted-foreground">Status:</span> {loan.status}
@@ -41,7 +41,7 @@ export default function Dashboard() {
   }
 
   const chartData = [
-    { name: "Issued", value: summary?.total_issued || 0 },
+    { name: "Issued", value: Number(summary?.total_issued || 0) },
     { name: "Collected", value: summary?.collected || 0 },
     { name: "Pending", value: summary?.pending || 0 },
   ];
@@ -73,7 +73,7 @@ export default function Dashboard() {
         />
         <StatCard
           title="Total Issued"
-          value={`₹${(summary?.total_issued || 0).toLocaleString()}`}
+          value={`₹${Number(summary?.total_issued || 0).toLocaleString()}`}
           icon={TrendingUp}
           variant="default"
           href="/loans"
@@ -91,7 +91,7 @@ export default function Dashboard() {
       <div className="grid gap-3 sm:gap-4 grid-cols-2 lg:grid-cols-4">
         <StatCard
           title="Today's Collection"
-          value={`₹${(summary?.today_collection || 0).toLocaleString()}`}
+          value={`₹${Number(summary?.today_collection || 0).toLocaleString()}`}
           icon={DollarSign}
           variant="success"
           href="/payments"
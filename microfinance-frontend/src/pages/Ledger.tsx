@@ -94,19 +94,19 @@ export default function Ledger() {
                     <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
                       <div>
                         <p className="text-sm text-muted-foreground">Principal</p>
-                        <p className="text-lg font-semibold">₹{loan.principal_amount.toLocaleString()}</p>
+                        <p className="text-lg font-semibold">₹{Number(loan.principal_amount).toLocaleString()}</p>
                       </div>
                       <div>
                         <p className="text-sm text-muted-foreground">Interest</p>
-                        <p className="text-lg font-semibold">₹{loan.interest_amount.toLocaleString()}</p>
+                        <p className="text-lg font-semibold">₹{Number(loan.interest_amount).toLocaleString()}</p>
                       </div>
                       <div>
                         <p className="text-sm text-muted-foreground">Total Amount</p>
-                        <p className="text-lg font-semibold">₹{loan.total_amount.toLocaleString()}</p>
+                        <p className="text-lg font-semibold">₹{Number(loan.total_amount).toLocaleString()}</p>
                       </div>
                       <div>
                         <p className="text-sm text-muted-foreground">Installment</p>
-                        <p className="text-lg font-semibold">₹{loan.installment_amount.toLocaleString()}</p>
+                        <p className="text-lg font-semibold">₹{Number(loan.installment_amount).toLocaleString()}</p>
                       </div>
                     </div>
 
@@ -115,11 +115,11 @@ export default function Ledger() {
                     <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
                       <div>
                         <p className="text-sm text-muted-foreground">Total Paid</p>
-                        <p className="text-lg font-semibold text-success">₹{loan.total_paid.toLocaleString()}</p>
+                        <p className="text-lg font-semibold text-success">₹{Number(loan.total_paid).toLocaleString()}</p>
                       </div>
                       <div>
                         <p className="text-sm text-muted-foreground">Remaining</p>
-                        <p className="text-lg font-semibold text-warning">₹{loan.remaining_amount.toLocaleString()}</p>
+                        <p className="text-lg font-semibold text-warning">₹{Number(loan.remaining_amount).toLocaleString()}</p>
                       </div>
                       <div>
                         <p className="text-sm text-muted-foreground">Installments Paid</p>
@@ -168,7 +168,7 @@ export default function Ledger() {
                                 <TableRow key={payment.payment_id}>
                                   <TableCell>{new Date(payment.date).toLocaleDateString()}</TableCell>
                                   <TableCell className="text-success font-semibold">
-                                    ₹{payment.amount.toLocaleString()}
+                                    ₹{Number(payment.amount).toLocaleString()}
                                   </TableCell>
                                   <TableCell className="text-muted-foreground">
                                     {payment.notes || "-"}
@@ -70,7 +70,7 @@ export default function LoanDetail() {
     return <div className="text-center py-8">Loan not found</div>;
   }
 
-  const progress = (summary.total_paid / summary.total_amount) * 100;
+  const progress = (Number(summary.total_paid) / Number(summary.total_amount)) * 100;
 
   return (
     <div className="space-y-6">
@@ -138,7 +138,7 @@ export default function LoanDetail() {
             <CardTitle className="text-sm text-muted-foreground">Total Amount</CardTitle>
           </CardHeader>
           <CardContent>
-            <p className="text-2xl font-bold">₹{summary.total_amount.toLocaleString()}</p>
+            <p className="text-2xl font-bold">₹{Number(summary.total_amount).toLocaleString()}</p>
           </CardContent>
         </Card>
 
@@ -147,7 +147,7 @@ export default function LoanDetail() {
             <CardTitle className="text-sm text-muted-foreground">Total Paid</CardTitle>
           </CardHeader>
           <CardContent>
-            <p className="text-2xl font-bold text-success">₹{summary.total_paid.toLocaleString()}</p>
+            <p className="text-2xl font-bold text-success">₹{Number(summary.total_paid).toLocaleString()}</p>
           </CardContent>
         </Card>
 
@@ -39,8 +39,9 @@ export interface LoanSummary {
   customer_name: string;
   principal_amount: number;
   interest_amount: number;
-  total_amount: number;
-  total_paid: number;
+  // Money from /loans/{id}/summary is sent as exact decimal strings
+  total_amount: string;
+  total_paid: string;
   remaining: number;
   installment_amount: number;
   installments_paid: number;
@@ -54,12 +55,13 @@ export interface DashboardSummary {
   total_customers: number;
   total_loans: number;
   active_loans: number;
-  total_issued: number;
+  // Money from /dashboard/ is sent as exact decimal strings
+  total_issued: string;
   collected: number;
   pending: number;
   due_today: number;
   overdue: number;
-  today_collection: number;
+  today_collection: string;
 }
 
 export interface TodayCollection {
@@ -69,17 +71,18 @@ export interface TodayCollection {
   payment_date: string;
 }
 
+// Money in ledger responses is sent as exact decimal strings
 export interface LedgerEntry {
   loan_id: string;
-  principal_amount: number;
-  interest_amount: number;
-  total_amount: number;
-  installment_amount: number;
+  principal_amount: string;
+  interest_amount: string;
+  total_amount: string;
+  installment_amount: string;
   number_of_installments: number;
   installments_paid: number;
   installments_remaining: number;
-  total_paid: number;
-  remaining_amount: number;
+  total_paid: string;
+  remaining_amount: string;
   start_date: string;
   end_date: string;
   last_payment_date: string | null;
@@ -92,7 +95,7 @@ export interface LedgerEntry {
 
 export interface PaymentDetail {
   payment_id: string;
-  amount: number;
+  amount: string;
   date: string;
   notes?: string;
 }
@@ -0,0 +1,126 @@
+"""
+Maintenance commands.
+
+    python -m microfinance_backend.app.cli reconcile-balances [--dry-run]
+    python -m microfinance_backend.app.cli build-due-list [--date YYYY-MM-DD] [--days N]
+    python -m microfinance_backend.app.cli snapshot-loans
+    python -m microfinance_backend.app.cli purge-idempotency-keys [--hours N]
+    python -m microfinance_backend.app.cli rebuild-profiles
+"""
+import argparse
+import json
+from datetime import date, timedelta
+
+from .database import SessionLocal
+from .utils.balances import reconcile_balances
+from .utils.cache import loan_summary_cache
+from .utils.due_list import build_due_list
+from .utils.idempotency import purge_keys
+from .utils.loan_events import snapshot_loans
+from .utils.profiles import rebuild_profiles
+
+
+def cmd_reconcile_balances(args):
+    db = SessionLocal()
+    try:
+        drift = reconcile_balances(db, fix=not args.dry_run)
+    finally:
+        db.close()
+
+    # Shared (Redis) summaries may have been built from drifted balances
+    if drift and not args.dry_run:
+        loan_summary_cache.clear()
+
+    for item in drift:
+        print(json.dumps(item, default=str))
+
+    action = "reported" if args.dry_run else "fixed"
+    print(f"{len(drift)} drifted loan balance(s) {action}")
+
+
+def cmd_build_due_list(args):
+    db = SessionLocal()
+    try:
+        for offset in range(args.days):
+            day = args.date + timedelta(days=offset)
+            print(f"{day}: {build_due_list(db, day)} loan(s) due")
+    finally:
+        db.close()
+
+
+def cmd_snapshot_loans(args):
+    db = SessionLocal()
+    try:
+        written, changed = snapshot_loans(db)
+    finally:
+        db.close()
+
+    # Cached summaries carry the loan status
+    if changed:
+        loan_summary_cache.clear()
+
+    print(f"{written} loan snapshot(s) written, {changed} loan status(es) corrected")
+
+
+def cmd_purge_idempotency_keys(args):
+    db = SessionLocal()
+    try:
+        deleted = purge_keys(db, timedelta(hours=args.hours))
+    finally:
+        db.close()
+    print(f"{deleted} idempotency key(s) older than {args.hours} h deleted")
+
+
+def cmd_rebuild_profiles(args):
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_profiles(db)
+    finally:
+        db.close()
+    print(f"{rebuilt} customer profile(s) rebuilt")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="microfinance_backend.app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser(
+        "reconcile-balances",
+        help="Rebuild loan_balances from the payments table and report drift",
+    )
+    reconcile.add_argument("--dry-run", action="store_true", help="Report drift without rewriting rows")
+    reconcile.set_defaults(func=cmd_reconcile_balances)
+
+    due_list = commands.add_parser(
+        "build-due-list",
+        help="Precompute due_installments for collectors (run nightly)",
+    )
+    due_list.add_argument("--date", type=date.fromisoformat, default=date.today(), help="First day (default today)")
+    due_list.add_argument("--days", type=int, default=1, help="Number of consecutive days to build")
+    due_list.set_defaults(func=cmd_build_due_list)
+
+    snapshots = commands.add_parser(
+        "snapshot-loans",
+        help="Snapshot every loan with new events and write back its status",
+    )
+    snapshots.set_defaults(func=cmd_snapshot_loans)
+
+    purge = commands.add_parser(
+        "purge-idempotency-keys",
+        help="Forget Idempotency-Key responses older than --hours (run daily)",
+    )
+    purge.add_argument("--hours", type=int, default=72, help="Retention in hours (default 72)")
+    purge.set_defaults(func=cmd_purge_idempotency_keys)
+
+    profiles = commands.add_parser(
+        "rebuild-profiles",
+        help="Recompute every customer profile from loans and payments",
+    )
+    profiles.set_defaults(func=cmd_rebuild_profiles)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
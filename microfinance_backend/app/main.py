@@ -1,15 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from .database import Base, engine
-from .routers import customers, loans, payments, dashboard, ledger
+from .database import engine, async_engine, read_engine, async_read_engine
+from .routers import customers, loans, payments, dashboard, ledger, reports, exports, health, metrics, collections, jobs
 from fastapi.middleware.cors import CORSMiddleware
+from .utils.jobs import job_runner
+from .utils.metrics import QueryMetricsMiddleware, instrument
+from .utils.pagination import CURSOR_HEADER
+from .utils.read_routing import ReadYourWritesMiddleware
+from .utils.serialization import FastJSONResponse
 
 import logging
+import os
+
+# DEBUG floods the logs; slow statements are reported by the metrics module
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Background jobs run on their own bounded worker pool
+    job_runner.start()
+    yield
+    job_runner.shutdown()
 
-logging.basicConfig(level=logging.DEBUG)
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
 
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic: run `alembic upgrade head` before starting
 
 # include routers
 app.include_router(customers.router)
@@ -17,6 +35,19 @@ app.include_router(loans.router)
 app.include_router(payments.router)
 app.include_router(dashboard.router)
 app.include_router(ledger.router)
+app.include_router(reports.router)
+app.include_router(collections.router)
+app.include_router(exports.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(jobs.router)
+
+# Per-request SQL count / DB time (Server-Timing header and /metrics)
+instrument(engine)
+instrument(async_engine.sync_engine)
+if read_engine is not engine:
+    instrument(read_engine)
+    instrument(async_read_engine.sync_engine)
 
 @app.get("/")
 def root():
@@ -29,4 +60,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-)
\ No newline at end of file
+    expose_headers=[CURSOR_HEADER, "Server-Timing"],
+)
+
+app.add_middleware(ReadYourWritesMiddleware)
+
+app.add_middleware(QueryMetricsMiddleware)
\ No newline at end of file
@@ -2,3 +2,9 @@ from .customers import Customer
 from .loans import Loan
 from .loan_plans import LoanPlan
 from .payments import Payment 
+from .loan_balances import LoanBalance
+from .due_installments import DueInstallment, DueListBuild
+from .loan_events import LoanEvent, LoanSnapshot
+from .idempotency_keys import IdempotencyKey
+from .jobs import Job
+from .customer_profiles import CustomerProfile
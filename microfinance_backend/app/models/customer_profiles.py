@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Numeric, Integer, TIMESTAMP, ForeignKey, Uuid
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class CustomerProfile(Base):
+    """Per-customer risk and exposure aggregates, maintained on every loan and payment write."""
+    __tablename__ = "customer_profiles"
+
+    customer_id = Column(Uuid, ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True)
+
+    # Still owed on active loans
+    active_exposure = Column(Numeric(14, 2), nullable=False, server_default="0")
+    lifetime_borrowed = Column(Numeric(14, 2), nullable=False, server_default="0")   # principal
+    lifetime_repaid = Column(Numeric(14, 2), nullable=False, server_default="0")
+
+    payment_count = Column(Integer, nullable=False, server_default="0")
+    # Payments made on or before the due date of the installment they paid
+    on_time_payments = Column(Integer, nullable=False, server_default="0")
+    max_days_late = Column(Integer, nullable=False, server_default="0")
+
+    active_loans = Column(Integer, nullable=False, server_default="0")
+    completed_loans = Column(Integer, nullable=False, server_default="0")
+
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
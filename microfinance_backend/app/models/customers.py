@@ -1,20 +1,29 @@
-from sqlalchemy import Column, String, TIMESTAMP, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, TIMESTAMP, Index, text, Uuid
 from sqlalchemy.orm import relationship
 import uuid
 from ..database import Base
+from ..utils.pagination import stored_now
 from sqlalchemy import func
 
 class Customer(Base):
     __tablename__ = "customers"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     phone = Column(String, nullable=False)
     address = Column(String, nullable=True)
     id_proof_url = Column(String, nullable=True)
     status = Column(String, nullable=False, server_default="active")
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    # Written in one format on every database, see stored_now
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), default=stored_now())
 
     # FIX: relationship to Loan
-    loans = relationship("Loan", back_populates="customer")
\ No newline at end of file
+    loans = relationship("Loan", back_populates="customer")
+
+    __table_args__ = (
+        Index("ix_customers_created_at_id", "created_at", "id"),
+        # Search (Postgres; see migration 0004 for other databases)
+        Index("ix_customers_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_customers_address_trgm", "address", postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"}),
+        Index("ix_customers_phone_prefix", "phone", postgresql_ops={"phone": "varchar_pattern_ops"}),
+    )
\ No newline at end of file
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Numeric, Integer, Date, TIMESTAMP, ForeignKey, Index, Uuid
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class DueInstallment(Base):
+    """One row per loan with an installment due on `due_date`; rebuilt by the due-list job."""
+    __tablename__ = "due_installments"
+
+    due_date = Column(Date, primary_key=True)
+    loan_id = Column(Uuid, ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True)
+
+    customer_id = Column(Uuid, nullable=False)
+    # Collector of the loan's latest payment; NULL until someone has collected on it
+    collector_id = Column(Uuid, nullable=True)
+
+    installment_no = Column(Integer, nullable=False)
+    installment_amount = Column(Numeric(14, 2), nullable=False)
+    # Everything owed up to and including this installment, net of payments
+    amount_due = Column(Numeric(14, 2), nullable=False)
+    remaining_amount = Column(Numeric(14, 2), nullable=False)
+
+    computed_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_due_installments_due_date_collector_id", "due_date", "collector_id"),
+    )
+
+
+class DueListBuild(Base):
+    """One row per date whose due list has been built, written with its rows."""
+    __tablename__ = "due_list_builds"
+
+    due_date = Column(Date, primary_key=True)
+    loans_due = Column(Integer, nullable=False)
+
+    built_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
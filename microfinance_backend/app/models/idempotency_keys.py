@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, JSON, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class IdempotencyKey(Base):
+    """A client's Idempotency-Key and the response first returned for it."""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    endpoint = Column(String, nullable=False)
+    # SHA-256 of the request body; the same key with another body is refused
+    request_hash = Column(String(64), nullable=False)
+    response = Column(JSON, nullable=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
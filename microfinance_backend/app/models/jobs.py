@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, JSON, TIMESTAMP, Index, Uuid
+from sqlalchemy.sql import func
+import uuid
+from ..database import Base
+
+
+class Job(Base):
+    """A background job: heavy report or recomputation run off the request path."""
+    __tablename__ = "jobs"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    kind = Column(String, nullable=False)
+    params = Column(JSON, nullable=False)
+
+    status = Column(String, nullable=False, server_default="queued")   # queued | running | succeeded | failed
+    # Small summary for the status endpoint; full output goes to the artifact file
+    result = Column(JSON, nullable=True)
+    artifact_path = Column(String, nullable=True)
+    error = Column(String, nullable=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    started_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    # Stamped while the job runs; a stale one means its process is gone
+    heartbeat_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
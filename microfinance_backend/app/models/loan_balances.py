@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Numeric, Integer, Date, TIMESTAMP, ForeignKey, Uuid
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class LoanBalance(Base):
+    """Running per-loan totals, maintained on every payment write."""
+    __tablename__ = "loan_balances"
+
+    loan_id = Column(Uuid, ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True)
+
+    total_paid = Column(Numeric(14, 2), nullable=False, server_default="0")
+    payment_count = Column(Integer, nullable=False, server_default="0")
+    last_payment_date = Column(Date, nullable=True)
+    remaining_amount = Column(Numeric(14, 2), nullable=False)
+
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, Numeric, Integer, BigInteger, Date, TIMESTAMP, ForeignKey, Index, Uuid
+from sqlalchemy.sql import func
+from ..database import Base
+
+# SQLite only auto-increments INTEGER PRIMARY KEY columns
+EventId = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class LoanEvent(Base):
+    """Append-only history of a loan: disbursement, payment, reversal."""
+    __tablename__ = "loan_events"
+
+    id = Column(EventId, primary_key=True, autoincrement=True)
+    loan_id = Column(Uuid, ForeignKey("loans.id", ondelete="CASCADE"), nullable=False)
+
+    event_type = Column(String, nullable=False)   # disbursement | payment | reversal
+    amount = Column(Numeric(14, 2), nullable=False)
+    event_date = Column(Date, nullable=False)
+    # The payment recorded or reversed; not a foreign key, reversed payments are deleted
+    payment_id = Column(Uuid, nullable=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_loan_events_loan_id_id", "loan_id", "id"),
+    )
+
+
+class LoanSnapshot(Base):
+    """Loan state folded from its events up to and including `last_event_id`."""
+    __tablename__ = "loan_snapshots"
+
+    loan_id = Column(Uuid, ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True)
+    last_event_id = Column(EventId, nullable=False)
+
+    total_paid = Column(Numeric(14, 2), nullable=False)
+    payment_count = Column(Integer, nullable=False)
+    installments_paid = Column(Integer, nullable=False)
+    remaining_amount = Column(Numeric(14, 2), nullable=False)
+    status = Column(String, nullable=False)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
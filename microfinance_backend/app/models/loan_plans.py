@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Uuid
 from sqlalchemy.sql import func
 from ..database import Base
 import uuid
@@ -7,7 +6,7 @@ import uuid
 class LoanPlan(Base):
     __tablename__ = "loan_plans"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     plan_name = Column(String, nullable=False)
     payment_frequency = Column(String, nullable=False)
     description = Column(String, nullable=True)
@@ -1,16 +1,16 @@
-from sqlalchemy import Column, String, Numeric, Integer, Date, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, String, Numeric, Integer, Date, TIMESTAMP, ForeignKey, Index, Uuid
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from ..database import Base
+from ..utils.pagination import stored_now
 
 class Loan(Base):
     __tablename__ = "loans"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
 
-    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id", ondelete="CASCADE"), nullable=False)
+    customer_id = Column(Uuid, ForeignKey("customers.id", ondelete="CASCADE"), nullable=False)
 
     principal_amount = Column(Numeric(14, 2), nullable=False)
     interest_amount = Column(Numeric(14, 2), nullable=False)
@@ -28,9 +28,16 @@ class Loan(Base):
     status = Column(String, nullable=False, server_default="active")
     notes = Column(String, nullable=True)
 
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    # Written in one format on every database, see stored_now
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), default=stored_now())
 
     
     customer = relationship("Customer", back_populates="loans")
 
     payments = relationship("Payment", back_populates="loan")
+
+    __table_args__ = (
+        Index("ix_loans_customer_id", "customer_id"),
+        Index("ix_loans_status_end_date", "status", "end_date"),
+        Index("ix_loans_created_at_id", "created_at", "id"),
+    )
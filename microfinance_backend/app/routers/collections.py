@@ -0,0 +1,197 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+from ..database import get_async_db, get_async_read_db
+from .. import models
+from ..utils.due_list import build_due_list
+from ..utils.pagination import CURSOR_HEADER, paginate, next_cursor
+from ..utils.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/collections", tags=["Collections"])
+
+
+# ---------------------------------------------------
+# COLLECTIONS OVER A DATE RANGE
+# ---------------------------------------------------
+@router.get("/")
+async def list_collections(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    collector_id: UUID | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Payments collected between `date_from` and `date_to` (both default to
+    today), newest first, with per-day totals.
+
+    Filters are plain range / equality predicates on `payment_date` and
+    `collector_id` so they can use the payments indexes. Full pages carry
+    an `X-Next-Cursor` header like the other listings.
+    """
+    today = date.today()
+    date_from = date_from or today
+    date_to = date_to or today
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+
+    payment = models.Payment
+    filters = [payment.payment_date >= date_from, payment.payment_date <= date_to]
+    if collector_id:
+        filters.append(payment.collector_id == collector_id)
+
+    try:
+        statement = paginate(
+            select(
+                payment.id,
+                payment.created_at,
+                payment.paid_amount,
+                payment.payment_date,
+                payment.collector_id,
+                payment.notes,
+                models.Loan.id.label("loan_id"),
+                models.Loan.installment_amount,
+                models.Customer.name.label("customer_name"),
+                models.Customer.phone.label("customer_phone"),
+            )
+            .join(models.Loan, payment.loan_id == models.Loan.id)
+            .join(models.Customer, models.Loan.customer_id == models.Customer.id)
+            .where(*filters),
+            payment.created_at,
+            payment.id,
+            skip,
+            limit,
+            cursor,
+            descending=True,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    rows = (await db.execute(statement)).all()
+
+    # Totals for the whole range, not just this page
+    daily = (await db.execute(
+        select(
+            payment.payment_date,
+            func.count(payment.id),
+            func.coalesce(func.sum(payment.paid_amount), 0),
+        )
+        .where(*filters)
+        .group_by(payment.payment_date)
+        .order_by(payment.payment_date)
+    )).all()
+
+    next_page = next_cursor(rows, limit)
+    headers = {CURSOR_HEADER: next_page} if next_page else None
+
+    # Money stays Decimal and is written as an exact string
+    daily_totals = [
+        {"date": day, "collections": count, "amount": amount}
+        for day, count, amount in daily
+    ]
+
+    return FastJSONResponse({
+        "date_from": date_from,
+        "date_to": date_to,
+        "collector_id": collector_id,
+        "total_collections": sum(d["collections"] for d in daily_totals),
+        "total_amount": sum((d["amount"] for d in daily_totals), Decimal(0)),
+        "daily_totals": daily_totals,
+        "payments": [
+            {
+                "payment_id": str(p.id),
+                "customer_name": p.customer_name,
+                "customer_phone": p.customer_phone,
+                "loan_id": str(p.loan_id),
+                "collector_id": str(p.collector_id) if p.collector_id else None,
+                "installment_amount": p.installment_amount,
+                "paid_amount": p.paid_amount,
+                "payment_date": p.payment_date,
+                "notes": p.notes,
+            }
+            for p in rows
+        ],
+    }, headers=headers)
+
+
+# ---------------------------------------------------
+# DUE LIST (PRECOMPUTED ROUTE SHEET)
+# ---------------------------------------------------
+@router.get("/due")
+async def list_due(
+    day: date | None = Query(None, alias="date"),
+    collector_id: UUID | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Loans with an installment due on `date` (default today) and the amount
+    to collect, read from `due_installments`. A date that has not been
+    built yet (nightly job, `cli build-due-list` or POST /collections/due/build)
+    is a 404.
+    """
+    day = day or date.today()
+    due = models.DueInstallment
+
+    statement = (
+        select(
+            due.loan_id,
+            due.collector_id,
+            due.installment_no,
+            due.installment_amount,
+            due.amount_due,
+            due.remaining_amount,
+            models.Customer.id.label("customer_id"),
+            models.Customer.name.label("customer_name"),
+            models.Customer.phone.label("customer_phone"),
+            models.Customer.address.label("customer_address"),
+        )
+        .join(models.Customer, models.Customer.id == due.customer_id)
+        .where(due.due_date == day)
+        .order_by(models.Customer.name, due.loan_id)
+    )
+    if collector_id:
+        statement = statement.where(due.collector_id == collector_id)
+
+    rows = (await db.execute(statement)).all()
+    if not rows:
+        built = await db.get(models.DueListBuild, day)
+        if built is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Due list for {day} has not been built (POST /collections/due/build)",
+            )
+
+    return FastJSONResponse({
+        "date": day,
+        "collector_id": collector_id,
+        "total_loans": len(rows),
+        "total_due": sum((r.amount_due for r in rows), Decimal(0)),
+        "loans": [
+            {
+                "loan_id": str(r.loan_id),
+                "customer_id": str(r.customer_id),
+                "customer_name": r.customer_name,
+                "customer_phone": r.customer_phone,
+                "customer_address": r.customer_address,
+                "collector_id": str(r.collector_id) if r.collector_id else None,
+                "installment_no": r.installment_no,
+                "installment_amount": r.installment_amount,
+                "amount_due": r.amount_due,
+                "remaining_amount": r.remaining_amount,
+            }
+            for r in rows
+        ],
+    })
+
+
+@router.post("/due/build")
+async def rebuild_due(day: date | None = Query(None, alias="date"), db: AsyncSession = Depends(get_async_db)):
+    """Recompute the due list for `date` (default today) now."""
+    day = day or date.today()
+    count = await db.run_sync(build_due_list, day)
+    return {"date": day, "loans_due": count}
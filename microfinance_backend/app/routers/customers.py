@@ -1,16 +1,24 @@
 # app/routers/customers.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 
 from typing import List
 from uuid import UUID
 from ..schemas.loans import CustomerLoanList, CustomerLoanItem
 
-from ..database import get_db
+from ..database import get_db, get_read_db, get_async_read_db
+from ..utils.cache import dashboard_cache, loan_summary_cache
+from ..utils.pagination import CURSOR_HEADER, paginate, next_cursor
+from ..utils.profiles import PROFILE_FIELDS, compute_profiles, open_profile
+from ..utils.search import MIN_QUERY_LENGTH, search_statement
+from ..utils.serialization import FastJSONResponse, rows_to_dicts
+from ..utils.summaries import summary_statement, group_by_customer
 from .. import models
 from ..schemas.customers import (
     CustomerCreate,
+    CustomerProfileResponse,
     CustomerResponse,
     CustomerUpdate,
 )
@@ -27,20 +35,74 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
         id_proof_url=payload.id_proof_url,
     )
     db.add(new_customer)
+    db.flush()
+    open_profile(db, new_customer.id)
     db.commit()
+    dashboard_cache.clear()
     db.refresh(new_customer)
     return new_customer
 
 
 @router.get("/", response_model=List[CustomerResponse])
-def list_customers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List customers with simple pagination"""
-    customers = db.query(models.Customer).offset(skip).limit(limit).all()
+async def list_customers(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    List customers, oldest first.
+
+    Full pages carry an `X-Next-Cursor` header; pass it back as `cursor` to
+    fetch the next page without an OFFSET scan. `skip` still works.
+    """
+    try:
+        statement = paginate(
+            select(models.Customer),
+            models.Customer.created_at,
+            models.Customer.id,
+            skip,
+            limit,
+            cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    customers = (await db.execute(statement)).scalars().all()
+
+    next_page = next_cursor(customers, limit)
+    if next_page:
+        response.headers[CURSOR_HEADER] = next_page
     return customers
 
 
+@router.get("/search", response_model=List[CustomerResponse])
+async def search_customers(
+    q: str,
+    skip: int = 0,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Find customers by name, address or phone, best matches first.
+
+    Digits match phone numbers by prefix; text matches name and address
+    (substring, plus misspellings on Postgres). Page with `skip`/`limit`.
+    """
+    if len(q.strip()) < MIN_QUERY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search needs at least {MIN_QUERY_LENGTH} characters",
+        )
+    limit = min(limit, 100)
+
+    statement = search_statement(db.bind.dialect.name, q).offset(skip).limit(limit)
+    return (await db.execute(statement)).scalars().all()
+
+
 @router.get("/{customer_id}", response_model=CustomerResponse)
-def get_customer(customer_id: UUID, db: Session = Depends(get_db)):
+def get_customer(customer_id: UUID, db: Session = Depends(get_read_db)):
     customer = db.query(models.Customer).filter(models.Customer.id == customer_id).first()
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
@@ -60,6 +122,7 @@ def update_customer(customer_id: UUID, payload: CustomerUpdate, db: Session = De
 
     db.add(customer)
     db.commit()
+    dashboard_cache.clear()
     db.refresh(customer)
     return customer
 
@@ -71,27 +134,63 @@ def delete_customer(customer_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
     db.delete(customer)
     db.commit()
+    dashboard_cache.clear()
+    # Their loans are gone with them
+    loan_summary_cache.clear()
     return None
 
 
+@router.get("/{customer_id}/profile", response_model=CustomerProfileResponse)
+def get_customer_profile(customer_id: UUID, db: Session = Depends(get_read_db)):
+    """Exposure and repayment record, read from the precomputed profile row."""
+    profile = db.get(models.CustomerProfile, customer_id)
+    if profile is not None:
+        values = {field: getattr(profile, field) for field in PROFILE_FIELDS}
+    else:
+        # Customers from before profiles existed, until `rebuild-profiles` runs
+        if db.get(models.Customer, customer_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+        values = compute_profiles(db, [customer_id])[customer_id]
+
+    count = values["payment_count"]
+    return {
+        "customer_id": customer_id,
+        "on_time_ratio": values["on_time_payments"] / count if count else None,
+        **values,
+    }
+
+
 @router.get("/{customer_id}/loans")
-def get_customer_loans(customer_id: str, db: Session = Depends(get_db)):
+def get_customer_loans(customer_id: UUID, db: Session = Depends(get_read_db)):
 
     customer = db.query(models.Customer).filter(models.Customer.id == customer_id).first()
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    loans = db.query(models.Loan).filter(models.Loan.customer_id == customer_id).all()
-
-    return [
-        {
-            "id": loan.id,
-            "principal_amount": float(loan.principal_amount),
-            "total_amount": float(loan.total_amount),
-            "installment_amount": float(loan.installment_amount),
-            "repayment_frequency": loan.repayment_frequency,
-            "start_date": loan.start_date,
-            "status": loan.status  # 🔥 required for Payments UI
-        }
-        for loan in loans
-    ]
+    loans = (
+        db.query(
+            models.Loan.id,
+            models.Loan.principal_amount,
+            models.Loan.total_amount,
+            models.Loan.installment_amount,
+            models.Loan.repayment_frequency,
+            models.Loan.start_date,
+            models.Loan.status,  # 🔥 required for Payments UI
+        )
+        .filter(models.Loan.customer_id == customer_id)
+        .all()
+    )
+
+    return FastJSONResponse(rows_to_dicts(loans))
+
+
+@router.get("/{customer_id}/loans/summary", response_model=CustomerLoanList)
+async def get_customer_loan_summaries(customer_id: UUID, db: AsyncSession = Depends(get_async_read_db)):
+    """Summary of every loan of a customer in one query, for the loan cards."""
+    customer = await db.get(models.Customer, customer_id)
+    if not customer:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+
+    rows = (await db.execute(summary_statement(models.Loan.customer_id == customer_id))).all()
+    grouped = group_by_customer(rows)
+    return grouped[0] if grouped else {"customer_id": customer_id, "loans": []}
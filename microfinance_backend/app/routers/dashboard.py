@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, Date, cast
-from datetime import date, timedelta
-from ..database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, case, and_, select
+from datetime import date, datetime, timezone
+from ..database import get_async_read_db
 from .. import models
+from ..utils.cache import dashboard_cache
+from ..utils.serialization import FastJSONResponse, rows_to_dicts
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -12,59 +14,73 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 # 1) MAIN DASHBOARD STATS
 # ---------------------------------------------------
 @router.get("/")
-def dashboard_stats(db: Session = Depends(get_db)):
+async def dashboard_stats(db: AsyncSession = Depends(get_async_read_db)):
 
     today = date.today()
 
-    # Total Customers
-    total_customers = db.query(models.Customer).count()
-
-    # Total Loans
-    total_loans = db.query(models.Loan).count()
-
-    # Active Loans
-    active_loans = db.query(models.Loan).filter(models.Loan.status == "active").count()
-
-    # Total Loan Amount Issued
-    total_issued = db.query(func.coalesce(func.sum(models.Loan.total_amount), 0)).scalar()
-
-    # Total Collected (Payments)
-    total_collected = db.query(func.coalesce(func.sum(models.Payment.paid_amount), 0)).scalar()
-
-    # Pending Amount
-    pending_amount = total_issued - total_collected
-
-    # Due Today (simple: loans active and today within loan range)
-    due_today = db.query(models.Loan).filter(
-        models.Loan.start_date <= today,
-        models.Loan.end_date >= today,
-        models.Loan.status == "active"
-    ).count()
-
-    # Overdue Loans (end date < today)
-    overdue_loans = db.query(models.Loan).filter(
-        models.Loan.end_date < today,
-        models.Loan.status == "active"
-    ).count()
-
-    # Today total collection
-    today_collection = db.query(
-        func.coalesce(func.sum(models.Payment.paid_amount), 0)
-    ).filter(
-        cast(models.Payment.payment_date, Date) == today
-    ).scalar()
-
-    return {
-        "total_customers": total_customers,
-        "total_loans": total_loans,
-        "active_loans": active_loans,
-        "total_issued": float(total_issued),
-        "total_collected": float(total_collected),
-        "pending_amount": float(pending_amount),
-        "due_today": due_today,
-        "overdue_loans": overdue_loans,
-        "today_collection": float(today_collection)
+    # Served from the in-process cache until the TTL expires or a write clears it
+    cached = dashboard_cache.get(today.isoformat())
+    if cached is not None:
+        return FastJSONResponse({**cached, "cached": True})
+
+    loan = models.Loan
+    balance = models.LoanBalance
+    is_active = loan.status == "active"
+
+    total_customers = select(func.count(models.Customer.id)).scalar_subquery()
+
+    today_collection = (
+        select(func.coalesce(func.sum(models.Payment.paid_amount), 0))
+        .where(models.Payment.payment_date == today)
+        .scalar_subquery()
+    )
+
+    # Loans without a balance row yet fall back to a per-loan SUM, which the
+    # CASE keeps from running for the others
+    summed = (
+        select(func.coalesce(func.sum(models.Payment.paid_amount), 0))
+        .where(models.Payment.loan_id == loan.id)
+        .scalar_subquery()
+    )
+    total_paid = case((balance.loan_id.is_(None), summed), else_=balance.total_paid)
+
+    # Every loan metric in one conditional-aggregation scan
+    stats = (await db.execute(
+        select(
+            total_customers.label("total_customers"),
+            func.count(loan.id).label("total_loans"),
+            func.coalesce(func.sum(case((is_active, 1), else_=0)), 0).label("active_loans"),
+            func.coalesce(func.sum(loan.total_amount), 0).label("total_issued"),
+            func.coalesce(func.sum(total_paid), 0).label("total_collected"),
+            # Due Today (simple: loans active and today within loan range)
+            func.coalesce(func.sum(case(
+                (and_(is_active, loan.start_date <= today, loan.end_date >= today), 1), else_=0
+            )), 0).label("due_today"),
+            # Overdue Loans (end date < today)
+            func.coalesce(func.sum(case(
+                (and_(is_active, loan.end_date < today), 1), else_=0
+            )), 0).label("overdue_loans"),
+            today_collection.label("today_collection"),
+        )
+        .select_from(loan)
+        .outerjoin(balance, balance.loan_id == loan.id)
+    )).one()
+
+    result = {
+        "total_customers": stats.total_customers,
+        "total_loans": stats.total_loans,
+        "active_loans": int(stats.active_loans),
+        "total_issued": stats.total_issued,
+        "total_collected": stats.total_collected,
+        "pending_amount": stats.total_issued - stats.total_collected,
+        "due_today": int(stats.due_today),
+        "overdue_loans": int(stats.overdue_loans),
+        "today_collection": stats.today_collection,
+        "snapshot_at": datetime.now(timezone.utc),
     }
+    dashboard_cache.set(today.isoformat(), result)
+
+    return FastJSONResponse({**result, "cached": False})
 
 
 
@@ -72,44 +88,29 @@ def dashboard_stats(db: Session = Depends(get_db)):
 # 2) TODAY'S COLLECTION LIST
 # ---------------------------------------------------
 @router.get("/today-collection")
-def today_collection_list(db: Session = Depends(get_db)):
+async def today_collection_list(db: AsyncSession = Depends(get_async_read_db)):
     today = date.today()
 
-    # Fetch all payments for today
-    payments = (
-        db.query(
-            models.Payment.id,
+    # Rows come back already shaped like the response items
+    payments = (await db.execute(
+        select(
+            models.Payment.id.label("payment_id"),
+            models.Customer.name.label("customer_name"),
+            models.Customer.phone.label("customer_phone"),
+            models.Loan.id.label("loan_id"),
+            models.Loan.installment_amount,
             models.Payment.paid_amount,
             models.Payment.payment_date,
             models.Payment.notes,
-            models.Loan.id.label("loan_id"),
-            models.Customer.name.label("customer_name"),
-            models.Customer.phone.label("customer_phone"),
-            models.Loan.installment_amount
         )
         .join(models.Loan, models.Payment.loan_id == models.Loan.id)
         .join(models.Customer, models.Loan.customer_id == models.Customer.id)
-        .filter(cast(models.Payment.payment_date, Date) == today)
+        .where(models.Payment.payment_date == today)
         .order_by(models.Payment.payment_date.desc())
-        .all()
-    )
+    )).all()
 
-    result = []
-
-    for p in payments:
-        result.append({
-            "payment_id": str(p.id),
-            "customer_name": p.customer_name,
-            "customer_phone": p.customer_phone,
-            "loan_id": str(p.loan_id),
-            "installment_amount": float(p.installment_amount),
-            "paid_amount": float(p.paid_amount),
-            "payment_date": p.payment_date,
-            "notes": p.notes
-        })
-
-    return {
+    return FastJSONResponse({
         "date": today,
-        "total_collections": len(result),
-        "payments": result
-    }
+        "total_collections": len(payments),
+        "payments": rows_to_dicts(payments)
+    })
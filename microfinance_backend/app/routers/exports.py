@@ -0,0 +1,77 @@
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..database import get_read_db, read_session_factory
+from .. import models
+from ..utils.exports import (
+    MEDIA_TYPES,
+    export_chunks,
+    loans_statement,
+    payments_statement,
+    customer_ledger_statement,
+)
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+def _stream(statement, fmt: str, session_factory):
+    """
+    Yield the export's chunks on a session of its own (replica or primary,
+    as for the request), because the request's session is closed before the
+    body is streamed.
+    """
+    db = session_factory()
+    try:
+        yield from export_chunks(db, statement, fmt)
+    finally:
+        db.close()
+
+
+def _response(statement, fmt: str, filename: str, request: Request):
+    if fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid format (use csv or ndjson)")
+    return StreamingResponse(
+        _stream(statement, fmt, read_session_factory(request)),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+# ---------------------------------------------------
+# 1) LOANS
+# ---------------------------------------------------
+@router.get("/loans")
+def export_loans(request: Request, format: str = "csv"):
+    return _response(loans_statement(), format, "loans", request)
+
+
+# ---------------------------------------------------
+# 2) PAYMENTS
+# ---------------------------------------------------
+@router.get("/payments")
+def export_payments(
+    request: Request,
+    format: str = "csv",
+    date_from: date | None = None,
+    date_to: date | None = None,
+):
+    return _response(payments_statement(date_from, date_to), format, "payments", request)
+
+
+# ---------------------------------------------------
+# 3) CUSTOMER LEDGER (one row per payment, loans without payments included)
+# ---------------------------------------------------
+@router.get("/customers/{customer_id}/ledger")
+def export_customer_ledger(
+    request: Request, customer_id: UUID, format: str = "csv", db: Session = Depends(get_read_db)
+):
+
+    customer = db.query(models.Customer.id).filter(models.Customer.id == customer_id).first()
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+
+    return _response(customer_ledger_statement(customer_id), format, f"ledger-{customer_id}", request)
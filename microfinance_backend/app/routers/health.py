@@ -0,0 +1,49 @@
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..database import engine, async_engine, read_engine, async_read_engine, pool_stats
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+def _pool_status(pool):
+    # Only QueuePool-style pools expose sizing; SQLite pools may not
+    status = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    return status
+
+
+# ---------------------------------------------------
+# DATABASE / CONNECTION POOL HEALTH
+# ---------------------------------------------------
+@router.get("/db")
+def db_health():
+
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        error = None
+    except SQLAlchemyError as exc:
+        error = str(exc.__class__.__name__)
+    latency_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    body = {
+        "status": "ok" if error is None else "unavailable",
+        "error": error,
+        "ping_ms": latency_ms,
+        "pool": _pool_status(engine.pool),
+        "async_pool": _pool_status(async_engine.pool),
+        "stats": pool_stats.snapshot(),
+    }
+    if read_engine is not engine:
+        body["read_pool"] = _pool_status(read_engine.pool)
+        body["async_read_pool"] = _pool_status(async_read_engine.pool)
+    return JSONResponse(body, status_code=200 if error is None else 503)
@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from .. import models
+from ..schemas.jobs import JobCreate, JobResponse
+from ..utils.exports import MEDIA_TYPES
+from ..utils.jobs import JOB_KINDS, JobQueueFull, job_runner
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+ARTIFACT_MEDIA_TYPES = {".json": "application/json", **{f".{fmt}": media for fmt, media in MEDIA_TYPES.items()}}
+
+
+def _job_body(job):
+    body = {column.name: getattr(job, column.name) for column in models.Job.__table__.columns}
+    body["artifact_url"] = f"/jobs/{job.id}/artifact" if job.artifact_path else None
+    return body
+
+
+# ---------------------------------------------------
+# SUBMIT / POLL
+# ---------------------------------------------------
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_job(payload: JobCreate, db: Session = Depends(get_db)):
+    """Queue a heavy report or recomputation; poll GET /jobs/{id} for the result."""
+    try:
+        job = job_runner.submit(db, payload.kind, payload.params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except JobQueueFull as exc:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc))
+    return _job_body(job)
+
+
+@router.get("/kinds")
+def list_job_kinds():
+    return sorted(JOB_KINDS)
+
+
+@router.get("/", response_model=List[JobResponse])
+def list_jobs(status: str | None = None, limit: int = 50, db: Session = Depends(get_db)):
+    """Most recent jobs first, optionally only those in one status."""
+    statement = select(models.Job).order_by(models.Job.created_at.desc()).limit(min(limit, 200))
+    if status:
+        statement = statement.where(models.Job.status == status)
+    return [_job_body(job) for job in db.execute(statement).scalars()]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: UUID, db: Session = Depends(get_db)):
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_body(job)
+
+
+@router.get("/{job_id}/artifact")
+def get_job_artifact(job_id: UUID, db: Session = Depends(get_db)):
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job.artifact_path or not Path(job.artifact_path).is_file():
+        raise HTTPException(status_code=404, detail="Job has no artifact")
+
+    path = Path(job.artifact_path)
+    return FileResponse(
+        path,
+        media_type=ARTIFACT_MEDIA_TYPES.get(path.suffix, "application/octet-stream"),
+        filename=f"{job.kind}-{job.id}{path.suffix}",
+    )
@@ -1,29 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import timedelta, date
-from ..database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import date
+from ..database import get_db, get_async_db, get_async_read_db
 from .. import models
-from ..schemas.loans import LoanCreate, LoanResponse, LoanSummary
+from ..schemas.loans import (
+    LoanCreate, LoanResponse, LoanSummary, LoanSummaryRequest, CustomerLoanList, BulkLoanResult,
+    LoanEventResponse, LoanState,
+)
+from ..utils.balances import open_balance, compute_totals
+from ..utils.bulk_loans import parse_loan_rows, disburse_loans
+from ..utils.cache import dashboard_cache, loan_summary_cache
+from ..utils.loan_events import record_event, loan_state
+from ..utils.pagination import CURSOR_HEADER, paginate, next_cursor
+from ..utils.profiles import exposure_error, limits_enabled, lock_profiles, record_loans
+from ..utils.schedule import FREQUENCIES, installment_due_date, next_due_date
+from ..utils.summaries import summary_statement, group_by_customer
 import math
 from typing import List
+from uuid import UUID
 from ..schemas.loans import LoanResponse
 router = APIRouter(prefix="/loans", tags=["Loans"])
 
-
-# Utility function to safely add a month
-def add_month(d: date):
-    month = d.month + 1
-    year = d.year
-    if month > 12:
-        month = 1
-        year += 1
-
-    # Days in each month
-    month_days = [31, 29 if year % 4 == 0 else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-
-    day = min(d.day, month_days[month - 1])
-    return date(year, month, day)
+MAX_SUMMARY_LOANS = 500
 
 
 # ----------------------------------
@@ -41,17 +42,19 @@ def create_loan(payload: LoanCreate, db: Session = Depends(get_db)):
     # Installments count
     number_of_installments = math.ceil(total_amount / payload.installment_amount)
 
-    # Duration
-    if payload.repayment_frequency == "daily":
-        duration_days = number_of_installments
-    elif payload.repayment_frequency == "weekly":
-        duration_days = number_of_installments * 7
-    elif payload.repayment_frequency == "monthly":
-        duration_days = number_of_installments * 30
-    else:
+    if payload.repayment_frequency not in FREQUENCIES:
         raise HTTPException(status_code=400, detail="Invalid repayment frequency")
 
-    end_date = payload.start_date + timedelta(days=duration_days)
+    if limits_enabled():
+        # One locked primary-key read of the customer's running profile
+        active_exposure, active_loans = lock_profiles(db, [payload.customer_id])[payload.customer_id]
+        error = exposure_error(active_exposure, active_loans, total_amount)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+
+    # Duration runs to the last installment's due date
+    end_date = installment_due_date(payload.start_date, payload.repayment_frequency, number_of_installments)
+    duration_days = (end_date - payload.start_date).days
 
     new_loan = models.Loan(
         customer_id=payload.customer_id,
@@ -68,81 +71,172 @@ def create_loan(payload: LoanCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_loan)
+    db.flush()
+    open_balance(db, new_loan)
+    record_event(db, new_loan.id, "disbursement", new_loan.total_amount, new_loan.start_date)
+    record_loans(db, [new_loan])
+
     db.commit()
+    dashboard_cache.clear()
     db.refresh(new_loan)
     return new_loan
 
 
+# ----------------------------------
+# BULK DISBURSEMENT (GROUP LENDING)
+# ----------------------------------
+@router.post("/bulk", response_model=BulkLoanResult)
+async def create_loans_bulk(request: Request, mode: str = "all_or_nothing", db: Session = Depends(get_db)):
+    """
+    Accept a JSON array or NDJSON stream of loans (same fields as POST /loans/).
+    Results come back in request order; `mode` works as for /payments/bulk.
+    """
+    if mode not in ("all_or_nothing", "partial"):
+        raise HTTPException(status_code=400, detail="Invalid mode")
+
+    body = await request.body()
+    try:
+        rows = parse_loan_rows(body, request.headers.get("content-type", ""))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    result = await run_in_threadpool(disburse_loans, db, rows, mode == "all_or_nothing")
+    if result["created"]:
+        dashboard_cache.clear()
+    return result
+
 
 # ----------------------------------
 # LOAN SUMMARY
 # ----------------------------------
 @router.get("/{loan_id}/summary", response_model=LoanSummary)
-def get_loan_summary(loan_id: str, db: Session = Depends(get_db)):
+async def get_loan_summary(loan_id: UUID, db: AsyncSession = Depends(get_async_db)):
+
+    today = date.today()
 
-    loan = db.query(models.Loan).filter(models.Loan.id == loan_id).first()
-    if not loan:
+    # Overdue fields depend on the day, so entries from yesterday are stale.
+    # Reads stay on the primary: a lagging replica could refill the cache
+    # with a summary that a payment has just invalidated.
+    cached = loan_summary_cache.get(str(loan_id))
+    if cached is not None and cached["as_of"] == today.isoformat():
+        return cached["summary"]
+
+    row = (await db.execute(
+        select(models.Loan, models.LoanBalance)
+        .outerjoin(models.LoanBalance, models.LoanBalance.loan_id == models.Loan.id)
+        .where(models.Loan.id == loan_id)
+    )).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Loan not found")
+    loan, balance = row
 
-    total_paid = (
-        db.query(func.coalesce(func.sum(models.Payment.paid_amount), 0))
-        .filter(models.Payment.loan_id == loan_id)
-        .scalar()
-    )
+    # Served from the running balance; loans not yet reconciled fall back to SUM
+    if balance is not None:
+        total_paid = balance.total_paid
+        last_payment_date = balance.last_payment_date
+    else:
+        total_paid, _, last_payment_date = await db.run_sync(compute_totals, loan.id)
 
-    remaining_amount = float(loan.total_amount) - float(total_paid)
+    remaining_amount = loan.total_amount - total_paid
 
     installments_paid = int(total_paid / loan.installment_amount)
     installments_remaining = loan.number_of_installments - installments_paid
 
-    # Last payment date
-    last_payment = (
-        db.query(models.Payment.payment_date)
-        .filter(models.Payment.loan_id == loan_id)
-        .order_by(models.Payment.payment_date.desc())
-        .first()
-    )
-    last_payment_date = last_payment[0] if last_payment else None
-
     # NEXT DUE DATE
     if last_payment_date is None:
-        next_due_date = loan.start_date
+        next_due = loan.start_date
     else:
-        if loan.repayment_frequency == "daily":
-            next_due_date = last_payment_date + timedelta(days=1)
-        elif loan.repayment_frequency == "weekly":
-            next_due_date = last_payment_date + timedelta(days=7)
-        elif loan.repayment_frequency == "monthly":
-            next_due_date = add_month(last_payment_date)
+        next_due = next_due_date(loan.repayment_frequency, last_payment_date)
 
     # OVERDUE CALCULATION
-    today = date.today()
-    is_overdue = today > next_due_date
-    overdue_days = (today - next_due_date).days if is_overdue else 0
+    is_overdue = today > next_due
+    overdue_days = (today - next_due).days if is_overdue else 0
 
-    status = "completed" if remaining_amount <= 0 else "active"
-
-    return {
+    summary = {
         "loan_id": str(loan.id),
-        "total_amount": float(loan.total_amount),
-        "total_paid": float(total_paid),
+        "total_amount": loan.total_amount,
+        "total_paid": total_paid,
         "remaining_amount": remaining_amount,
         "installments_paid": installments_paid,
         "installments_remaining": installments_remaining,
-        "next_due_date": next_due_date,
+        "next_due_date": next_due,
         "last_payment_date": last_payment_date,
         "is_overdue": is_overdue,
         "overdue_days": overdue_days,
-        "status": status
+        # Written back by the event log as payments and reversals land
+        "status": loan.status
     }
+    loan_summary_cache.set(str(loan.id), {"as_of": today.isoformat(), "summary": summary})
+
+    return summary
+
+
+# ----------------------------------
+# EVENT LOG
+# ----------------------------------
+@router.get("/{loan_id}/state", response_model=LoanState)
+async def get_loan_state(loan_id: UUID, db: AsyncSession = Depends(get_async_read_db)):
+    """Latest snapshot plus a replay of the events written after it."""
+    state = await db.run_sync(loan_state, loan_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Loan not found")
+    return state
+
+
+@router.get("/{loan_id}/events", response_model=List[LoanEventResponse])
+async def get_loan_events(loan_id: UUID, db: AsyncSession = Depends(get_async_read_db)):
+    events = (await db.execute(
+        select(models.LoanEvent)
+        .where(models.LoanEvent.loan_id == loan_id)
+        .order_by(models.LoanEvent.id)
+    )).scalars().all()
+    if not events:
+        exists = (await db.execute(select(models.Loan.id).where(models.Loan.id == loan_id))).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Loan not found")
+    return events
+
+
+# ----------------------------------
+# MANY LOAN SUMMARIES (ONE QUERY)
+# ----------------------------------
+@router.post("/summaries", response_model=List[CustomerLoanList])
+async def get_loan_summaries(payload: LoanSummaryRequest, db: AsyncSession = Depends(get_async_read_db)):
+    """Summaries of the given loans, grouped by customer. Unknown ids are skipped."""
+    if len(payload.loan_ids) > MAX_SUMMARY_LOANS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SUMMARY_LOANS} loan_ids per request")
+    if not payload.loan_ids:
+        return []
+
+    rows = (await db.execute(summary_statement(models.Loan.id.in_(set(payload.loan_ids))))).all()
+    return group_by_customer(rows)
+
 
 @router.get("/", response_model=List[LoanResponse])
-def list_loans(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    loans = (
-        db.query(models.Loan)
-        .order_by(models.Loan.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+async def list_loans(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    # Newest first; `cursor` (from X-Next-Cursor) seeks instead of OFFSET
+    try:
+        statement = paginate(
+            select(models.Loan),
+            models.Loan.created_at,
+            models.Loan.id,
+            skip,
+            limit,
+            cursor,
+            descending=True,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    loans = (await db.execute(statement)).scalars().all()
+
+    next_page = next_cursor(loans, limit)
+    if next_page:
+        response.headers[CURSOR_HEADER] = next_page
     return loans
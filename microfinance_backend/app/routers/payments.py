@@ -1,20 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from ..database import get_db
 from .. import models
-from ..schemas.payments import PaymentCreate, PaymentResponse
+from ..schemas.payments import PaymentCreate, PaymentResponse, BulkPaymentResult
+from ..schemas.loans import LoanState
+from ..utils.balances import apply_payment, lock_loans, rebuild_balance, remaining_balances
+from ..utils.bulk_payments import parse_payment_rows, ingest_payments
+from ..utils.cache import dashboard_cache, loan_summary_cache
+from ..utils.due_list import rebuild_due_installments
+from ..utils.idempotency import HEADER as IDEMPOTENCY_HEADER, IdempotencyConflict, claim_key, request_hash, store_response
+from ..utils.loan_events import record_event, sync_loans
+from ..utils.profiles import record_payments, refresh_profiles
+from uuid import UUID
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
 
 @router.post("/", response_model=PaymentResponse)
-def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
+def create_payment(
+    payload: PaymentCreate,
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER),
+    db: Session = Depends(get_db),
+):
+    """
+    Record one payment. With an `Idempotency-Key` header a retried request
+    gets the original response back instead of posting the payment again.
+    """
+    if idempotency_key:
+        try:
+            stored = claim_key(
+                db, idempotency_key, "POST /payments/", request_hash(payload.model_dump_json().encode())
+            )
+        except IdempotencyConflict as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        if stored is not None:
+            return stored
 
-    # Check loan exists
-    loan = db.query(models.Loan).filter(models.Loan.id == payload.loan_id).first()
-    if not loan:
+    if payload.paid_amount <= 0:
+        raise HTTPException(status_code=400, detail="paid_amount must be positive")
+
+    # Concurrent posts to this loan wait here; other loans are not blocked
+    if not lock_loans(db, [payload.loan_id]):
         raise HTTPException(status_code=404, detail="Loan not found")
 
+    if payload.paid_amount > remaining_balances(db, [payload.loan_id])[payload.loan_id]:
+        raise HTTPException(status_code=400, detail="Payment exceeds the remaining balance")
+
     payment = models.Payment(
         loan_id=payload.loan_id,
         paid_amount=payload.paid_amount,
@@ -23,7 +56,86 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
     )
 
     db.add(payment)
-    db.commit()
+    db.flush()
+
+    # Keep the running balance in the same transaction as the insert
+    apply_payment(db, payment.loan_id, payment.paid_amount, payment.payment_date)
+    record_event(db, payment.loan_id, "payment", payment.paid_amount, payment.payment_date, payment.id)
+    states = sync_loans(db, [payment.loan_id])
+    record_payments(db, [{
+        "loan_id": payment.loan_id, "paid_amount": payment.paid_amount, "payment_date": payment.payment_date,
+    }], states)
+
     db.refresh(payment)
+    response = PaymentResponse.model_validate(payment).model_dump(mode="json")
+    if idempotency_key:
+        store_response(db, idempotency_key, response)
+
+    db.commit()
+    dashboard_cache.clear()
+    loan_summary_cache.delete(str(payment.loan_id))
+
+    return response
+
+
+# ----------------------------------
+# REVERSAL
+# ----------------------------------
+@router.post("/{payment_id}/reverse", response_model=LoanState)
+def reverse_payment(payment_id: UUID, db: Session = Depends(get_db)):
+    """
+    Undo a payment posted in error. The payment row is removed and a
+    reversal event appended to the loan's log; returns the loan's new state.
+    """
+    payment = db.query(models.Payment).filter(models.Payment.id == payment_id).first()
+    if not payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    loan_id = payment.loan_id
+    lock_loans(db, [loan_id])
+    # A concurrent reversal of the same payment may have won the lock
+    deleted = db.execute(delete(models.Payment).where(models.Payment.id == payment_id)).rowcount
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    # Recount from what is left: a negative increment cannot tell whether
+    # the last payment date or any due-list row has to move back
+    rebuild_balance(db, loan_id)
+    rebuild_due_installments(db, loan_id)
+    record_event(db, loan_id, "reversal", payment.paid_amount, payment.payment_date, payment.id)
+    state = sync_loans(db, [loan_id])[loan_id]
+    # Which installment each later payment paid into may shift; recount the customer
+    refresh_profiles(db, [state["customer_id"]])
+
+    db.commit()
+    dashboard_cache.clear()
+    loan_summary_cache.delete(str(loan_id))
+
+    return state
+
+
+# ----------------------------------
+# BULK UPLOAD (END OF DAY)
+# ----------------------------------
+@router.post("/bulk", response_model=BulkPaymentResult)
+async def create_payments_bulk(request: Request, mode: str = "all_or_nothing", db: Session = Depends(get_db)):
+    """
+    Accept a JSON array or an NDJSON stream (`Content-Type: application/x-ndjson`)
+    of payments. `mode=all_or_nothing` writes nothing if any row is rejected;
+    `mode=partial` inserts the valid rows and reports the rest.
+    """
+    if mode not in ("all_or_nothing", "partial"):
+        raise HTTPException(status_code=400, detail="Invalid mode")
+
+    body = await request.body()
+    try:
+        rows = parse_payment_rows(body, request.headers.get("content-type", ""))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-    return payment
+    # Database work is blocking; keep it off the event loop
+    result = await run_in_threadpool(ingest_payments, db, rows, mode == "all_or_nothing")
+    if result["inserted"]:
+        dashboard_cache.clear()
+        loan_summary_cache.delete(*{str(payload.loan_id) for payload, _ in rows if payload is not None})
+    return result
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from datetime import date
+from ..database import get_read_db
+from ..utils.aging import build_aging_report
+from ..utils.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+
+# ---------------------------------------------------
+# PORTFOLIO AGING (DAYS PAST DUE)
+# ---------------------------------------------------
+@router.get("/aging")
+def aging_report(as_of: date | None = None, db: Session = Depends(get_read_db)):
+    return FastJSONResponse(build_aging_report(db, as_of or date.today()))
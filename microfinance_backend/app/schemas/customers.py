@@ -1,5 +1,6 @@
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 from pydantic import BaseModel, ConfigDict
 
 class CustomerBase(BaseModel):
@@ -23,3 +24,16 @@ class CustomerUpdate(BaseModel):
     phone: str | None = None
     address: str | None = None
     id_proof_url: str | None = None
+
+
+class CustomerProfileResponse(BaseModel):
+    customer_id: UUID
+    active_exposure: Decimal
+    lifetime_borrowed: Decimal
+    lifetime_repaid: Decimal
+    payment_count: int
+    on_time_payments: int
+    on_time_ratio: float | None   # None until the first payment
+    max_days_late: int
+    active_loans: int
+    completed_loans: int
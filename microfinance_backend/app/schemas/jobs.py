@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class JobCreate(BaseModel):
+    kind: str                      # see GET /jobs/kinds
+    params: dict[str, Any] = {}
+
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    params: dict[str, Any]
+    status: str                    # queued | running | succeeded | failed
+    result: Any = None
+    error: str | None = None
+    artifact_url: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    heartbeat_at: datetime | None = None
@@ -65,3 +65,54 @@ class CustomerLoanItem(BaseModel):
 class CustomerLoanList(BaseModel):
     customer_id: UUID
     loans: list[CustomerLoanItem]
+
+
+class LoanSummaryRequest(BaseModel):
+    loan_ids: list[UUID]
+
+
+class LoanBulkItem(LoanCreate):
+    # Exact money for batch disbursement
+    principal_amount: Decimal
+    interest_amount: Decimal
+    installment_amount: Decimal
+
+
+class BulkLoanRowResult(BaseModel):
+    index: int
+    status: str                    # created | rejected | skipped
+    loan: LoanResponse | None = None
+    error: str | None = None
+
+
+class BulkLoanResult(BaseModel):
+    committed: bool
+    received: int
+    created: int
+    rejected: int
+    results: list[BulkLoanRowResult]
+
+
+class LoanEventResponse(BaseModel):
+    id: int
+    loan_id: UUID
+    event_type: str                # disbursement | payment | reversal
+    amount: Decimal
+    event_date: date
+    payment_id: UUID | None = None
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class LoanState(BaseModel):
+    loan_id: UUID
+    total_amount: Decimal
+    total_paid: Decimal
+    remaining_amount: Decimal
+    payment_count: int
+    installments_paid: int
+    status: str
+    last_event_id: int
+    replayed: int                  # events folded on top of the latest snapshot
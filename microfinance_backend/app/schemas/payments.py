@@ -18,3 +18,18 @@ class PaymentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BulkPaymentRowResult(BaseModel):
+    index: int
+    status: str                    # created | rejected | skipped
+    payment_id: UUID | None = None
+    error: str | None = None
+
+
+class BulkPaymentResult(BaseModel):
+    committed: bool
+    received: int
+    inserted: int
+    rejected: int
+    results: list[BulkPaymentRowResult]
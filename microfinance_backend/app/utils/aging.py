@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, case, and_, or_, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from .schedule import FREQUENCIES, earliest_anchor
+
+# (label, days past due upper bound); the last bucket is open-ended
+AGING_BUCKETS = [("0", 0), ("1-7", 7), ("8-30", 30), ("31-90", 90)]
+OPEN_BUCKET = "90+"
+
+
+def _due_on_or_after(loans, boundary: date):
+    """SQL condition: the loan's next due date is on or after `boundary`."""
+    # No payment yet: the first installment is due on the start date
+    conditions = [and_(loans.c.last_payment_date.is_(None), loans.c.start_date >= boundary)]
+    # Otherwise next due = last payment + one period, i.e. last payment >= anchor
+    for frequency in FREQUENCIES:
+        conditions.append(and_(
+            loans.c.repayment_frequency == frequency,
+            loans.c.last_payment_date >= earliest_anchor(frequency, boundary),
+        ))
+    return or_(*conditions)
+
+
+# ---------------------------------------------------
+# PORTFOLIO AGING (DAYS PAST DUE)
+# ---------------------------------------------------
+def build_aging_report(db: Session, today: date):
+    """Active loans and outstanding amounts per days-past-due bucket on `today`."""
+    loan = models.Loan
+    balance = models.LoanBalance
+    payment = models.Payment
+
+    # Balances come from `loan_balances`; only loans without a row fall back
+    # to their payments, which the CASE keeps from running for the others
+    summed = (
+        select(func.coalesce(func.sum(payment.paid_amount), 0))
+        .where(payment.loan_id == loan.id)
+        .scalar_subquery()
+    )
+    last_paid = select(func.max(payment.payment_date)).where(payment.loan_id == loan.id).scalar_subquery()
+    missing = balance.loan_id.is_(None)
+
+    active = (
+        db.query(
+            loan.id.label("loan_id"),
+            loan.start_date,
+            loan.repayment_frequency,
+            case((missing, last_paid), else_=balance.last_payment_date).label("last_payment_date"),
+            case((missing, loan.total_amount - summed), else_=balance.remaining_amount).label("outstanding"),
+        )
+        .outerjoin(balance, balance.loan_id == loan.id)
+        .filter(loan.status == "active")
+        .subquery()
+    )
+
+    # Days-past-due boundaries become date comparisons, so every active loan
+    # is bucketed in a single SQL pass over loans + loan_balances
+    bucket = case(
+        *[
+            (_due_on_or_after(active, today - timedelta(days=max_days)), label)
+            for label, max_days in AGING_BUCKETS
+        ],
+        else_=OPEN_BUCKET,
+    ).label("bucket")
+
+    aged = (
+        db.query(bucket, active.c.loan_id, active.c.outstanding)
+        .filter(active.c.outstanding > 0)
+        .subquery()
+    )
+
+    rows = (
+        db.query(
+            aged.c.bucket,
+            func.count(aged.c.loan_id),
+            func.coalesce(func.sum(aged.c.outstanding), 0),
+        )
+        .group_by(aged.c.bucket)
+        .all()
+    )
+    totals = {label: (count, amount) for label, count, amount in rows}
+
+    buckets = []
+    for label in [label for label, _ in AGING_BUCKETS] + [OPEN_BUCKET]:
+        count, amount = totals.get(label, (0, Decimal(0)))
+        buckets.append({
+            "bucket": label,
+            "loans": count,
+            "outstanding": amount,
+        })
+
+    return {
+        "as_of": today,
+        "total_loans": sum(b["loans"] for b in buckets),
+        "total_outstanding": sum(b["outstanding"] for b in buckets),
+        "buckets": buckets,
+    }
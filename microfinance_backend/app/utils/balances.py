@@ -0,0 +1,191 @@
+from sqlalchemy import func, case, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from .due_list import settle_due_installments
+
+
+# ---------------------------------------------------
+# LOAN BALANCE MAINTENANCE
+# ---------------------------------------------------
+# `loan_balances` holds one row per loan with the running payment totals,
+# so read endpoints never have to SUM the payments table.
+
+def open_balance(db: Session, loan):
+    """Create the zero balance row for a freshly inserted (flushed) loan."""
+    db.add(models.LoanBalance(
+        loan_id=loan.id,
+        total_paid=0,
+        payment_count=0,
+        last_payment_date=None,
+        remaining_amount=loan.total_amount,
+    ))
+
+
+def apply_payment(db: Session, loan_id, paid_amount, payment_date, count=1, settle=True):
+    """
+    Add a payment to the loan balance in the caller's transaction.
+
+    The update is done in SQL so concurrent payments on the same loan
+    cannot lose each other's increments. The payment row must already be
+    flushed: loans created before the balance table existed get their
+    row rebuilt from `payments`, which then includes it. Callers adding
+    several payments at once pass `settle=False` and settle the due list
+    per payment date themselves.
+    """
+    balance = models.LoanBalance
+    updated = (
+        db.query(balance)
+        .filter(balance.loan_id == loan_id)
+        .update(
+            {
+                balance.total_paid: balance.total_paid + paid_amount,
+                balance.payment_count: balance.payment_count + count,
+                balance.remaining_amount: balance.remaining_amount - paid_amount,
+                balance.last_payment_date: case(
+                    (balance.last_payment_date.is_(None), payment_date),
+                    (balance.last_payment_date < payment_date, payment_date),
+                    else_=balance.last_payment_date,
+                ),
+            },
+            synchronize_session=False,
+        )
+    )
+    if not updated:
+        rebuild_balance(db, loan_id)
+
+    # Keep today's (and any later) collection sheet in step
+    if settle:
+        settle_due_installments(db, loan_id, paid_amount, payment_date)
+
+
+def rebuild_balance(db: Session, loan_id):
+    """Recompute one loan's balance row from the payments table."""
+    loan = db.query(models.Loan).filter(models.Loan.id == loan_id).first()
+    total_paid, payment_count, last_payment_date = compute_totals(db, loan_id)
+    db.merge(models.LoanBalance(
+        loan_id=loan_id,
+        total_paid=total_paid,
+        payment_count=payment_count,
+        last_payment_date=last_payment_date,
+        remaining_amount=loan.total_amount - total_paid,
+    ))
+
+
+def compute_totals(db: Session, loan_id):
+    """SUM-on-read fallback for a loan that has no balance row yet."""
+    total_paid, payment_count, last_payment_date = (
+        db.query(
+            func.coalesce(func.sum(models.Payment.paid_amount), 0),
+            func.count(models.Payment.id),
+            func.max(models.Payment.payment_date),
+        )
+        .filter(models.Payment.loan_id == loan_id)
+        .one()
+    )
+    return total_paid, payment_count, last_payment_date
+
+
+# ---------------------------------------------------
+# PER-LOAN LOCKING
+# ---------------------------------------------------
+def lock_loans(db: Session, loan_ids):
+    """
+    Lock the given loans' rows until the caller's transaction ends and
+    return the ids that exist. Writers to the same loan queue up here while
+    other loans stay fully parallel; rows are locked in id order so batches
+    cannot deadlock each other.
+    """
+    loan = models.Loan
+    loan_ids = sorted(set(loan_ids))
+    statement = select(loan.id).where(loan.id.in_(loan_ids)).order_by(loan.id)
+
+    if db.get_bind().dialect.name == "sqlite":
+        # No row locks: a no-op write takes SQLite's database write lock instead
+        db.execute(update(loan).where(loan.id.in_(loan_ids)).values(id=loan.id))
+        return set(db.execute(statement).scalars())
+
+    return set(db.execute(statement.with_for_update()).scalars())
+
+
+def remaining_balances(db: Session, loan_ids):
+    """{loan_id: amount still owed}; call after `lock_loans` so it cannot change underneath."""
+    loan = models.Loan
+    balance = models.LoanBalance
+    rows = db.execute(
+        select(loan.id, loan.total_amount, balance.remaining_amount)
+        .outerjoin(balance, balance.loan_id == loan.id)
+        .where(loan.id.in_(set(loan_ids)))
+    ).all()
+
+    remaining = {}
+    for loan_id, total_amount, remaining_amount in rows:
+        if remaining_amount is None:
+            remaining_amount = total_amount - compute_totals(db, loan_id)[0]
+        remaining[loan_id] = remaining_amount
+    return remaining
+
+
+# ---------------------------------------------------
+# RECONCILIATION
+# ---------------------------------------------------
+def reconcile_balances(db: Session, fix: bool = True):
+    """
+    Rebuild `loan_balances` from `payments` and report any drift.
+
+    Returns a list of dicts, one per loan whose stored balance was missing
+    or did not match the payments table. With `fix=True` the drifted rows
+    are rewritten and committed.
+    """
+    payment_totals = (
+        db.query(
+            models.Payment.loan_id.label("loan_id"),
+            func.sum(models.Payment.paid_amount).label("total_paid"),
+            func.count(models.Payment.id).label("payment_count"),
+            func.max(models.Payment.payment_date).label("last_payment_date"),
+        )
+        .group_by(models.Payment.loan_id)
+        .subquery()
+    )
+
+    expected = (
+        db.query(
+            models.Loan.id,
+            models.Loan.total_amount,
+            func.coalesce(payment_totals.c.total_paid, 0),
+            func.coalesce(payment_totals.c.payment_count, 0),
+            payment_totals.c.last_payment_date,
+        )
+        .outerjoin(payment_totals, payment_totals.c.loan_id == models.Loan.id)
+        .all()
+    )
+
+    stored = {b.loan_id: b for b in db.query(models.LoanBalance).all()}
+
+    drift = []
+    for loan_id, total_amount, total_paid, payment_count, last_payment_date in expected:
+        row = {
+            "total_paid": total_paid,
+            "payment_count": payment_count,
+            "last_payment_date": last_payment_date,
+            "remaining_amount": total_amount - total_paid,
+        }
+
+        balance = stored.get(loan_id)
+        if balance is None:
+            drift.append({"loan_id": str(loan_id), "issue": "missing", "expected": row})
+            if fix:
+                db.add(models.LoanBalance(loan_id=loan_id, **row))
+            continue
+
+        actual = {key: getattr(balance, key) for key in row}
+        if actual != row:
+            drift.append({"loan_id": str(loan_id), "issue": "mismatch", "expected": row, "actual": actual})
+            if fix:
+                for key, value in row.items():
+                    setattr(balance, key, value)
+
+    if fix:
+        db.commit()
+
+    return drift
@@ -0,0 +1,145 @@
+import uuid
+from decimal import ROUND_CEILING
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..schemas.loans import LoanBulkItem
+from .bulk_payments import parse_rows
+from .loan_events import record_events
+from .profiles import exposure_error, limits_enabled, lock_profiles, record_loans
+from .schedule import FREQUENCIES, installment_due_dates
+
+MAX_LOANS = 1000
+
+
+# ---------------------------------------------------
+# PARSING
+# ---------------------------------------------------
+def parse_loan_rows(body: bytes, content_type: str):
+    """(LoanBulkItem | None, error | None) per uploaded loan, in upload order."""
+    return parse_rows(body, content_type, LoanBulkItem, "loans", max_rows=MAX_LOANS)
+
+
+def _row_error(payload, known_customers):
+    if payload.customer_id not in known_customers:
+        return "Customer not found"
+    if payload.repayment_frequency not in FREQUENCIES:
+        return "Invalid repayment frequency"
+    if payload.installment_amount <= 0:
+        return "installment_amount must be positive"
+    if payload.principal_amount <= 0 or payload.interest_amount < 0:
+        return "Invalid principal or interest amount"
+    return None
+
+
+# ---------------------------------------------------
+# DISBURSEMENT
+# ---------------------------------------------------
+def disburse_loans(db: Session, rows, atomic: bool):
+    """
+    Create a batch of loans.
+
+    Customers are checked with one IN query, terms are computed with
+    Decimal arithmetic and the end dates for the whole batch in one
+    vectorized call; loans, their balance rows and disbursement events go
+    in with one INSERT each, customer profiles get one UPDATE per customer.
+    With `atomic=True` nothing is written if any row is rejected.
+    """
+    customer_ids = {payload.customer_id for payload, _ in rows if payload is not None}
+    known_customers = set()
+    if customer_ids:
+        known_customers = {
+            customer_id for (customer_id,) in
+            db.query(models.Customer.id).filter(models.Customer.id.in_(customer_ids)).all()
+        }
+
+    # Running (exposure, active loans) per customer, so a batch cannot overshoot a limit
+    exposures = lock_profiles(db, known_customers) if limits_enabled() and known_customers else {}
+
+    results = []
+    accepted = []
+    for index, (payload, error) in enumerate(rows):
+        if payload is not None:
+            error = error or _row_error(payload, known_customers)
+        if not error and exposures:
+            total_amount = payload.principal_amount + payload.interest_amount
+            active_exposure, active_loans = exposures[payload.customer_id]
+            error = exposure_error(active_exposure, active_loans, total_amount)
+            if not error:
+                exposures[payload.customer_id] = (active_exposure + total_amount, active_loans + 1)
+        if error:
+            results.append({"index": index, "status": "rejected", "loan": None, "error": error})
+            continue
+
+        total_amount = payload.principal_amount + payload.interest_amount
+        installments = int((total_amount / payload.installment_amount).to_integral_value(rounding=ROUND_CEILING))
+        accepted.append({
+            "id": uuid.uuid4(),
+            "customer_id": payload.customer_id,
+            "principal_amount": payload.principal_amount,
+            "interest_amount": payload.interest_amount,
+            "total_amount": total_amount,
+            "installment_amount": payload.installment_amount,
+            "number_of_installments": installments,
+            "repayment_frequency": payload.repayment_frequency,
+            "start_date": payload.start_date,
+            "notes": payload.notes,
+            "status": "active",
+        })
+        results.append({"index": index, "status": "created", "loan": accepted[-1], "error": None})
+
+    rejected = len(rows) - len(accepted)
+
+    if atomic and rejected:
+        db.rollback()
+        for result in results:
+            if result["status"] == "created":
+                result["status"] = "skipped"
+                result["loan"] = None
+        return {"committed": False, "received": len(rows), "created": 0, "rejected": rejected, "results": results}
+
+    if accepted:
+        # Duration runs to the last installment's due date
+        end_dates = installment_due_dates(
+            [loan["start_date"] for loan in accepted],
+            [loan["repayment_frequency"] for loan in accepted],
+            [loan["number_of_installments"] for loan in accepted],
+        ).astype(object)
+        for loan, end_date in zip(accepted, end_dates):
+            loan["end_date"] = end_date
+            loan["loan_duration_days"] = (end_date - loan["start_date"]).days
+
+        db.execute(insert(models.Loan).values(accepted))
+        db.execute(insert(models.LoanBalance).values([
+            {
+                "loan_id": loan["id"],
+                "total_paid": 0,
+                "payment_count": 0,
+                "last_payment_date": None,
+                "remaining_amount": loan["total_amount"],
+            }
+            for loan in accepted
+        ]))
+        record_events(db, (
+            {
+                "loan_id": loan["id"],
+                "event_type": "disbursement",
+                "amount": loan["total_amount"],
+                "event_date": loan["start_date"],
+                "payment_id": None,
+            }
+            for loan in accepted
+        ))
+        record_loans(db, accepted)
+
+    db.commit()
+
+    return {
+        "committed": True,
+        "received": len(rows),
+        "created": len(accepted),
+        "rejected": rejected,
+        "results": results,
+    }
@@ -0,0 +1,174 @@
+import json
+import uuid
+from collections import defaultdict
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..schemas.payments import PaymentCreate
+from .balances import apply_payment, lock_loans, remaining_balances
+from .due_list import settle_due_installments
+from .loan_events import record_events, sync_loans
+from .profiles import record_payments
+
+CHUNK_SIZE = 1000
+MAX_ROWS = 20000
+
+
+# ---------------------------------------------------
+# PARSING (JSON array or NDJSON)
+# ---------------------------------------------------
+def parse_payment_rows(body: bytes, content_type: str):
+    """
+    Turn a request body into a list of (PaymentCreate | None, error | None).
+
+    JSON arrays and NDJSON (one object per line) are both accepted. A row
+    that fails validation keeps its position so results line up with the
+    upload. Raises ValueError when the body itself cannot be read.
+    """
+    return parse_rows(body, content_type, PaymentCreate, "payments")
+
+
+def parse_rows(body: bytes, content_type: str, schema, noun: str, max_rows: int = MAX_ROWS):
+    """`parse_payment_rows` for any pydantic `schema`; `noun` is used in errors."""
+    if "ndjson" in content_type:
+        raw_rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                raw_rows.append(json.loads(line))
+            except json.JSONDecodeError as exc:
+                raw_rows.append(exc)
+    else:
+        try:
+            raw_rows = json.loads(body or b"[]")
+        except json.JSONDecodeError:
+            raise ValueError("Body must be a JSON array or NDJSON")
+        if not isinstance(raw_rows, list):
+            raise ValueError(f"Body must be a JSON array of {noun}")
+
+    if len(raw_rows) > max_rows:
+        raise ValueError(f"At most {max_rows} {noun} per upload")
+
+    rows = []
+    for raw in raw_rows:
+        if isinstance(raw, json.JSONDecodeError):
+            rows.append((None, "Invalid JSON line"))
+            continue
+        try:
+            rows.append((schema.model_validate(raw), None))
+        except ValidationError as exc:
+            rows.append((None, "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+            )))
+    return rows
+
+
+# ---------------------------------------------------
+# INGESTION
+# ---------------------------------------------------
+def ingest_payments(db: Session, rows, atomic: bool):
+    """
+    Insert a batch of parsed payment rows.
+
+    All loan_ids are locked and checked with one IN query and payments go
+    in with one multi-row INSERT per chunk, as are their loan events. Loan
+    balances and statuses are updated once per loan, due-list rows once per
+    loan and payment date, customer profiles once per customer. Rows that would take a loan past its total are rejected.
+    With `atomic=True` nothing is written if any row is rejected.
+    """
+    loan_ids = {payload.loan_id for payload, _ in rows if payload is not None}
+    known_loans = set()
+    remaining = {}
+    if loan_ids:
+        known_loans = lock_loans(db, loan_ids)
+        remaining = remaining_balances(db, known_loans)
+
+    results = []
+    accepted = []
+    for index, (payload, error) in enumerate(rows):
+        if payload is not None and not error:
+            if payload.loan_id not in known_loans:
+                error = "Loan not found"
+            elif payload.paid_amount <= 0:
+                error = "paid_amount must be positive"
+            elif payload.paid_amount > remaining[payload.loan_id]:
+                error = "Payment exceeds the remaining balance"
+            else:
+                remaining[payload.loan_id] -= payload.paid_amount
+        if error:
+            results.append({"index": index, "status": "rejected", "payment_id": None, "error": error})
+            continue
+
+        payment_id = uuid.uuid4()
+        accepted.append({
+            "id": payment_id,
+            "loan_id": payload.loan_id,
+            "paid_amount": payload.paid_amount,
+            "payment_date": payload.payment_date,
+            "collector_id": None,
+        })
+        results.append({"index": index, "status": "created", "payment_id": payment_id, "error": None})
+
+    rejected = len(rows) - len(accepted)
+
+    if atomic and rejected:
+        db.rollback()
+        for result in results:
+            if result["status"] == "created":
+                result["status"] = "skipped"
+                result["payment_id"] = None
+        return {
+            "committed": False,
+            "received": len(rows),
+            "inserted": 0,
+            "rejected": rejected,
+            "results": results,
+        }
+
+    for start in range(0, len(accepted), CHUNK_SIZE):
+        db.execute(insert(models.Payment).values(accepted[start:start + CHUNK_SIZE]))
+
+    # One balance update per loan instead of one per payment
+    per_loan = defaultdict(lambda: [0, 0, None])
+    for row in accepted:
+        totals = per_loan[row["loan_id"]]
+        totals[0] += row["paid_amount"]
+        totals[1] += 1
+        if totals[2] is None or row["payment_date"] > totals[2]:
+            totals[2] = row["payment_date"]
+    for loan_id, (paid_amount, count, last_date) in per_loan.items():
+        apply_payment(db, loan_id, paid_amount, last_date, count=count, settle=False)
+
+    # Each payment only settles due-list rows dated on or after it, so the
+    # due list is settled per loan and payment date, oldest first
+    per_day = defaultdict(int)
+    for row in accepted:
+        per_day[row["loan_id"], row["payment_date"]] += row["paid_amount"]
+    for (loan_id, payment_date), paid_amount in sorted(per_day.items(), key=lambda item: item[0][1]):
+        settle_due_installments(db, loan_id, paid_amount, payment_date)
+
+    record_events(db, (
+        {
+            "loan_id": row["loan_id"],
+            "event_type": "payment",
+            "amount": row["paid_amount"],
+            "event_date": row["payment_date"],
+            "payment_id": row["id"],
+        }
+        for row in accepted
+    ))
+    record_payments(db, accepted, sync_loans(db, per_loan))
+
+    db.commit()
+
+    return {
+        "committed": True,
+        "received": len(rows),
+        "inserted": len(accepted),
+        "rejected": rejected,
+        "results": results,
+    }
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Shared cache backend for multi-worker deployments, e.g. redis://localhost:6379/0.
+# Unset: every worker keeps its own in-process caches.
+CACHE_URL = os.getenv("CACHE_URL")
+
+
+# ---------------------------------------------------
+# IN-PROCESS TTL CACHE
+# ---------------------------------------------------
+class TTLCache:
+    """Small thread-safe key/value cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# ---------------------------------------------------
+# BOUNDED LRU + TTL CACHE
+# ---------------------------------------------------
+class LRUCache:
+    """
+    TTL cache holding at most `max_entries` keys; the least recently used
+    key is evicted first. Keeps hit / miss / eviction counters.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# ---------------------------------------------------
+# REDIS-COMPATIBLE CACHE
+# ---------------------------------------------------
+class RedisCache:
+    """
+    Same interface as LRUCache, stored in Redis (or any server speaking its
+    protocol) so every worker sees the same entries and invalidations.
+    Values are stored as JSON; memory is bounded by the server's maxmemory
+    policy, so evictions are not counted here.
+    """
+
+    def __init__(self, url: str, namespace: str, ttl: float):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_URL is set but the 'redis' package is not installed") from exc
+
+        self._client = redis.Redis.from_url(url)
+        self.prefix = f"microfinance:{namespace}:"
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + str(key))
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value):
+        self._client.set(self.prefix + str(key), json.dumps(value, default=str), px=int(self.ttl * 1000))
+
+    def delete(self, *keys):
+        if keys:
+            self._client.delete(*(self.prefix + str(key) for key in keys))
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self.prefix + "*", count=1000))
+        if keys:
+            self._client.delete(*keys)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "redis",
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": None,
+            }
+
+
+# Named caches with counters, reported at /metrics
+CACHES = {}
+
+
+def make_cache(name: str, ttl: float, max_entries: int):
+    """Redis-backed cache when CACHE_URL is set, in-process LRU otherwise."""
+    if CACHE_URL:
+        cache = RedisCache(CACHE_URL, name, ttl)
+    else:
+        cache = LRUCache(ttl, max_entries)
+    CACHES[name] = cache
+    return cache
+
+
+# Dashboard statistics; cleared by every customer, loan and payment write
+dashboard_cache = TTLCache(ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "30")))
+
+# GET /loans/{id}/summary by loan id; invalidated when a payment is recorded
+loan_summary_cache = make_cache(
+    "loan_summary",
+    ttl=float(os.getenv("LOAN_SUMMARY_CACHE_TTL", "300")),
+    max_entries=int(os.getenv("LOAN_SUMMARY_CACHE_SIZE", "10000")),
+)
@@ -0,0 +1,169 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from .schedule import installments_due_on
+
+CHUNK_SIZE = 1000
+
+
+# ---------------------------------------------------
+# DAILY DUE LIST
+# ---------------------------------------------------
+# `due_installments` holds, per date, every active loan with an installment
+# falling due that day and what the collector should ask for. It is rebuilt
+# nightly (`cli build-due-list`) or on demand, and kept current during the
+# day by `settle_due_installments` on every payment. `due_list_builds`
+# records each date that has been built.
+
+def _candidate_loans(db: Session, day: date):
+    """Active loans whose term covers `day`, with totals paid by `day` and latest collector."""
+    loan = models.Loan
+    balance = models.LoanBalance
+    payment = models.Payment
+
+    latest_collector = (
+        select(
+            payment.loan_id,
+            payment.collector_id,
+            func.row_number().over(
+                partition_by=payment.loan_id,
+                order_by=(payment.payment_date.desc(), payment.created_at.desc()),
+            ).label("position"),
+        )
+        .where(payment.collector_id.is_not(None))
+        .subquery()
+    )
+
+    # Only payments dated on or before `day` count, as in the settle and
+    # rebuild paths; a balance row needs its later payments taken back off
+    summed = (
+        select(func.coalesce(func.sum(payment.paid_amount), 0))
+        .where(payment.loan_id == loan.id, payment.payment_date <= day)
+        .scalar_subquery()
+    )
+    later = (
+        select(func.coalesce(func.sum(payment.paid_amount), 0))
+        .where(payment.loan_id == loan.id, payment.payment_date > day)
+        .scalar_subquery()
+    )
+    total_paid = case(
+        (balance.loan_id.is_(None), summed),
+        # No payment after `day` (always so when building today): no lookup
+        (or_(balance.last_payment_date.is_(None), balance.last_payment_date <= day), balance.total_paid),
+        else_=balance.total_paid - later,
+    )
+
+    return db.execute(
+        select(
+            loan.id,
+            loan.customer_id,
+            loan.start_date,
+            loan.repayment_frequency,
+            loan.number_of_installments,
+            loan.installment_amount,
+            loan.total_amount,
+            total_paid.label("total_paid"),
+            latest_collector.c.collector_id,
+        )
+        .outerjoin(balance, balance.loan_id == loan.id)
+        .outerjoin(
+            latest_collector,
+            (latest_collector.c.loan_id == loan.id) & (latest_collector.c.position == 1),
+        )
+        .where(loan.status == "active", loan.start_date < day, loan.end_date >= day)
+    ).all()
+
+
+def build_due_list(db: Session, day: date) -> int:
+    """Recompute `due_installments` for `day` and commit; returns the row count."""
+    loans = _candidate_loans(db, day)
+
+    due_numbers = installments_due_on(
+        [row.start_date for row in loans],
+        [row.repayment_frequency for row in loans],
+        [row.number_of_installments for row in loans],
+        day,
+    ) if loans else []
+
+    rows = []
+    for row, installment_no in zip(loans, due_numbers):
+        if not installment_no:
+            continue
+        total_paid = Decimal(row.total_paid or 0)
+        remaining = row.total_amount - total_paid
+        if remaining <= 0:
+            continue
+        expected = min(row.installment_amount * int(installment_no), row.total_amount)
+        rows.append({
+            "due_date": day,
+            "loan_id": row.id,
+            "customer_id": row.customer_id,
+            "collector_id": row.collector_id,
+            "installment_no": int(installment_no),
+            "installment_amount": row.installment_amount,
+            "amount_due": max(expected - total_paid, Decimal(0)),
+            "remaining_amount": remaining,
+        })
+
+    db.execute(delete(models.DueInstallment).where(models.DueInstallment.due_date == day))
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(models.DueInstallment).values(rows[start:start + CHUNK_SIZE]))
+    # Committed with the rows, so readers never see a marker without them
+    db.merge(models.DueListBuild(due_date=day, loans_due=len(rows), built_at=func.now()))
+    db.commit()
+
+    return len(rows)
+
+
+def settle_due_installments(db: Session, loan_id, paid_amount, payment_date):
+    """
+    Take a payment off the loan's due-list rows dated on or after it, in the
+    caller's transaction.
+    """
+    due = models.DueInstallment
+    (
+        db.query(due)
+        .filter(due.loan_id == loan_id, due.due_date >= payment_date)
+        .update(
+            {
+                due.amount_due: case(
+                    (due.amount_due > paid_amount, due.amount_due - paid_amount),
+                    else_=0,
+                ),
+                due.remaining_amount: due.remaining_amount - paid_amount,
+            },
+            synchronize_session=False,
+        )
+    )
+
+
+def rebuild_due_installments(db: Session, loan_id):
+    """
+    Recompute the loan's due-list rows from `payments`, in the caller's
+    transaction. Each row counts the payments dated on or before its day.
+    """
+    due = models.DueInstallment
+    payment = models.Payment
+
+    rows = db.execute(
+        select(due.due_date, due.installment_no, due.installment_amount).where(due.loan_id == loan_id)
+    ).all()
+    if not rows:
+        return
+    total_amount = db.execute(select(models.Loan.total_amount).where(models.Loan.id == loan_id)).scalar_one()
+    payments = db.execute(
+        select(payment.payment_date, payment.paid_amount).where(payment.loan_id == loan_id)
+    ).all()
+
+    for row in rows:
+        paid = sum((amount for paid_on, amount in payments if paid_on <= row.due_date), Decimal(0))
+        expected = min(row.installment_amount * row.installment_no, total_amount)
+        db.execute(
+            update(due)
+            .where(due.loan_id == loan_id, due.due_date == row.due_date)
+            .values(amount_due=max(expected - paid, Decimal(0)), remaining_amount=total_amount - paid)
+        )
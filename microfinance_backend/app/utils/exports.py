@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 2000
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _cell(value):
+    # Money stays exact: Decimal, UUID and dates are written as strings
+    if value is None:
+        return None
+    if isinstance(value, (int, float, str, bool)):
+        return value
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+# ---------------------------------------------------
+# STREAMING WRITER
+# ---------------------------------------------------
+def export_chunks(db: Session, statement, fmt: str):
+    """
+    Yield `statement`'s rows as CSV or NDJSON chunks.
+
+    `yield_per` turns on `stream_results`, so rows come from a server-side
+    cursor one batch at a time and memory stays flat.
+    """
+    result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    columns = list(result.keys())
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for batch in result.partitions():
+            for row in batch:
+                writer.writerow([_cell(v) for v in row])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+    else:
+        for batch in result.partitions():
+            yield "".join(
+                json.dumps({c: _cell(v) for c, v in zip(columns, row)}) + "\n"
+                for row in batch
+            )
+
+
+# ---------------------------------------------------
+# STATEMENTS
+# ---------------------------------------------------
+def loans_statement():
+    loan = models.Loan
+    return (
+        select(
+            loan.id.label("loan_id"),
+            loan.customer_id,
+            loan.principal_amount,
+            loan.interest_amount,
+            loan.total_amount,
+            loan.installment_amount,
+            loan.number_of_installments,
+            loan.repayment_frequency,
+            loan.start_date,
+            loan.end_date,
+            loan.status,
+            loan.notes,
+            loan.created_at,
+        )
+        .order_by(loan.created_at, loan.id)
+    )
+
+
+def payments_statement(date_from: date | None = None, date_to: date | None = None):
+    payment = models.Payment
+    statement = (
+        select(
+            payment.id.label("payment_id"),
+            payment.loan_id,
+            models.Loan.customer_id,
+            payment.paid_amount,
+            payment.payment_date,
+            payment.collector_id,
+            payment.notes,
+            payment.created_at,
+        )
+        .join(models.Loan, models.Loan.id == payment.loan_id)
+        .order_by(payment.payment_date, payment.id)
+    )
+    if date_from:
+        statement = statement.where(payment.payment_date >= date_from)
+    if date_to:
+        statement = statement.where(payment.payment_date <= date_to)
+    return statement
+
+
+def customer_ledger_statement(customer_id):
+    """One row per payment; loans without payments are included."""
+    loan = models.Loan
+    payment = models.Payment
+    return (
+        select(
+            loan.id.label("loan_id"),
+            loan.total_amount,
+            loan.installment_amount,
+            loan.repayment_frequency,
+            loan.start_date,
+            loan.end_date,
+            loan.status,
+            payment.id.label("payment_id"),
+            payment.paid_amount,
+            payment.payment_date,
+            payment.notes,
+        )
+        .outerjoin(payment, payment.loan_id == loan.id)
+        .where(loan.customer_id == customer_id)
+        .order_by(loan.start_date, loan.id, payment.payment_date, payment.id)
+    )
@@ -0,0 +1,70 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(ValueError):
+    """The key was already used for a different request."""
+
+
+def request_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+# ---------------------------------------------------
+# CLAIM / REPLAY
+# ---------------------------------------------------
+# The key row is inserted at the start of the request's transaction and its
+# response filled in just before the commit. A concurrent retry with the same
+# key blocks on the primary key until the first request finishes: if that
+# committed, the retry replays its response; if it rolled back, the retry
+# claims the key and runs for real.
+
+def claim_key(db: Session, key: str, endpoint: str, fingerprint: str):
+    """
+    Claim `key` in a fresh transaction. Returns the stored response if the
+    key was already used for this request, None if the caller should go
+    ahead. Raises IdempotencyConflict for the same key on another request.
+    """
+    if len(key) > MAX_KEY_LENGTH:
+        raise IdempotencyConflict(f"{HEADER} is longer than {MAX_KEY_LENGTH} characters")
+
+    for _ in range(3):
+        stored = db.get(models.IdempotencyKey, key)
+        if stored is not None:
+            if stored.endpoint != endpoint or stored.request_hash != fingerprint:
+                raise IdempotencyConflict(f"{HEADER} was already used for a different request")
+            return stored.response
+
+        db.add(models.IdempotencyKey(key=key, endpoint=endpoint, request_hash=fingerprint))
+        try:
+            db.flush()
+            return None
+        except IntegrityError:
+            # Another request claimed the key first and has now finished
+            db.rollback()
+
+    raise IdempotencyConflict(f"{HEADER} is in use by a request that keeps failing")
+
+
+def store_response(db: Session, key: str, response):
+    """Record the response for a claimed key, in the caller's transaction."""
+    db.get(models.IdempotencyKey, key).response = response
+
+
+def purge_keys(db: Session, older_than: timedelta) -> int:
+    """Delete keys older than `older_than` and commit; returns the count."""
+    cutoff = datetime.now(timezone.utc) - older_than
+    deleted = db.execute(
+        delete(models.IdempotencyKey).where(models.IdempotencyKey.created_at < cutoff)
+    ).rowcount
+    db.commit()
+    return deleted
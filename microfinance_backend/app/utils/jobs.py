@@ -0,0 +1,308 @@
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal, ReadSessionLocal
+from .aging import build_aging_report
+from .balances import reconcile_balances
+from .cache import loan_summary_cache
+from .due_list import build_due_list
+from .exports import MEDIA_TYPES, export_chunks, loans_statement, payments_statement
+from .ledger import build_ledger_entries
+from .loan_events import snapshot_loans
+from .profiles import rebuild_profiles
+from .serialization import dumps
+
+logger = logging.getLogger("microfinance.jobs")
+
+# Jobs run at once per process; each holds at most one pooled connection
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Queued + running jobs accepted before POST /jobs/ answers 429
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "100"))
+# Result files, named after the job id
+JOB_ARTIFACT_DIR = Path(os.getenv("JOB_ARTIFACT_DIR", "job_artifacts"))
+# Running jobs are stamped this often by the process that runs them
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+# A "running" job without a heartbeat for this long was lost with its process
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "300"))
+
+
+class JobQueueFull(Exception):
+    """Too many jobs are queued or running."""
+
+
+# ---------------------------------------------------
+# JOB KINDS
+# ---------------------------------------------------
+# handler(db, params, artifact_stem) -> (result summary, artifact path | None).
+# Invalid params raise ValueError, which fails the job with that message.
+
+def _date_param(params, key):
+    value = params.get(key)
+    return date.fromisoformat(value) if value else None
+
+
+def _write_json(path: Path, content):
+    path.write_bytes(dumps(content))
+    return path
+
+
+def _export(db, statement, params, stem: Path):
+    fmt = params.get("format", "csv")
+    if fmt not in MEDIA_TYPES:
+        raise ValueError("Invalid format (use csv or ndjson)")
+    path = stem.with_suffix("." + fmt)
+    with open(path, "w", newline="") as artifact:
+        for chunk in export_chunks(db, statement, fmt):
+            artifact.write(chunk)
+    return {"format": fmt, "bytes": path.stat().st_size}, path
+
+
+def run_export_loans(db: Session, params, stem: Path):
+    return _export(db, loans_statement(), params, stem)
+
+
+def run_export_payments(db: Session, params, stem: Path):
+    statement = payments_statement(_date_param(params, "date_from"), _date_param(params, "date_to"))
+    return _export(db, statement, params, stem)
+
+
+def run_customer_ledger(db: Session, params, stem: Path):
+    customer = db.get(models.Customer, uuid.UUID(str(params.get("customer_id"))))
+    if customer is None:
+        raise ValueError("Customer not found")
+    ledger = build_ledger_entries(db, customer.id)
+    path = _write_json(stem.with_suffix(".json"), {
+        "customer_id": customer.id,
+        "customer_name": customer.name,
+        "customer_phone": customer.phone,
+        "ledger": ledger,
+    })
+    return {"customer_id": str(customer.id), "loans": len(ledger)}, path
+
+
+def run_aging_report(db: Session, params, stem: Path):
+    report = build_aging_report(db, _date_param(params, "as_of") or date.today())
+    path = _write_json(stem.with_suffix(".json"), report)
+    return {"total_loans": report["total_loans"], "total_outstanding": str(report["total_outstanding"])}, path
+
+
+def run_reconcile_balances(db: Session, params, stem: Path):
+    fix = not params.get("dry_run", False)
+    drift = reconcile_balances(db, fix=fix)
+    # Shared (Redis) summaries may have been built from drifted balances
+    if drift and fix:
+        loan_summary_cache.clear()
+    path = _write_json(stem.with_suffix(".json"), drift)
+    return {"drifted": len(drift), "fixed": fix}, path
+
+
+def run_snapshot_loans(db: Session, params, stem: Path):
+    written, changed = snapshot_loans(db)
+    if changed:
+        loan_summary_cache.clear()
+    return {"snapshots": written, "statuses_changed": changed}, None
+
+
+def run_rebuild_profiles(db: Session, params, stem: Path):
+    return {"customers": rebuild_profiles(db)}, None
+
+
+def run_build_due_list(db: Session, params, stem: Path):
+    first = _date_param(params, "date") or date.today()
+    days = int(params.get("days", 1))
+    counts = {}
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        counts[day.isoformat()] = build_due_list(db, day)
+    return {"loans_due": counts}, None
+
+
+class JobKind(NamedTuple):
+    handler: Callable
+    # Read-only jobs run on the replica session when one is configured
+    read_only: bool
+
+
+JOB_KINDS = {
+    "export_loans": JobKind(run_export_loans, read_only=True),
+    "export_payments": JobKind(run_export_payments, read_only=True),
+    "customer_ledger": JobKind(run_customer_ledger, read_only=True),
+    "aging_report": JobKind(run_aging_report, read_only=True),
+    "reconcile_balances": JobKind(run_reconcile_balances, read_only=False),
+    "snapshot_loans": JobKind(run_snapshot_loans, read_only=False),
+    "build_due_list": JobKind(run_build_due_list, read_only=False),
+    "rebuild_profiles": JobKind(run_rebuild_profiles, read_only=False),
+}
+
+
+# ---------------------------------------------------
+# WORKER POOL
+# ---------------------------------------------------
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class JobRunner:
+    """
+    In-process pool of JOB_WORKERS threads, separate from the threadpool
+    that serves sync endpoints, so reports cannot starve API requests.
+
+    Jobs are rows in `jobs`; a worker claims a queued row with a conditional
+    UPDATE, so with several app processes each job still runs once. While
+    jobs run, one heartbeat thread per process stamps their rows, so only
+    jobs whose process is gone are ever swept.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._running = set()
+        self._lock = threading.Lock()
+        self._stopped = None
+
+    def start(self):
+        JOB_ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._stopped = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(self._stopped,), name="job-heartbeat", daemon=True).start()
+        self._recover()
+
+    def shutdown(self):
+        if self._stopped is not None:
+            self._stopped.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, db: Session, kind: str, params) -> models.Job:
+        """Queue a job and commit; raises ValueError for an unknown kind."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind (use one of: {', '.join(sorted(JOB_KINDS))})")
+
+        # Jobs lost with another process would otherwise hold queue slots
+        # until this one restarts
+        self._fail_stale(db)
+        pending = db.execute(
+            select(func.count(models.Job.id)).where(models.Job.status.in_(("queued", "running")))
+        ).scalar()
+        if pending >= JOB_QUEUE_LIMIT:
+            raise JobQueueFull(f"{pending} jobs are already queued or running")
+
+        job = models.Job(kind=kind, params=params, status="queued")
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self._dispatch(job.id)
+        return job
+
+    def _dispatch(self, job_id):
+        # Not started (CLI, tests without lifespan): the job stays queued
+        # until a running app picks it up at startup
+        if self._executor is not None:
+            self._executor.submit(self._run, job_id)
+
+    @staticmethod
+    def _fail_stale(db: Session):
+        """Fail "running" jobs without a heartbeat for JOB_STALE_SECONDS (their process died) and commit."""
+        job = models.Job
+        last_seen = func.coalesce(job.heartbeat_at, job.started_at)
+        db.execute(
+            update(job)
+            .where(job.status == "running", last_seen < _now() - timedelta(seconds=JOB_STALE_SECONDS))
+            .values(status="failed", error="Interrupted: the worker stopped", finished_at=_now())
+        )
+        db.commit()
+
+    def _heartbeat(self, stopped: threading.Event):
+        """Stamp this process's running jobs every JOB_HEARTBEAT_SECONDS until `stopped` is set."""
+        job = models.Job
+        while not stopped.wait(JOB_HEARTBEAT_SECONDS):
+            with self._lock:
+                running = list(self._running)
+            if not running:
+                continue
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(job)
+                    .where(job.id.in_(running), job.status == "running")
+                    .values(heartbeat_at=_now())
+                )
+                db.commit()
+            except Exception:
+                logger.exception("job heartbeat failed")
+            finally:
+                db.close()
+
+    def _recover(self):
+        """Fail jobs lost with a dead process and dispatch jobs still queued."""
+        db = SessionLocal()
+        try:
+            job = models.Job
+            self._fail_stale(db)
+            queued = db.execute(
+                select(job.id).where(job.status == "queued").order_by(job.created_at)
+            ).scalars().all()
+        finally:
+            db.close()
+
+        for job_id in queued:
+            self._dispatch(job_id)
+
+    def _run(self, job_id):
+        job = models.Job
+        db = SessionLocal()
+        try:
+            now = _now()
+            claimed = db.execute(
+                update(job)
+                .where(job.id == job_id, job.status == "queued")
+                .values(status="running", started_at=now, heartbeat_at=now)
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return
+            with self._lock:
+                self._running.add(job_id)
+
+            kind_name, params = db.execute(select(job.kind, job.params).where(job.id == job_id)).one()
+            # Release the pooled connection while the job runs
+            db.commit()
+
+            kind = JOB_KINDS[kind_name]
+            work_db = (ReadSessionLocal if kind.read_only else SessionLocal)()
+            try:
+                result, artifact = kind.handler(work_db, params or {}, JOB_ARTIFACT_DIR / str(job_id))
+                values = {"status": "succeeded", "result": result, "artifact_path": str(artifact) if artifact else None}
+            except Exception as exc:
+                logger.exception("job %s (%s) failed", job_id, kind_name)
+                work_db.rollback()
+                values = {"status": "failed", "error": f"{type(exc).__name__}: {exc}"}
+            finally:
+                work_db.close()
+                with self._lock:
+                    self._running.discard(job_id)
+
+            # A row already swept as failed keeps that status
+            db.execute(
+                update(job)
+                .where(job.id == job_id, job.status == "running")
+                .values(finished_at=_now(), **values)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
+job_runner = JobRunner(JOB_WORKERS)
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from .schedule import next_due_date
+
+
+# ---------------------------------------------------
+# CUSTOMER LEDGER ENGINE
+# ---------------------------------------------------
+# Builds the ledger for every loan of a customer in a fixed number of
+# queries, whatever the number of loans:
+#   1) loans + their running balance (`loan_balances`)
+#   2) every payment of those loans (one batched IN query)
+def build_ledger_entries(db: Session, customer_id):
+
+    loan = models.Loan
+    balance = models.LoanBalance
+    payment = models.Payment
+
+    # Plain column rows, no ORM objects; money stays Decimal for the response
+    rows = (
+        db.query(
+            loan.id,
+            loan.principal_amount,
+            loan.interest_amount,
+            loan.total_amount,
+            loan.installment_amount,
+            loan.number_of_installments,
+            loan.repayment_frequency,
+            loan.start_date,
+            loan.end_date,
+            loan.status,
+            balance.loan_id.label("balance_loan_id"),
+            balance.total_paid,
+            balance.last_payment_date,
+        )
+        .outerjoin(balance, balance.loan_id == loan.id)
+        .filter(loan.customer_id == customer_id)
+        .all()
+    )
+
+    if not rows:
+        return []
+
+    payments_by_loan = defaultdict(list)
+    payments = (
+        db.query(
+            payment.loan_id,
+            payment.id.label("payment_id"),
+            payment.paid_amount.label("amount"),
+            payment.payment_date.label("date"),
+            payment.notes,
+        )
+        .filter(payment.loan_id.in_([row.id for row in rows]))
+        .order_by(payment.loan_id, payment.payment_date.asc())
+        .all()
+    )
+    for p in payments:
+        payments_by_loan[p.loan_id].append(p)
+
+    today = date.today()
+    ledger = []
+
+    for row in rows:
+
+        loan_payments = payments_by_loan[row.id]
+
+        # Loans not yet reconciled into loan_balances: derive from the batch
+        if row.balance_loan_id is not None:
+            total_paid = row.total_paid
+            last_payment_date = row.last_payment_date
+        else:
+            total_paid = sum((p.amount for p in loan_payments), Decimal(0))
+            last_payment_date = max((p.date for p in loan_payments), default=None)
+
+        remaining_amount = row.total_amount - total_paid
+
+        installments_paid = int(total_paid / row.installment_amount)
+        installments_remaining = row.number_of_installments - installments_paid
+
+        # Overdue calculation
+        anchor = row.start_date if installments_paid == 0 else last_payment_date
+        next_due = next_due_date(row.repayment_frequency, anchor)
+
+        is_overdue = today > next_due
+        overdue_days = (today - next_due).days if is_overdue else 0
+
+        ledger.append({
+            "loan_id": row.id,
+            "principal_amount": row.principal_amount,
+            "interest_amount": row.interest_amount,
+            "total_amount": row.total_amount,
+            "installment_amount": row.installment_amount,
+            "number_of_installments": row.number_of_installments,
+            "installments_paid": installments_paid,
+            "installments_remaining": installments_remaining,
+            "total_paid": total_paid,
+            "remaining_amount": remaining_amount,
+            "start_date": row.start_date,
+            "end_date": row.end_date,
+            "last_payment_date": last_payment_date,
+            "next_due_date": next_due,
+            "is_overdue": is_overdue,
+            "overdue_days": overdue_days,
+            "status": row.status,
+            "payments": [
+                {"payment_id": p.payment_id, "amount": p.amount, "date": p.date, "notes": p.notes}
+                for p in loan_payments
+            ]
+        })
+
+    return ledger
@@ -0,0 +1,213 @@
+import os
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+
+# Write a fresh snapshot once a loan has this many events past its last one
+SNAPSHOT_EVERY = int(os.getenv("LOAN_SNAPSHOT_EVERY", "20"))
+
+CHUNK_SIZE = 1000
+
+# Statuses derived from the balance; anything else (set by hand) is left alone
+DERIVED_STATUSES = ("active", "completed")
+
+
+# ---------------------------------------------------
+# EVENT LOG
+# ---------------------------------------------------
+# `loan_events` is append-only: one row per disbursement, payment and
+# reversal. A loan's state is its latest `loan_snapshots` row plus the
+# events written after it, and `loans.status` is written back whenever that
+# state crosses between active and completed.
+
+def record_events(db: Session, events):
+    """Append event dicts (loan_id, event_type, amount, event_date[, payment_id]) in the caller's transaction."""
+    events = list(events)
+    for start in range(0, len(events), CHUNK_SIZE):
+        db.execute(insert(models.LoanEvent).values(events[start:start + CHUNK_SIZE]))
+
+
+def record_event(db: Session, loan_id, event_type, amount, event_date, payment_id=None):
+    record_events(db, [{
+        "loan_id": loan_id,
+        "event_type": event_type,
+        "amount": amount,
+        "event_date": event_date,
+        "payment_id": payment_id,
+    }])
+
+
+# ---------------------------------------------------
+# STATE = SNAPSHOT + REPLAY
+# ---------------------------------------------------
+def _initial_state(head):
+    if head.last_event_id is None:
+        total_paid, payment_count, last_event_id = Decimal(0), 0, 0
+    else:
+        total_paid, payment_count, last_event_id = head.total_paid, head.payment_count, head.last_event_id
+    return {
+        "loan_id": head.id,
+        "customer_id": head.customer_id,
+        "start_date": head.start_date,
+        "repayment_frequency": head.repayment_frequency,
+        "total_amount": head.total_amount,
+        "installment_amount": head.installment_amount,
+        "number_of_installments": head.number_of_installments,
+        "stored_status": head.status,
+        "total_paid": total_paid,
+        "payment_count": payment_count,
+        "last_event_id": last_event_id,
+        "replayed": 0,
+    }
+
+
+def _apply(state, event):
+    if event.event_type == "payment":
+        state["total_paid"] += event.amount
+        state["payment_count"] += 1
+    elif event.event_type == "reversal":
+        state["total_paid"] -= event.amount
+        state["payment_count"] -= 1
+    state["last_event_id"] = event.id
+    state["replayed"] += 1
+
+
+def _finish(state):
+    remaining_amount = state["total_amount"] - state["total_paid"]
+    state["remaining_amount"] = remaining_amount
+    state["installments_paid"] = int(state["total_paid"] / state["installment_amount"])
+    if state["stored_status"] in DERIVED_STATUSES:
+        state["status"] = "completed" if remaining_amount <= 0 else "active"
+    else:
+        state["status"] = state["stored_status"]
+    return state
+
+
+def loan_states(db: Session, loan_ids):
+    """{loan_id: state} for the given loans, in two queries; unknown ids are skipped."""
+    loan_ids = set(loan_ids)
+    if not loan_ids:
+        return {}
+
+    loan = models.Loan
+    snapshot = models.LoanSnapshot
+    event = models.LoanEvent
+
+    heads = db.execute(
+        select(
+            loan.id,
+            loan.customer_id,
+            loan.start_date,
+            loan.repayment_frequency,
+            loan.total_amount,
+            loan.installment_amount,
+            loan.number_of_installments,
+            loan.status,
+            snapshot.last_event_id,
+            snapshot.total_paid,
+            snapshot.payment_count,
+        )
+        .outerjoin(snapshot, snapshot.loan_id == loan.id)
+        .where(loan.id.in_(loan_ids))
+    ).all()
+    states = {head.id: _initial_state(head) for head in heads}
+
+    events = db.execute(
+        select(event.id, event.loan_id, event.event_type, event.amount)
+        .outerjoin(snapshot, snapshot.loan_id == event.loan_id)
+        .where(event.loan_id.in_(loan_ids), event.id > func.coalesce(snapshot.last_event_id, 0))
+        .order_by(event.loan_id, event.id)
+    ).all()
+    for row in events:
+        _apply(states[row.loan_id], row)
+
+    return {loan_id: _finish(state) for loan_id, state in states.items()}
+
+
+def loan_state(db: Session, loan_id):
+    """Current state of one loan, or None if it does not exist."""
+    return loan_states(db, [loan_id]).get(loan_id)
+
+
+# ---------------------------------------------------
+# WRITE-BACK AND SNAPSHOTS
+# ---------------------------------------------------
+def _write_snapshots(db: Session, states):
+    snapshot = models.LoanSnapshot
+    states = list(states)
+    for start in range(0, len(states), CHUNK_SIZE):
+        chunk = states[start:start + CHUNK_SIZE]
+        db.execute(delete(snapshot).where(snapshot.loan_id.in_([state["loan_id"] for state in chunk])))
+        db.execute(insert(snapshot).values([
+            {
+                "loan_id": state["loan_id"],
+                "last_event_id": state["last_event_id"],
+                "total_paid": state["total_paid"],
+                "payment_count": state["payment_count"],
+                "installments_paid": state["installments_paid"],
+                "remaining_amount": state["remaining_amount"],
+                "status": state["status"],
+            }
+            for state in chunk
+        ]))
+
+
+def _write_statuses(db: Session, states):
+    """Persist status changes; returns the number of loans updated."""
+    changed = {}
+    for state in states:
+        if state["status"] != state["stored_status"]:
+            changed.setdefault(state["status"], []).append(state["loan_id"])
+
+    for status, loan_ids in changed.items():
+        for start in range(0, len(loan_ids), CHUNK_SIZE):
+            db.execute(
+                update(models.Loan)
+                .where(models.Loan.id.in_(loan_ids[start:start + CHUNK_SIZE]))
+                .values(status=status)
+            )
+    return sum(len(loan_ids) for loan_ids in changed.values())
+
+
+def sync_loans(db: Session, loan_ids):
+    """
+    Fold the loans' new events in the caller's transaction: write back any
+    status change, and snapshot loans whose status changed or that have
+    SNAPSHOT_EVERY events past their last snapshot. Returns the states.
+    """
+    states = loan_states(db, loan_ids)
+    _write_statuses(db, states.values())
+    _write_snapshots(db, [
+        state for state in states.values()
+        if state["replayed"] and (state["status"] != state["stored_status"] or state["replayed"] >= SNAPSHOT_EVERY)
+    ])
+    return states
+
+
+def snapshot_loans(db: Session, batch_size: int = 5000):
+    """
+    Snapshot every loan with events past its last snapshot and correct any
+    stale status, then commit. Returns (snapshots written, statuses changed).
+    """
+    snapshot = models.LoanSnapshot
+    event = models.LoanEvent
+
+    stale = db.execute(
+        select(event.loan_id)
+        .outerjoin(snapshot, snapshot.loan_id == event.loan_id)
+        .where(event.id > func.coalesce(snapshot.last_event_id, 0))
+        .distinct()
+    ).scalars().all()
+
+    written = changed = 0
+    for start in range(0, len(stale), batch_size):
+        states = loan_states(db, stale[start:start + batch_size]).values()
+        changed += _write_statuses(db, states)
+        _write_snapshots(db, states)
+        written += len(states)
+        db.commit()
+
+    return written, changed
@@ -0,0 +1,177 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from .cache import CACHES
+
+logger = logging.getLogger("microfinance.slow_query")
+
+# Statements slower than this are logged with their SQL and parameters
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Upper bounds (seconds / statements) of the histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+# ---------------------------------------------------
+# PER-REQUEST DB STATS
+# ---------------------------------------------------
+class RequestStats:
+    """SQL statement count and time spent in the database for one request."""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+# Holds a mutable RequestStats so threadpool endpoints, which run in a copy
+# of the request's context, still add to the same object
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+# The start time rides on the statement's execution context rather than a
+# per-connection stack: a statement that raises never reaches
+# after_cursor_execute, and its context is simply dropped with it
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning("slow query (%.1f ms): %s | params=%r", elapsed * 1000, statement, parameters)
+
+
+def instrument(engine):
+    """Attach the timing listeners to a (sync) Engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------------------------------------------------
+# PER-ROUTE HISTOGRAMS
+# ---------------------------------------------------
+class Histogram:
+    """Cumulative-bucket histogram keyed by label tuple, Prometheus style."""
+
+    def __init__(self, name: str, help_text: str, buckets, labels=("method", "route")):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts, _, _ = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{labels}}} {total}")
+                lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time to the response start, per route.", DURATION_BUCKETS
+)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL, per request.", DURATION_BUCKETS
+)
+request_queries = Histogram(
+    "http_request_db_queries", "SQL statements executed, per request.", QUERY_BUCKETS
+)
+
+
+def render_cache_counters():
+    lines = []
+    for counter in ("hits", "misses", "evictions"):
+        name = f"cache_{counter}_total"
+        lines += [f"# HELP {name} Cache {counter} since the process started.", f"# TYPE {name} counter"]
+        for cache_name, cache in sorted(CACHES.items()):
+            value = cache.stats()[counter]
+            if value is not None:
+                lines.append(f'{name}{{cache="{cache_name}"}} {value}')
+    return lines
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in (request_duration, request_db_time, request_queries):
+        lines.extend(histogram.render())
+    lines.extend(render_cache_counters())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------
+class QueryMetricsMiddleware:
+    """
+    Count the SQL run by each request and report it.
+
+    Adds a `Server-Timing` header (`db` and `total` durations, query count)
+    and feeds the per-route histograms served at /metrics. Queries run by a
+    streaming body after the headers are sent are not included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                route = scope.get("route")
+                label_values = (scope["method"], getattr(route, "path", "<unmatched>"))
+                request_duration.observe(label_values, elapsed)
+                request_db_time.observe(label_values, stats.db_time)
+                request_queries.observe(label_values, stats.queries)
+
+                timing = (
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+                    f"total;dur={elapsed * 1000:.2f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
@@ -0,0 +1,83 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+CURSOR_HEADER = "X-Next-Cursor"
+
+
+# ---------------------------------------------------
+# KEYSET (CURSOR) PAGINATION
+# ---------------------------------------------------
+# Pages are keyed on (created_at, id) so the database seeks straight to the
+# next row instead of reading and discarding `skip` rows.
+
+class stored_now(FunctionElement):
+    """
+    Insert-time `created_at` for keyed tables. SQLite keeps timestamps as
+    text, and CURRENT_TIMESTAMP has no fraction while SQLAlchemy writes six
+    digits, so rows would sort and compare in two formats; the SQLite form
+    writes the six-digit one. Other databases use now().
+    """
+    inherit_cache = True
+
+
+@compiles(stored_now)
+def _compile_stored_now(element, compiler, **kw):
+    return "now()"
+
+
+@compiles(stored_now, "sqlite")
+def _compile_stored_now_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Return (created_at, id) from an opaque cursor; ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def paginate(statement, created_col, id_col, skip: int, limit: int, cursor: str | None = None, descending: bool = False):
+    """
+    Order `statement` by (created_at, id) and limit it to one page.
+
+    With a cursor the page starts right after the cursor row; without one
+    the old `skip` offset is applied so existing callers keep working.
+    Returns the statement for the caller to execute (sync or async).
+    """
+    # The bare columns, so the (created_at, id) index serves both the sort
+    # and the cursor seek
+    if descending:
+        statement = statement.order_by(created_col.desc(), id_col.desc())
+    else:
+        statement = statement.order_by(created_col.asc(), id_col.asc())
+
+    if cursor:
+        key = tuple_(created_col, id_col)
+        position = decode_cursor(cursor)
+        statement = statement.where(key < position if descending else key > position)
+    elif skip:
+        statement = statement.offset(skip)
+
+    return statement.limit(limit)
+
+
+def next_cursor(rows, limit: int):
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,294 @@
+import os
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from .schedule import installment_due_dates, to_paise
+
+# Exposure limits checked when loans are created; 0 disables a limit
+MAX_CUSTOMER_EXPOSURE = Decimal(os.getenv("MAX_CUSTOMER_EXPOSURE", "0"))
+MAX_ACTIVE_LOANS_PER_CUSTOMER = int(os.getenv("MAX_ACTIVE_LOANS_PER_CUSTOMER", "0"))
+
+CHUNK_SIZE = 1000
+
+PROFILE_FIELDS = (
+    "active_exposure", "lifetime_borrowed", "lifetime_repaid",
+    "payment_count", "on_time_payments", "max_days_late",
+    "active_loans", "completed_loans",
+)
+
+
+# ---------------------------------------------------
+# CUSTOMER PROFILES
+# ---------------------------------------------------
+# `customer_profiles` holds one row per customer with their exposure and
+# repayment record, kept current by SQL increments on every loan and
+# payment write, so the profile endpoint and the exposure check are a
+# primary-key lookup. A payment is on time if it lands on or before the due
+# date of the installment it pays into: the first one not yet fully covered
+# by the payments posted before it (loan event order, so a full recompute
+# agrees with the increments).
+
+def limits_enabled():
+    return bool(MAX_CUSTOMER_EXPOSURE or MAX_ACTIVE_LOANS_PER_CUSTOMER)
+
+
+def _days_late(start_dates, frequencies, counts, installment_paise, paid_before_paise, payment_dates):
+    """Days each payment came after the due date of the installment it pays into (0 if on time)."""
+    counts = np.asarray(counts, dtype=np.int64)
+    installment_no = np.minimum(np.asarray(paid_before_paise) // np.asarray(installment_paise) + 1, counts)
+    due_dates = installment_due_dates(start_dates, frequencies, installment_no)
+    late = (np.asarray(payment_dates, dtype="datetime64[D]") - due_dates).astype(np.int64)
+    return np.maximum(late, 0)
+
+
+def _empty_profile():
+    profile = dict.fromkeys(PROFILE_FIELDS, 0)
+    for field in ("active_exposure", "lifetime_borrowed", "lifetime_repaid"):
+        profile[field] = Decimal(0)
+    return profile
+
+
+# ---------------------------------------------------
+# FULL COMPUTATION
+# ---------------------------------------------------
+def compute_profiles(db: Session, customer_ids):
+    """{customer_id: profile dict} computed from loans and payments; read-only."""
+    customer_ids = set(customer_ids)
+    profiles = {customer_id: _empty_profile() for customer_id in customer_ids}
+    if not customer_ids:
+        return profiles
+
+    loan = models.Loan
+    payment = models.Payment
+    event = models.LoanEvent
+    loans = db.execute(
+        select(
+            loan.id, loan.customer_id, loan.principal_amount, loan.total_amount, loan.installment_amount,
+            loan.number_of_installments, loan.start_date, loan.repayment_frequency, loan.status,
+        )
+        .where(loan.customer_id.in_(customer_ids))
+    ).all()
+    # Reversed payments are gone from `payments`, so the join drops their events
+    payments = db.execute(
+        select(payment.loan_id, payment.paid_amount, payment.payment_date)
+        .select_from(loan)
+        .join(event, event.loan_id == loan.id)
+        .join(payment, payment.id == event.payment_id)
+        .where(loan.customer_id.in_(customer_ids), event.event_type == "payment")
+        .order_by(event.loan_id, event.id)
+    ).all()
+
+    by_id = {row.id: row for row in loans}
+    paid = defaultdict(Decimal)
+    for row in payments:
+        paid[row.loan_id] += row.paid_amount
+
+    for row in loans:
+        profile = profiles[row.customer_id]
+        profile["lifetime_borrowed"] += row.principal_amount
+        profile["lifetime_repaid"] += paid[row.id]
+        if row.status == "active":
+            profile["active_loans"] += 1
+            profile["active_exposure"] += row.total_amount - paid[row.id]
+        elif row.status == "completed":
+            profile["completed_loans"] += 1
+
+    if payments:
+        heads = [by_id[row.loan_id] for row in payments]
+        amounts = to_paise([row.paid_amount for row in payments])
+        # Paid into the loan before each payment: running total within each loan's run of rows
+        running = np.cumsum(amounts)
+        first = np.flatnonzero(np.r_[True, [a.loan_id != b.loan_id for a, b in zip(payments[1:], payments)]])
+        run_lengths = np.diff(np.r_[first, len(payments)])
+        paid_before = running - amounts - np.repeat((running - amounts)[first], run_lengths)
+
+        late = _days_late(
+            [head.start_date for head in heads],
+            [head.repayment_frequency for head in heads],
+            [head.number_of_installments for head in heads],
+            to_paise([head.installment_amount for head in heads]),
+            paid_before,
+            [row.payment_date for row in payments],
+        )
+        for head, days in zip(heads, late.tolist()):
+            profile = profiles[head.customer_id]
+            profile["payment_count"] += 1
+            profile["on_time_payments"] += days == 0
+            profile["max_days_late"] = max(profile["max_days_late"], days)
+
+    return profiles
+
+
+def refresh_profiles(db: Session, customer_ids):
+    """Rewrite the given customers' profile rows from scratch in the caller's transaction."""
+    customer_ids = list(set(customer_ids))
+    profile = models.CustomerProfile
+    for start in range(0, len(customer_ids), CHUNK_SIZE):
+        chunk = customer_ids[start:start + CHUNK_SIZE]
+        computed = compute_profiles(db, chunk)
+        db.execute(delete(profile).where(profile.customer_id.in_(chunk)))
+        db.execute(insert(profile).values([
+            {"customer_id": customer_id, **values} for customer_id, values in computed.items()
+        ]))
+
+
+def rebuild_profiles(db: Session, batch_size: int = 5000):
+    """Recompute every customer's profile, committing per batch. Returns the number rebuilt."""
+    customer_ids = db.execute(select(models.Customer.id).order_by(models.Customer.id)).scalars().all()
+    for start in range(0, len(customer_ids), batch_size):
+        refresh_profiles(db, customer_ids[start:start + batch_size])
+        db.commit()
+    return len(customer_ids)
+
+
+def open_profile(db: Session, customer_id):
+    """Create the zero profile row for a freshly inserted (flushed) customer."""
+    db.add(models.CustomerProfile(customer_id=customer_id, **_empty_profile()))
+
+
+# ---------------------------------------------------
+# INCREMENTAL UPDATES
+# ---------------------------------------------------
+def _apply_deltas(db: Session, deltas):
+    """
+    Add per-customer deltas in SQL, so concurrent writers cannot lose each
+    other's increments. Customers without a profile row yet get theirs
+    rebuilt, which already includes the caller's flushed rows.
+    """
+    profile = models.CustomerProfile
+    missing = []
+    for customer_id, delta in deltas.items():
+        values = {
+            getattr(profile, field): getattr(profile, field) + amount
+            for field, amount in delta.items() if field != "max_days_late" and amount
+        }
+        if delta.get("max_days_late"):
+            values[profile.max_days_late] = case(
+                (profile.max_days_late < delta["max_days_late"], delta["max_days_late"]),
+                else_=profile.max_days_late,
+            )
+        updated = db.execute(
+            update(profile).where(profile.customer_id == customer_id).values(values)
+        ).rowcount
+        if not updated:
+            missing.append(customer_id)
+
+    if missing:
+        refresh_profiles(db, missing)
+
+
+def record_loans(db: Session, loans):
+    """Add newly created loans (objects or dicts with customer_id, principal_amount, total_amount)."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for loan in loans:
+        if isinstance(loan, dict):
+            customer_id, principal, total = loan["customer_id"], loan["principal_amount"], loan["total_amount"]
+        else:
+            customer_id, principal, total = loan.customer_id, loan.principal_amount, loan.total_amount
+        delta = deltas[customer_id]
+        delta["lifetime_borrowed"] += principal
+        delta["active_exposure"] += total
+        delta["active_loans"] += 1
+    _apply_deltas(db, deltas)
+
+
+def record_payments(db: Session, payments, states):
+    """
+    Add newly posted payments (dicts with loan_id, paid_amount, payment_date),
+    in the order their loan events were written.
+
+    `states` are the loans' states after the payments, as returned by
+    `sync_loans`; they give what was paid before this batch and whether the
+    batch completed the loan.
+    """
+    per_loan = defaultdict(list)
+    for row in payments:
+        per_loan[row["loan_id"]].append(row)
+
+    rows, paid_before = [], []
+    for loan_id, loan_rows in per_loan.items():
+        before = states[loan_id]["total_paid"] - sum(row["paid_amount"] for row in loan_rows)
+        for row in loan_rows:
+            rows.append(row)
+            paid_before.append(before)
+            before += row["paid_amount"]
+    if not rows:
+        return
+
+    heads = [states[row["loan_id"]] for row in rows]
+    late = _days_late(
+        [head["start_date"] for head in heads],
+        [head["repayment_frequency"] for head in heads],
+        [head["number_of_installments"] for head in heads],
+        to_paise([head["installment_amount"] for head in heads]),
+        to_paise(paid_before),
+        [row["payment_date"] for row in rows],
+    )
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    for row, head, days in zip(rows, heads, late.tolist()):
+        delta = deltas[head["customer_id"]]
+        delta["lifetime_repaid"] += row["paid_amount"]
+        delta["payment_count"] += 1
+        delta["on_time_payments"] += days == 0
+        delta["max_days_late"] = max(delta["max_days_late"], days)
+        # Loans with a hand-set status (e.g. written off) are not exposure
+        if head["stored_status"] == "active":
+            delta["active_exposure"] -= row["paid_amount"]
+
+    for state in states.values():
+        if state["stored_status"] == "active" and state["status"] == "completed":
+            delta = deltas[state["customer_id"]]
+            delta["active_loans"] -= 1
+            delta["completed_loans"] += 1
+
+    _apply_deltas(db, deltas)
+
+
+# ---------------------------------------------------
+# EXPOSURE LIMITS
+# ---------------------------------------------------
+def lock_profiles(db: Session, customer_ids):
+    """
+    Lock the customers' profile rows until the caller's transaction ends,
+    creating any that are missing; returns {customer_id: (active_exposure, active_loans)}.
+    Loan creations for one customer queue up here, so two of them cannot
+    both pass the limit check.
+    """
+    profile = models.CustomerProfile
+    customer_ids = sorted(set(customer_ids))
+
+    def read():
+        statement = (
+            select(profile.customer_id, profile.active_exposure, profile.active_loans)
+            .where(profile.customer_id.in_(customer_ids))
+            .order_by(profile.customer_id)
+        )
+        if db.get_bind().dialect.name == "sqlite":
+            # No row locks: a no-op write takes SQLite's database write lock instead
+            db.execute(update(profile).where(profile.customer_id.in_(customer_ids)).values(customer_id=profile.customer_id))
+        else:
+            statement = statement.with_for_update()
+        return {row.customer_id: (row.active_exposure, row.active_loans) for row in db.execute(statement)}
+
+    exposures = read()
+    missing = set(customer_ids) - set(exposures)
+    if missing:
+        refresh_profiles(db, missing)
+        exposures = read()
+    return exposures
+
+
+def exposure_error(active_exposure, active_loans, total_amount):
+    """Why a new loan of `total_amount` would break a limit, or None."""
+    total_amount = Decimal(str(total_amount))
+    if MAX_CUSTOMER_EXPOSURE and active_exposure + total_amount > MAX_CUSTOMER_EXPOSURE:
+        return "Customer exposure limit exceeded"
+    if MAX_ACTIVE_LOANS_PER_CUSTOMER and active_loans + 1 > MAX_ACTIVE_LOANS_PER_CUSTOMER:
+        return "Customer active loan limit exceeded"
+    return None
@@ -0,0 +1,33 @@
+from ..database import DATABASE_READ_URL, READ_PRIMARY_COOKIE, READ_YOUR_WRITES_SECONDS
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+# ---------------------------------------------------
+# READ-YOUR-WRITES COOKIE
+# ---------------------------------------------------
+class ReadYourWritesMiddleware:
+    """
+    After a successful write, set a cookie that sends the client's reads to
+    the primary for READ_YOUR_WRITES_SECONDS, so a page refreshed right after
+    posting a payment does not miss it on a lagging replica. Does nothing
+    when no replica is configured.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={READ_YOUR_WRITES_SECONDS}; Path=/; SameSite=Lax"
+        ).encode()
+
+    async def __call__(self, scope, receive, send):
+        if not DATABASE_READ_URL or scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
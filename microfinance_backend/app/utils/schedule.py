@@ -0,0 +1,201 @@
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+
+
+# ---------------------------------------------------
+# INSTALLMENT SCHEDULES
+# ---------------------------------------------------
+# Installment k (1-based) of a loan falls k periods after its start date.
+# Monthly installments keep the start day, clamped to the end of shorter
+# months (Jan 31 -> Feb 28/29 -> Mar 31).
+# Amounts are handled in integer paise so the arrays stay exact.
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+PERIOD_DAYS = {"daily": 1, "weekly": 7}
+
+
+def add_months(d: date, months: int = 1) -> date:
+    month_index = d.month - 1 + months
+    year = d.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(d.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+def next_due_date(frequency: str, anchor: date) -> date:
+    """The due date one repayment period after `anchor`."""
+    if frequency == "monthly":
+        return add_months(anchor, 1)
+    if frequency in PERIOD_DAYS:
+        return anchor + timedelta(days=PERIOD_DAYS[frequency])
+    raise ValueError(f"Invalid repayment frequency: {frequency}")
+
+
+def earliest_anchor(frequency: str, due_from: date) -> date:
+    """
+    Earliest anchor date whose next due date falls on or after `due_from`.
+
+    Lets "next due >= X" be tested as "last payment >= anchor", a plain
+    date comparison the database can run for every loan in one pass.
+    """
+    if frequency in PERIOD_DAYS:
+        return due_from - timedelta(days=PERIOD_DAYS[frequency])
+    if frequency != "monthly":
+        raise ValueError(f"Invalid repayment frequency: {frequency}")
+
+    # Month-end clamping makes add_months non-injective; walk to the boundary
+    anchor = add_months(due_from, -1)
+    while add_months(anchor, 1) < due_from:
+        anchor += timedelta(days=1)
+    while add_months(anchor - timedelta(days=1), 1) >= due_from:
+        anchor -= timedelta(days=1)
+    return anchor
+
+
+def installment_due_date(start_date: date, frequency: str, installment_no: int) -> date:
+    """Due date of installment `installment_no` (1-based) of a single loan."""
+    if frequency == "monthly":
+        return add_months(start_date, installment_no)
+    if frequency in PERIOD_DAYS:
+        return start_date + timedelta(days=PERIOD_DAYS[frequency] * installment_no)
+    raise ValueError(f"Invalid repayment frequency: {frequency}")
+
+
+@dataclass
+class Schedules:
+    """Installment calendars of many loans, flattened into parallel arrays."""
+
+    loan_index: np.ndarray       # position of the loan in the input, per installment
+    installment_no: np.ndarray   # 1-based installment number
+    due_dates: np.ndarray        # datetime64[D]
+    amounts: np.ndarray          # int64 paise
+
+    def due_on(self, day: date) -> np.ndarray:
+        """Positions of the loans with an installment due on `day`."""
+        return np.unique(self.loan_index[self.due_dates == np.datetime64(day, "D")])
+
+    def due_between(self, start: date, end: date) -> np.ndarray:
+        """Boolean mask of installments due in [start, end]."""
+        return (self.due_dates >= np.datetime64(start, "D")) & (self.due_dates <= np.datetime64(end, "D"))
+
+    def for_loan(self, position: int):
+        """[(installment_no, due_date, amount_paise), ...] for one loan."""
+        mask = self.loan_index == position
+        return list(zip(
+            self.installment_no[mask].tolist(),
+            self.due_dates[mask].astype(object).tolist(),
+            self.amounts[mask].tolist(),
+        ))
+
+
+def to_paise(amounts) -> np.ndarray:
+    return np.rint(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64)
+
+
+def installment_due_dates(start_dates, frequencies, installment_nos) -> np.ndarray:
+    """
+    Vectorized `installment_due_date`: element i is the due date of
+    installment `installment_nos[i]` of a loan starting on `start_dates[i]`.
+    Returns datetime64[D].
+    """
+    starts = np.asarray(start_dates, dtype="datetime64[D]")
+    frequencies = np.asarray(frequencies, dtype=object)
+    installment_nos = np.asarray(installment_nos, dtype=np.int64)
+
+    # Daily / weekly: fixed number of days per period
+    step = np.zeros(len(starts), dtype=np.int64)
+    step[frequencies == "daily"] = 1
+    step[frequencies == "weekly"] = 7
+    due_dates = starts + (installment_nos * step).astype("timedelta64[D]")
+
+    # Monthly: same day of month, clamped to the month's length
+    monthly = frequencies == "monthly"
+    if monthly.any():
+        start_month = starts[monthly].astype("datetime64[M]")
+        start_day = (starts[monthly] - start_month.astype("datetime64[D]")).astype(np.int64) + 1
+        target_month = start_month + installment_nos[monthly].astype("timedelta64[M]")
+        month_start = target_month.astype("datetime64[D]")
+        month_length = ((target_month + 1).astype("datetime64[D]") - month_start).astype(np.int64)
+        due_dates[monthly] = month_start + (np.minimum(start_day, month_length) - 1).astype("timedelta64[D]")
+
+    return due_dates
+
+
+def installments_due_on(start_dates, frequencies, counts, day: date) -> np.ndarray:
+    """
+    For each loan, the number of the installment due on `day`, or 0 if none is.
+
+    Works out the one candidate installment per loan arithmetically instead
+    of expanding whole calendars, so it stays O(loans).
+    """
+    starts = np.asarray(start_dates, dtype="datetime64[D]")
+    frequencies = np.asarray(frequencies, dtype=object)
+    counts = np.asarray(counts, dtype=np.int64)
+    target = np.datetime64(day, "D")
+
+    days = (target - starts).astype(np.int64)
+    candidate = np.zeros(len(starts), dtype=np.int64)
+    candidate[frequencies == "daily"] = days[frequencies == "daily"]
+    candidate[frequencies == "weekly"] = days[frequencies == "weekly"] // 7
+    monthly = frequencies == "monthly"
+    candidate[monthly] = (
+        target.astype("datetime64[M]") - starts[monthly].astype("datetime64[M]")
+    ).astype(np.int64)
+
+    in_term = (candidate >= 1) & (candidate <= counts)
+    candidate = np.where(in_term, candidate, 0)
+    due = installment_due_dates(starts, frequencies, candidate) == target
+    return np.where(in_term & due, candidate, 0)
+
+
+def build_schedules(start_dates, frequencies, counts, installment_amounts, total_amounts) -> Schedules:
+    """
+    Generate the full installment calendar for every loan at once.
+
+    All arguments are sequences of equal length, one entry per loan. Each
+    loan gets `count` installments of `installment_amount`, except the last
+    one which carries whatever is left of `total_amount`.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    starts = np.asarray(start_dates, dtype="datetime64[D]")
+    frequencies = np.asarray(frequencies, dtype=object)
+
+    unknown = set(frequencies.tolist()) - set(FREQUENCIES)
+    if unknown:
+        raise ValueError(f"Invalid repayment frequency: {sorted(unknown)[0]}")
+
+    loan_index = np.repeat(np.arange(len(counts)), counts)
+    first_row = np.cumsum(counts) - counts
+    installment_no = np.arange(int(counts.sum())) - np.repeat(first_row, counts) + 1
+
+    due_dates = installment_due_dates(starts[loan_index], frequencies[loan_index], installment_no)
+
+    installment = to_paise(installment_amounts)
+    total = to_paise(total_amounts)
+    last_amount = total - installment * (counts - 1)
+    amounts = np.where(
+        installment_no == counts[loan_index],
+        last_amount[loan_index],
+        installment[loan_index],
+    )
+
+    return Schedules(
+        loan_index=loan_index,
+        installment_no=installment_no,
+        due_dates=due_dates,
+        amounts=amounts,
+    )
+
+
+def build_loan_schedules(loans) -> Schedules:
+    """`build_schedules` for a list of Loan rows, in list order."""
+    return build_schedules(
+        [loan.start_date for loan in loans],
+        [loan.repayment_frequency for loan in loans],
+        [loan.number_of_installments for loan in loans],
+        [loan.installment_amount for loan in loans],
+        [loan.total_amount for loan in loans],
+    )
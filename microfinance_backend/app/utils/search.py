@@ -0,0 +1,53 @@
+from sqlalchemy import case, func, or_, select
+
+from .. import models
+
+
+# ---------------------------------------------------
+# CUSTOMER SEARCH
+# ---------------------------------------------------
+# Digits search the phone by prefix; anything else searches name and
+# address. On Postgres the ILIKE and `%` (trigram similarity) predicates are
+# served by the pg_trgm GIN indexes and results are ranked by similarity;
+# other databases fall back to LIKE with prefix matches ranked first.
+
+MIN_QUERY_LENGTH = 2
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_statement(dialect: str, query: str):
+    """Ranked SELECT of customers matching `query` (caller adds offset/limit)."""
+    customer = models.Customer
+    term = query.strip()
+    escaped = _like_escape(term)
+
+    if term.replace(" ", "").replace("+", "").isdigit():
+        digits = term.replace(" ", "").replace("+", "")
+        return (
+            select(customer)
+            .where(customer.phone.like(_like_escape(digits) + "%", escape="\\"))
+            .order_by(case((customer.phone == digits, 0), else_=1), customer.phone, customer.id)
+        )
+
+    ranking = [case((customer.name.ilike(escaped + "%", escape="\\"), 0), else_=1)]
+    matches = [
+        customer.name.ilike("%" + escaped + "%", escape="\\"),
+        customer.address.ilike("%" + escaped + "%", escape="\\"),
+    ]
+
+    if dialect == "postgresql":
+        # `%` also catches misspellings above pg_trgm.similarity_threshold
+        matches += [customer.name.op("%")(term), customer.address.op("%")(term)]
+        ranking.append(func.greatest(
+            func.similarity(customer.name, term),
+            func.similarity(func.coalesce(customer.address, ""), term),
+        ).desc())
+
+    return (
+        select(customer)
+        .where(or_(*matches))
+        .order_by(*ranking, customer.name, customer.id)
+    )
@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+# ---------------------------------------------------
+# FAST JSON RESPONSES
+# ---------------------------------------------------
+# orjson writes UUIDs, dates and datetimes natively; Decimals are written
+# as strings so money stays exact. Endpoints that return a FastJSONResponse
+# themselves (with rows already shaped by their SELECT labels) also skip
+# FastAPI's jsonable_encoder pass.
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(rows):
+    """Result rows to dicts keyed by their SELECT labels, values untouched."""
+    return [dict(row._mapping) for row in rows]
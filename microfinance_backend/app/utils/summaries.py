@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+from sqlalchemy import case, func, select
+
+from .. import models
+
+
+# ---------------------------------------------------
+# BATCHED LOAN SUMMARIES
+# ---------------------------------------------------
+# One statement for any number of loans: totals come from `loan_balances`,
+# and only loans without a balance row fall back to a per-loan SUM, which
+# the CASE keeps from running for the others.
+
+def summary_statement(*filters):
+    loan = models.Loan
+    balance = models.LoanBalance
+
+    summed = (
+        select(func.coalesce(func.sum(models.Payment.paid_amount), 0))
+        .where(models.Payment.loan_id == loan.id)
+        .scalar_subquery()
+    )
+    total_paid = case((balance.loan_id.is_(None), summed), else_=balance.total_paid)
+
+    return (
+        select(
+            loan.id,
+            loan.customer_id,
+            loan.total_amount,
+            loan.installment_amount,
+            loan.number_of_installments,
+            loan.status,
+            total_paid.label("total_paid"),
+        )
+        .outerjoin(balance, balance.loan_id == loan.id)
+        .where(*filters)
+        .order_by(loan.customer_id, loan.start_date, loan.id)
+    )
+
+
+def summary_item(row):
+    total_paid = row.total_paid or 0
+    remaining_amount = row.total_amount - total_paid
+    installments_paid = int(total_paid / row.installment_amount)
+    return {
+        "loan_id": row.id,
+        "total_amount": row.total_amount,
+        "total_paid": total_paid,
+        "remaining_amount": remaining_amount,
+        "installments_paid": installments_paid,
+        "installments_remaining": row.number_of_installments - installments_paid,
+        "status": row.status,
+    }
+
+
+def group_by_customer(rows):
+    """[{customer_id, loans: [...]}, ...] in the order customers first appear."""
+    customers = OrderedDict()
+    for row in rows:
+        customers.setdefault(row.customer_id, []).append(summary_item(row))
+    return [{"customer_id": customer_id, "loans": loans} for customer_id, loans in customers.items()]
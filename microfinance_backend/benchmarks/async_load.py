@@ -0,0 +1,222 @@
+"""
+Requests per second of the async read endpoints against sync twins of the
+same endpoints, at 200 concurrent clients.
+
+    python -m microfinance_backend.benchmarks.async_load
+    python -m microfinance_backend.benchmarks.async_load --clients 200 --duration 60 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes, migrates and seeds the benchmark database, then starts the app
+under uvicorn (one worker, in a child process) with the sync twins mounted
+under /sync. Each twin is the `def` + get_read_db version of its endpoint,
+running the same statements, so the only difference is a threadpool thread
+per request against awaiting the database:
+
+    GET /customers/                 GET /sync/customers/
+    GET /loans/                     GET /sync/loans/
+    GET /customers/{id}/ledger      GET /sync/customers/{id}/ledger
+
+--clients coroutines share one httpx.AsyncClient and keep requests in
+flight for --duration seconds per endpoint and path. Prints req/s, p50,
+p95 and failed requests for each pair. The server keeps the pool from DB_*
+in the environment (SQLite ignores them). With more threadpool threads
+than connections the sync twins can stall: threads wait on the pool while
+the sessions holding connections wait for a thread to close them, until
+the pool timeout answers 500. On SQLite aiosqlite runs every connection
+on a thread of its own, so the async path has nothing to win there; the
+comparison is meant for Postgres. Exits non-zero if a twin answered
+differently from its endpoint.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from typing import List
+from uuid import UUID
+
+from .endpoints import (
+    ALEMBIC_INI, DEFAULT_DATABASE_URL, free_port, percentile, reset_database, start_server, wait_for,
+)
+
+CASES = [
+    ("GET /customers/", "/customers/?limit=50"),
+    ("GET /loans/", "/loans/?limit=50"),
+    ("GET /customers/{id}/ledger", "/customers/{customer_id}/ledger"),
+]
+
+
+def build_app():
+    """The app plus sync twins of the async read endpoints (uvicorn --factory)."""
+    from fastapi import APIRouter, Depends, HTTPException, Response
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    from ..app import models
+    from ..app.database import get_read_db
+    from ..app.main import app
+    from ..app.schemas.customers import CustomerResponse
+    from ..app.schemas.loans import LoanResponse
+    from ..app.utils.ledger import build_ledger_entries
+    from ..app.utils.pagination import CURSOR_HEADER, next_cursor, paginate
+    from ..app.utils.serialization import FastJSONResponse
+
+    router = APIRouter(prefix="/sync")
+
+    @router.get("/customers/", response_model=List[CustomerResponse])
+    def list_customers(response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None,
+                       db: Session = Depends(get_read_db)):
+        statement = paginate(select(models.Customer), models.Customer.created_at, models.Customer.id, skip, limit, cursor)
+        customers = db.execute(statement).scalars().all()
+        next_page = next_cursor(customers, limit)
+        if next_page:
+            response.headers[CURSOR_HEADER] = next_page
+        return customers
+
+    @router.get("/loans/", response_model=List[LoanResponse])
+    def list_loans(response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None,
+                   db: Session = Depends(get_read_db)):
+        statement = paginate(
+            select(models.Loan), models.Loan.created_at, models.Loan.id, skip, limit, cursor, descending=True,
+        )
+        loans = db.execute(statement).scalars().all()
+        next_page = next_cursor(loans, limit)
+        if next_page:
+            response.headers[CURSOR_HEADER] = next_page
+        return loans
+
+    @router.get("/customers/{customer_id}/ledger")
+    def customer_ledger(customer_id: UUID, db: Session = Depends(get_read_db)):
+        customer = db.get(models.Customer, customer_id)
+        if not customer:
+            raise HTTPException(status_code=404, detail="Customer not found")
+        return FastJSONResponse({
+            "customer_id": customer.id,
+            "customer_name": customer.name,
+            "customer_phone": customer.phone,
+            "ledger": build_ledger_entries(db, customer.id),
+        })
+
+    app.include_router(router)
+    return app
+
+
+async def load(client, urls, clients, duration):
+    """
+    GET `urls` round-robin with `clients` concurrent workers for `duration`
+    seconds; returns (latencies ms, errors). Requests still in flight at the
+    end are abandoned and not counted.
+    """
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+
+    async def worker(position):
+        while time.perf_counter() < deadline:
+            url = urls[position % len(urls)]
+            position += clients
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+            except Exception as exc:
+                errors.append(f"{url}: {exc!r}")
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors.append(f"{url}: {response.status_code}")
+
+    workers = [asyncio.create_task(worker(position)) for position in range(clients)]
+    _, stuck = await asyncio.wait(workers, timeout=duration)
+    for task in stuck:
+        task.cancel()
+    await asyncio.gather(*stuck, return_exceptions=True)
+    return latencies, errors
+
+
+async def run(base_url, customer_ids, args):
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    failures = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        print(f"\n{args.clients} clients, {args.duration:.0f} s per endpoint and path")
+        print(f"{'endpoint':<28} {'path':<6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'failed':>7}")
+        for name, template in CASES:
+            urls = [template.format(customer_id=customer_id) for customer_id in customer_ids]
+
+            # Same answer from both paths before timing them
+            expected = (await client.get(urls[0])).json()
+            if (await client.get("/sync" + urls[0])).json() != expected:
+                failures.append(f"{name}: sync twin answered differently")
+
+            rates = {}
+            for path, prefix in (("sync", "/sync"), ("async", "")):
+                latencies, errors = await load(client, [prefix + url for url in urls], args.clients, args.duration)
+                rates[path] = (len(latencies) - len(errors)) / args.duration
+                p50 = percentile(latencies, 50) if latencies else 0
+                p95 = percentile(latencies, 95) if latencies else 0
+                print(f"{name:<28} {path:<6} {rates[path]:>8.0f} {p50:>9.1f} {p95:>9.1f} {len(errors):>7}")
+                # Abandoned requests still hold threads and connections; `/`
+                # is a sync endpoint, so it answers once the server has drained
+                await client.get("/")
+            ratio = f"{rates['async'] / rates['sync']:.2f}x" if rates["sync"] else "sync path stalled"
+            print(f"{'':<28} async/sync: {ratio}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per endpoint and path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    import httpx
+    from alembic.config import Config
+
+    from ..app import models
+    from ..app.database import engine
+    from .endpoints import sample_ids
+    from .seed import seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    counts = seed(args.customers, loans_per_customer=2, seed=args.seed)
+    print(f"seeded {counts['customers']} customers, {counts['loans']} loans, {counts['payments']} payments")
+    ids = sample_ids(models, engine)
+    customer_ids = [ids["customer_id"](i) for i in range(200)]
+    engine.dispose()
+
+    # Under this load most statements cross the slow-query threshold
+    os.environ.setdefault("SLOW_QUERY_MS", "60000")
+    port = free_port()
+    server = start_server(
+        args.database_url, port, "microfinance_backend.benchmarks.async_load:build_app", "--factory",
+        # Pool timeouts are counted as failed requests, not logged
+        "--log-level", "critical",
+        # Client connections sit idle between rounds; uvicorn drops them after 5 s
+        "--timeout-keep-alive", "300",
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            wait_for(client, server)
+        failures = asyncio.run(run(f"http://127.0.0.1:{port}", customer_ids, args))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    for failure in failures[:10]:
+        print(f"FAIL {failure}")
+    if not failures:
+        print("ok    sync twins answer like their endpoints")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Throughput of POST /payments/bulk against one POST /payments/ per payment.
+
+    python -m microfinance_backend.benchmarks.bulk_payments --batch 1000
+    python -m microfinance_backend.benchmarks.bulk_payments --batch 5000 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes, migrates and seeds the benchmark database, then posts the same kind
+of end-of-day batch three ways through the TestClient: one request per
+payment, one JSON array and one NDJSON stream. Prints rows per second for
+each, and exits non-zero if any path did not insert every row.
+Like the endpoint benchmark it never touches DATABASE_URL from .env.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from datetime import date
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, reset_database
+
+
+def make_batch(rnd, loan_ids, size, today):
+    # Small amounts, so no loan is paid off part way through the rounds
+    return [
+        {"loan_id": str(rnd.choice(loan_ids)), "paid_amount": "1.00", "payment_date": str(today)}
+        for _ in range(size)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--batch", type=int, default=1000, help="Payments per upload")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select
+
+    from ..app import models
+    from ..app.database import engine
+    from ..app.main import app
+    from .seed import seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    seed(1000, loans_per_customer=2, payments_per_loan=2, seed=args.seed, late_ratio=0, default_ratio=0)
+    with engine.connect() as connection:
+        loan_ids = connection.execute(
+            select(models.Loan.id).where(models.Loan.status == "active")
+        ).scalars().all()
+
+    def payment_count():
+        with engine.connect() as connection:
+            return connection.execute(select(func.count(models.Payment.id))).scalar()
+
+    def post_single(client, batch):
+        for payment in batch:
+            client.post("/payments/", json=payment).raise_for_status()
+
+    def post_json(client, batch):
+        client.post("/payments/bulk", json=batch).raise_for_status()
+
+    def post_ndjson(client, batch):
+        body = "\n".join(json.dumps(payment) for payment in batch)
+        client.post(
+            "/payments/bulk", content=body, headers={"Content-Type": "application/x-ndjson"},
+        ).raise_for_status()
+
+    paths = {
+        "POST /payments/ x N": post_single,
+        "POST /payments/bulk": post_json,
+        "bulk (NDJSON)": post_ndjson,
+    }
+    timings = {name: [] for name in paths}
+    failures = []
+
+    rnd = random.Random(args.seed)
+    today = date.today()
+    with TestClient(app) as client:
+        for _ in range(args.rounds):
+            for name, post in paths.items():
+                batch = make_batch(rnd, loan_ids, args.batch, today)
+                before = payment_count()
+                started = time.perf_counter()
+                post(client, batch)
+                timings[name].append(time.perf_counter() - started)
+                inserted = payment_count() - before
+                if inserted != len(batch):
+                    failures.append(f"{name}: {inserted} of {len(batch)} payments inserted")
+
+    print(f"{args.rounds} rounds of {args.batch} payments")
+    print(f"{'path':<22} {'best s':>9} {'rows/s':>10}")
+    for name, samples in timings.items():
+        best = min(samples)
+        print(f"{name:<22} {best:>9.3f} {args.batch / best:>10.0f}")
+    print(f"speedup: {min(timings['POST /payments/ x N']) / min(timings['POST /payments/bulk']):.1f}x")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Fire concurrent POST /payments/ requests and check nothing is lost or doubled.
+
+    python -m microfinance_backend.benchmarks.concurrent_payments
+    python -m microfinance_backend.benchmarks.concurrent_payments --posts 1000 --workers 64 \\
+        --database-url postgresql://localhost/microfinance_bench
+    python -m microfinance_backend.benchmarks.concurrent_payments --base-url http://localhost:8000 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes, migrates and seeds the benchmark database, then runs two rounds of
+--posts parallel requests:
+
+    retries     every Idempotency-Key is sent --retries times; exactly one
+                payment per key must exist and every retry must get the
+                original payment back
+    contention  all posts go to --hot-loans loans and together ask for more
+                than they owe; no loan may end up overpaid, and each loan's
+                balance row must equal the SUM of its payments
+
+Requests go through the TestClient by default. With --base-url they go to a
+running server (several uvicorn workers), which must use the same database.
+Exits non-zero if a check fails.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, reset_database
+
+
+def fire(client, requests, workers):
+    """POST every (json, headers) in parallel; returns (responses in order, seconds)."""
+    def post(request):
+        body, headers = request
+        response = client.post("/payments/", json=body, headers=headers)
+        return response.status_code, response.json()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        responses = list(pool.map(post, requests))
+    return responses, time.perf_counter() - started
+
+
+def report(name, responses, elapsed, failures):
+    codes = Counter(status for status, _ in responses)
+    print(f"\n{name}: {len(responses)} posts in {elapsed:.2f} s ({len(responses) / elapsed:.0f}/s)")
+    print("  status codes: " + ", ".join(f"{code} x{count}" for code, count in sorted(codes.items())))
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    if not failures:
+        print("  ok")
+
+
+def check_retries(client, engine, models, loan_ids, args, today):
+    from sqlalchemy import func, select
+
+    keys = [str(uuid.uuid4()) for _ in range(args.posts // args.retries)]
+    requests = []
+    for i, key in enumerate(keys):
+        body = {"loan_id": str(loan_ids[i % len(loan_ids)]), "paid_amount": "1", "payment_date": str(today)}
+        requests += [(body, {"Idempotency-Key": key})] * args.retries
+
+    with engine.connect() as connection:
+        before = connection.execute(select(func.count(models.Payment.id))).scalar()
+    responses, elapsed = fire(client, requests, args.workers)
+    with engine.connect() as connection:
+        after = connection.execute(select(func.count(models.Payment.id))).scalar()
+
+    failures = []
+    if after - before != len(keys):
+        failures.append(f"{after - before} payments written for {len(keys)} keys")
+    seen = defaultdict(set)
+    for (body, headers), (status, response) in zip(requests, responses):
+        if status != 200:
+            failures.append(f"{status}: {response}")
+            continue
+        seen[headers["Idempotency-Key"]].add(response["id"])
+    doubled = [key for key, ids in seen.items() if len(ids) > 1]
+    if doubled:
+        failures.append(f"{len(doubled)} keys answered with more than one payment id")
+
+    report(f"retries ({len(keys)} keys x {args.retries})", responses, elapsed, failures[:10])
+    return not failures
+
+
+def check_contention(client, engine, models, loan_ids, args, today):
+    from sqlalchemy import func, select
+
+    hot = loan_ids[:args.hot_loans]
+    with engine.connect() as connection:
+        owed = dict(connection.execute(
+            select(models.LoanBalance.loan_id, models.LoanBalance.remaining_amount)
+            .where(models.LoanBalance.loan_id.in_(hot))
+        ).all())
+
+    # Each loan is asked for about twice what it still owes
+    per_loan = args.posts // len(hot)
+    requests = []
+    for i in range(per_loan * len(hot)):
+        loan_id = hot[i % len(hot)]
+        amount = max(Decimal("1.00"), (owed[loan_id] * 2 / per_loan).quantize(Decimal("0.01")))
+        requests.append(({"loan_id": str(loan_id), "paid_amount": str(amount), "payment_date": str(today)}, {}))
+
+    responses, elapsed = fire(client, requests, args.workers)
+
+    with engine.connect() as connection:
+        loans = connection.execute(
+            select(
+                models.Loan.id,
+                models.Loan.total_amount,
+                models.LoanBalance.total_paid,
+                models.LoanBalance.payment_count,
+                models.Loan.status,
+            )
+            .join(models.LoanBalance, models.LoanBalance.loan_id == models.Loan.id)
+            .where(models.Loan.id.in_(hot))
+        ).all()
+        summed = dict(connection.execute(
+            select(models.Payment.loan_id, func.sum(models.Payment.paid_amount))
+            .where(models.Payment.loan_id.in_(hot))
+            .group_by(models.Payment.loan_id)
+        ).all())
+
+    failures = [
+        f"{status}: {response}" for status, response in responses
+        if status != 200 and response.get("detail") != "Payment exceeds the remaining balance"
+    ]
+    for loan_id, total_amount, total_paid, payment_count, status in loans:
+        if total_paid > total_amount:
+            failures.append(f"loan {loan_id} overpaid: {total_paid} of {total_amount}")
+        if Decimal(summed.get(loan_id) or 0) != total_paid:
+            failures.append(f"loan {loan_id} balance {total_paid} != SUM(payments) {summed.get(loan_id)}")
+        if total_paid == total_amount and status != "completed":
+            failures.append(f"loan {loan_id} fully paid but status is {status}")
+
+    report(f"contention ({len(hot)} loans)", responses, elapsed, failures[:10])
+    return not failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--base-url", help="Post to a running server instead of the TestClient")
+    parser.add_argument("--posts", type=int, default=1000, help="Parallel posts per round")
+    parser.add_argument("--workers", type=int, default=32, help="Client threads")
+    parser.add_argument("--retries", type=int, default=10, help="Times each Idempotency-Key is sent")
+    parser.add_argument("--hot-loans", type=int, default=5, help="Loans shared by the contention round")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    import httpx
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select
+
+    from ..app import models
+    from ..app.database import engine
+    from ..app.main import app
+    from .seed import seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    seed(200, loans_per_customer=2, seed=args.seed, late_ratio=0.5, default_ratio=0.2)
+
+    with engine.connect() as connection:
+        loan_ids = connection.execute(
+            select(models.Loan.id).where(models.Loan.status == "active").order_by(models.Loan.id)
+        ).scalars().all()
+
+    if args.base_url:
+        client = httpx.Client(base_url=args.base_url, timeout=60)
+    else:
+        client = TestClient(app)
+
+    today = date.today()
+    with client:
+        ok = check_retries(client, engine, models, loan_ids[args.hot_loans:], args, today)
+        ok = check_contention(client, engine, models, loan_ids, args, today) and ok
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
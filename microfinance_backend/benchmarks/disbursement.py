@@ -0,0 +1,88 @@
+"""
+Throughput of POST /loans/bulk against one POST /loans/ per loan.
+
+    python -m microfinance_backend.benchmarks.disbursement --batch 500
+
+Wipes, migrates and seeds the benchmark database with customers only,
+then disburses the same batch of loans both ways through the TestClient.
+Like the endpoint benchmark it never touches DATABASE_URL from .env.
+"""
+import argparse
+import logging
+import os
+import random
+import time
+from datetime import date
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, reset_database
+
+
+def make_batch(rnd, customer_ids, size):
+    today = date.today()
+    return [
+        {
+            "customer_id": str(rnd.choice(customer_ids)),
+            "principal_amount": rnd.choice(("5000", "8000", "10000", "15000")),
+            "interest_amount": rnd.choice(("500", "1200", "2000")),
+            "installment_amount": rnd.choice(("100", "250", "500", "1000")),
+            "repayment_frequency": rnd.choice(("daily", "weekly", "monthly")),
+            "start_date": str(today),
+        }
+        for _ in range(size)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--batch", type=int, default=500, help="Loans per disbursement")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select
+
+    from ..app import models
+    from ..app.database import engine
+    from ..app.main import app
+    from .seed import seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    seed(1000, loans_per_customer=0, seed=args.seed)
+    with engine.connect() as connection:
+        customer_ids = connection.execute(select(models.Customer.id)).scalars().all()
+
+    rnd = random.Random(args.seed)
+    single, bulk = [], []
+    with TestClient(app) as client:
+        for _ in range(args.rounds):
+            batch = make_batch(rnd, customer_ids, args.batch)
+
+            started = time.perf_counter()
+            for loan in batch:
+                client.post("/loans/", json=loan).raise_for_status()
+            single.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            response = client.post("/loans/bulk", json=batch)
+            response.raise_for_status()
+            bulk.append(time.perf_counter() - started)
+            assert response.json()["created"] == len(batch), response.json()
+
+    print(f"{args.rounds} rounds of {args.batch} loans")
+    print(f"{'path':<22} {'best s':>9} {'loans/s':>10}")
+    for name, timings in (("POST /loans/ x N", single), ("POST /loans/bulk", bulk)):
+        best = min(timings)
+        print(f"{name:<22} {best:>9.3f} {args.batch / best:>10.0f}")
+    print(f"speedup: {min(single) / min(bulk):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Time build_due_list over past days and check it agrees with the rebuild path.
+
+    python -m microfinance_backend.benchmarks.due_list
+    python -m microfinance_backend.benchmarks.due_list --customers 20000 --days 30 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes, migrates and seeds the benchmark database, posts one payment dated
+today on --paid-today loans, and drops the loan_balances row of every
+--no-balance-every'th loan, so both the balance and the payments fallback
+are read. Then it builds the due list for each of the last --days days,
+all of them before today's payments, and prints the time per build.
+
+Every built row is then recomputed by rebuild_due_installments (payments
+dated on or before the row's day) in a transaction that is rolled back.
+Exits non-zero if any amount_due or remaining_amount differs.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, reset_database
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=14, help="Past days to build")
+    parser.add_argument("--paid-today", type=int, default=500, help="Loans given a payment dated today")
+    parser.add_argument("--no-balance-every", type=int, default=5, help="Drop the balance row of every n-th loan")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from sqlalchemy import delete, select
+
+    from ..app import models
+    from ..app.database import SessionLocal, engine
+    from ..app.main import app
+    from ..app.utils.due_list import build_due_list, rebuild_due_installments
+    from .seed import seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    counts = seed(args.customers, loans_per_customer=2, seed=args.seed)
+    print(f"seeded {counts['customers']} customers, {counts['loans']} loans, {counts['payments']} payments")
+
+    today = date.today()
+    with engine.connect() as connection:
+        loan_ids = connection.execute(
+            select(models.Loan.id).where(models.Loan.status == "active").order_by(models.Loan.id)
+        ).scalars().all()
+
+    # Payments after every day built below
+    with TestClient(app) as client:
+        for loan_id in loan_ids[:args.paid_today]:
+            client.post("/payments/", json={
+                "loan_id": str(loan_id), "paid_amount": "1.00", "payment_date": str(today),
+            }).raise_for_status()
+    with engine.begin() as connection:
+        connection.execute(
+            delete(models.LoanBalance).where(models.LoanBalance.loan_id.in_(loan_ids[::args.no_balance_every]))
+        )
+
+    days = [today - timedelta(days=offset) for offset in range(args.days, 0, -1)]
+    print(f"\n{'day':<12} {'loans due':>10} {'build ms':>10}")
+    with SessionLocal() as db:
+        for day in days:
+            started = time.perf_counter()
+            loans_due = build_due_list(db, day)
+            print(f"{day.isoformat():<12} {loans_due:>10} {(time.perf_counter() - started) * 1000:>10.1f}")
+
+    due = models.DueInstallment
+    columns = (due.due_date, due.loan_id, due.amount_due, due.remaining_amount)
+    failures = []
+    with SessionLocal() as db:
+        built = {(row.due_date, row.loan_id): row for row in db.execute(select(*columns)).all()}
+        for loan_id in {loan_id for _, loan_id in built}:
+            rebuild_due_installments(db, loan_id)
+        rebuilt = db.execute(select(*columns)).all()
+        db.rollback()
+
+    for row in rebuilt:
+        before = built[(row.due_date, row.loan_id)]
+        if (before.amount_due, before.remaining_amount) != (row.amount_due, row.remaining_amount):
+            failures.append(
+                f"{row.loan_id} on {row.due_date}: built {before.amount_due}/{before.remaining_amount}, "
+                f"rebuilt {row.amount_due}/{row.remaining_amount}"
+            )
+
+    print()
+    for failure in failures[:10]:
+        print(f"FAIL {failure}")
+    if not failures:
+        print(f"ok    {len(built)} built rows match rebuild_due_installments")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
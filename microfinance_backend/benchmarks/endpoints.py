@@ -0,0 +1,253 @@
+"""
+End-to-end latency benchmark for every router in app/main.py.
+
+    python -m microfinance_backend.benchmarks.endpoints
+    python -m microfinance_backend.benchmarks.endpoints --scales 1k,100k \\
+        --database-url postgresql://localhost/microfinance_bench
+
+For each scale (number of payments) the benchmark database is wiped,
+migrated and seeded, then every endpoint is called through the FastAPI
+TestClient and p50/p95/p99 latency and SQL statements per request are
+reported. The database is only ever the one given by --database-url
+(default: a local SQLite file), never DATABASE_URL from .env, because
+it is emptied before each run.
+"""
+import argparse
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+DEFAULT_DATABASE_URL = "sqlite:///benchmark.db"
+SCALES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def parse_scale(value):
+    return SCALES.get(value) or int(value)
+
+
+class QueryCounter:
+    """Counts SQL statements sent through the sync and async engines."""
+
+    def __init__(self, *engines):
+        self.count = 0
+        from sqlalchemy import event
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def endpoint_cases(sample, today):
+    """(name, method, url, json body) per endpoint, cycling over `sample` ids."""
+    customer_id = sample["customer_id"]
+    loan_id = sample["loan_id"]
+    return [
+        ("GET /", "GET", lambda i: "/", None),
+        ("GET /customers/", "GET", lambda i: "/customers/?limit=100", None),
+        ("GET /customers/{id}", "GET", lambda i: f"/customers/{customer_id(i)}", None),
+        ("GET /customers/{id}/loans", "GET", lambda i: f"/customers/{customer_id(i)}/loans", None),
+        ("GET /customers/{id}/profile", "GET", lambda i: f"/customers/{customer_id(i)}/profile", None),
+        ("GET /customers/{id}/ledger", "GET", lambda i: f"/customers/{customer_id(i)}/ledger", None),
+        ("GET /loans/", "GET", lambda i: "/loans/?limit=100", None),
+        ("GET /loans/{id}/summary", "GET", lambda i: f"/loans/{loan_id(i)}/summary", None),
+        ("GET /customers/{id}/loans/summary", "GET", lambda i: f"/customers/{customer_id(i)}/loans/summary", None),
+        ("POST /loans/summaries (20 loans)", "POST", lambda i: "/loans/summaries", lambda i: {
+            "loan_ids": [str(loan_id(i + k)) for k in range(20)],
+        }),
+        ("GET /dashboard/", "GET", lambda i: "/dashboard/", None),
+        ("GET /dashboard/today-collection", "GET", lambda i: "/dashboard/today-collection", None),
+        ("GET /reports/aging", "GET", lambda i: "/reports/aging", None),
+        ("GET /collections/ (30 days)", "GET",
+         lambda i: f"/collections/?date_from={today - timedelta(days=30)}&date_to={today}", None),
+        ("GET /collections/due", "GET", lambda i: "/collections/due", None),
+        ("GET /exports/customers/{id}/ledger", "GET",
+         lambda i: f"/exports/customers/{customer_id(i)}/ledger?format=ndjson", None),
+        ("GET /exports/payments (today)", "GET",
+         lambda i: f"/exports/payments?format=ndjson&date_from={today}", None),
+        ("GET /health/db", "GET", lambda i: "/health/db", None),
+        ("POST /customers/", "POST", lambda i: "/customers/", lambda i: {
+            "name": f"Bench {i}", "phone": "9000000000",
+            "address": "Bench Road", "id_proof_url": "",
+        }),
+        ("POST /loans/", "POST", lambda i: "/loans/", lambda i: {
+            "customer_id": str(customer_id(i)), "principal_amount": 8000,
+            "interest_amount": 2000, "installment_amount": 500,
+            "repayment_frequency": "weekly", "start_date": str(today),
+        }),
+        ("POST /payments/", "POST", lambda i: "/payments/", lambda i: {
+            "loan_id": str(loan_id(i)), "paid_amount": "100", "payment_date": str(today),
+        }),
+        ("POST /payments/bulk (50 rows)", "POST", lambda i: "/payments/bulk?mode=partial", lambda i: [
+            {"loan_id": str(loan_id(i + k)), "paid_amount": "100", "payment_date": str(today)}
+            for k in range(50)
+        ]),
+    ]
+
+
+def reset_database(models, engine, config):
+    from alembic import command
+    from sqlalchemy import delete
+
+    command.upgrade(config, "head")
+    with engine.begin() as connection:
+        for model in (
+            models.DueListBuild, models.DueInstallment, models.LoanSnapshot, models.LoanEvent, models.LoanBalance,
+            models.Payment, models.Loan, models.CustomerProfile, models.Customer,
+        ):
+            connection.execute(delete(model))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url, port, app="microfinance_backend.app.main:app", *options):
+    """The app under uvicorn in a child process, for clients that need real HTTP."""
+    env = {**os.environ, "DATABASE_URL": database_url}
+    env.pop("DATABASE_READ_URL", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning", *options],
+        env=env,
+    )
+
+
+def wait_for(client, server, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            client.get("/")
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def sample_ids(models, engine, size=200):
+    from sqlalchemy import select
+
+    with engine.connect() as connection:
+        customers = connection.execute(select(models.Customer.id).limit(size)).scalars().all()
+        # Paid-off loans refuse further payments
+        loans = connection.execute(
+            select(models.Loan.id).where(models.Loan.status == "active").limit(size)
+        ).scalars().all()
+    return {
+        "customer_id": lambda i: customers[i % len(customers)],
+        "loan_id": lambda i: loans[i % len(loans)],
+    }
+
+
+def run_scale(client, counter, cases, requests, clear_cache):
+    results = []
+    for name, method, url, body in cases:
+        # Warm-up request, not measured
+        client.request(method, url(0), json=body(0) if body else None)
+
+        latencies, queries = [], []
+        for i in range(1, requests + 1):
+            if clear_cache:
+                clear_cache()
+            counter.count = 0
+            started = time.perf_counter()
+            response = client.request(method, url(i), json=body(i) if body else None)
+            latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(counter.count)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name} returned {response.status_code}: {response.text[:200]}")
+
+        results.append({
+            "endpoint": name,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "queries": statistics.mean(queries),
+        })
+    return results
+
+
+def print_results(label, counts, results):
+    print(f"\n=== {label}: " + ", ".join(f"{count} {name}" for name, count in counts.items()) + " ===")
+    print(f"{'endpoint':<38} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}")
+    for row in results:
+        print(
+            f"{row['endpoint']:<38} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+            f"{row['p99_ms']:>9.2f} {row['queries']:>8.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--scales", default="1k,100k,1M", help="Comma-separated payment counts (1k, 100k, 1M or a number)")
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per endpoint")
+    parser.add_argument("--loans-per-customer", type=int, default=2)
+    parser.add_argument("--late-ratio", type=float, default=0.25)
+    parser.add_argument("--warm-cache", action="store_true", help="Let the dashboard cache serve repeat requests")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # The engines are created at import time from DATABASE_URL, so it has to
+    # point at the benchmark database before the app is imported
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+
+    from ..app import models
+    from ..app.database import SessionLocal, engine, async_engine
+    from ..app.main import app
+    from ..app.utils.cache import dashboard_cache
+    from ..app.utils.due_list import build_due_list
+    from .seed import seed
+
+    # main.py turns on DEBUG logging, which would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    config = Config(str(ALEMBIC_INI))
+    counter = QueryCounter(engine, async_engine.sync_engine)
+    clear_cache = None if args.warm_cache else dashboard_cache.clear
+    today = date.today()
+
+    for label in args.scales.split(","):
+        payments = parse_scale(label.strip())
+        reset_database(models, engine, config)
+        dashboard_cache.clear()
+
+        # Generous customer count; seeding stops once `payments` rows exist
+        counts = seed(
+            customers=max(10, payments // args.loans_per_customer),
+            loans_per_customer=args.loans_per_customer,
+            seed=args.seed,
+            late_ratio=args.late_ratio,
+            max_payments=payments,
+        )
+        # What the nightly job leaves for GET /collections/due
+        with SessionLocal() as db:
+            build_due_list(db, today)
+
+        cases = endpoint_cases(sample_ids(models, engine), today)
+        with TestClient(app) as client:
+            results = run_scale(client, counter, cases, args.requests, clear_cache)
+        print_results(label.strip(), counts, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Show query plans and timings for the hot queries before and after the
+0002_hot_filter_indexes migration.
+
+    python -m microfinance_backend.benchmarks.explain_indexes --customers 20000
+
+Uses DATABASE_URL. The schema is migrated to head and seeded if empty, then
+the script steps down to 0001a (tables, no indexes), measures, upgrades back to head
+and measures again.
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import func, select, tuple_
+
+from ..app import models
+from ..app.database import engine
+from .seed import seed
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+BEFORE_REVISION = "0001a_loan_balances"
+
+
+def hot_queries(connection):
+    """The statements behind the ledger, summary, collection and dashboard reads."""
+    customer_id = connection.execute(select(models.Loan.customer_id).limit(1)).scalar()
+    loan_ids = connection.execute(
+        select(models.Loan.id).where(models.Loan.customer_id == customer_id)
+    ).scalars().all()
+    newest = connection.execute(
+        select(models.Loan.created_at, models.Loan.id)
+        .order_by(models.Loan.created_at.desc(), models.Loan.id.desc())
+        .offset(1000)
+        .limit(1)
+    ).first()
+    today = date.today()
+
+    queries = {
+        "loans_by_customer": select(models.Loan).where(models.Loan.customer_id == customer_id),
+        "ledger_payments": (
+            select(models.Payment)
+            .where(models.Payment.loan_id.in_(loan_ids))
+            .order_by(models.Payment.loan_id, models.Payment.payment_date)
+        ),
+        "last_payment": (
+            select(func.max(models.Payment.payment_date))
+            .where(models.Payment.loan_id == loan_ids[0])
+        ),
+        "today_collection": (
+            select(func.coalesce(func.sum(models.Payment.paid_amount), 0))
+            .where(models.Payment.payment_date == today)
+        ),
+        "overdue_loans": (
+            select(func.count(models.Loan.id))
+            .where(models.Loan.status == "active", models.Loan.end_date < today)
+        ),
+    }
+    if newest:
+        queries["loans_keyset_page"] = (
+            select(models.Loan)
+            .where(tuple_(models.Loan.created_at, models.Loan.id) < tuple(newest))
+            .order_by(models.Loan.created_at.desc(), models.Loan.id.desc())
+            .limit(100)
+        )
+    return queries
+
+
+def explain(connection, statement):
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+    rows = connection.exec_driver_sql(prefix + sql).all()
+    return "\n".join("    " + " ".join(str(col) for col in row) for row in rows)
+
+
+def measure(label, repeat):
+    print(f"\n=== {label} ===")
+    timings = {}
+    with engine.connect() as connection:
+        for name, statement in hot_queries(connection).items():
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                connection.execute(statement).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(samples)
+            print(f"\n-- {name}: median {timings[name]:.2f} ms")
+            print(explain(connection, statement))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    config = Config(str(ALEMBIC_INI))
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        if not connection.execute(select(func.count(models.Customer.id))).scalar():
+            print("seeding:", seed(args.customers))
+
+    command.downgrade(config, BEFORE_REVISION)
+    before = measure("before (no indexes)", args.repeat)
+
+    command.upgrade(config, "head")
+    after = measure("after (head)", args.repeat)
+
+    print("\nquery                      before ms    after ms   speedup")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<25} {before[name]:>10.2f} {after[name]:>11.2f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
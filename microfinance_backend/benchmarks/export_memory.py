@@ -0,0 +1,118 @@
+"""
+Check that streaming exports keep the server's memory flat.
+
+    python -m microfinance_backend.benchmarks.export_memory
+    python -m microfinance_backend.benchmarks.export_memory --payments 10000000 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes, migrates and seeds the benchmark database with --payments payments,
+starts the app under uvicorn in a child process, and streams exports from
+it over HTTP (the TestClient would buffer the whole body in this process):
+
+    warm-up   a small export (--small-days of payments), so imports,
+              pools and caches are in the baseline
+    large     every payment as CSV and as NDJSON, and every loan
+
+After each export the server's peak RSS (VmHWM from /proc, so Linux only)
+is read. Exits non-zero if any large export raised the peak by more than
+--max-growth-mb over the warm-up.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, free_port, reset_database, start_server, wait_for
+
+
+def peak_rss_mb(pid):
+    """Peak resident set size of `pid` in MB."""
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM missing from /proc status")
+
+
+def stream(client, url):
+    """Stream one export to nowhere; returns (bytes, lines, seconds)."""
+    size = lines = 0
+    started = time.perf_counter()
+    with client.stream("GET", url) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            size += len(chunk)
+            lines += chunk.count(b"\n")
+    return size, lines, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--payments", type=int, default=1_000_000, help="Payments to seed")
+    parser.add_argument("--small-days", type=int, default=3, help="Days of payments in the warm-up export")
+    parser.add_argument("--max-growth-mb", type=float, default=64.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not Path("/proc/self/status").exists():
+        sys.exit("needs /proc (Linux) to read the server's peak RSS")
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    import httpx
+    from alembic.config import Config
+
+    from ..app import models
+    from ..app.database import engine
+    from .seed import seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    started = time.perf_counter()
+    counts = seed(max(10, args.payments // 40), loans_per_customer=2, seed=args.seed, max_payments=args.payments)
+    print(f"seeded {counts['payments']} payments, {counts['loans']} loans in {time.perf_counter() - started:.1f} s")
+    engine.dispose()
+
+    today = date.today()
+    exports = [
+        ("payments.csv", "/exports/payments?format=csv"),
+        ("payments.ndjson", "/exports/payments?format=ndjson"),
+        ("loans.csv", "/exports/loans?format=csv"),
+    ]
+
+    port = free_port()
+    server = start_server(args.database_url, port)
+    failures = []
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            wait_for(client, server)
+            size, lines, _ = stream(client, f"/exports/payments?format=csv&date_from={today - timedelta(days=args.small_days)}")
+            baseline = peak_rss_mb(server.pid)
+            print(f"\nwarm-up export: {lines} lines, {size / 2**20:.1f} MB; server peak RSS {baseline:.1f} MB")
+
+            print(f"\n{'export':<18} {'lines':>10} {'MB out':>8} {'s':>7} {'peak RSS MB':>12} {'growth':>8}")
+            for name, url in exports:
+                size, lines, seconds = stream(client, url)
+                peak = peak_rss_mb(server.pid)
+                growth = peak - baseline
+                print(f"{name:<18} {lines:>10} {size / 2**20:>8.1f} {seconds:>7.1f} {peak:>12.1f} {growth:>8.1f}")
+                if growth > args.max_growth_mb:
+                    failures.append(f"{name} raised peak RSS by {growth:.1f} MB (limit {args.max_growth_mb} MB)")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not failures:
+        print("ok    peak RSS stayed flat")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
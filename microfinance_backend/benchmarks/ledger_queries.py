@@ -0,0 +1,100 @@
+"""
+Check that GET /customers/{id}/ledger costs the same number of queries
+whatever the number of loans.
+
+    python -m microfinance_backend.benchmarks.ledger_queries
+    python -m microfinance_backend.benchmarks.ledger_queries --loans 1,10,100 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes and migrates the benchmark database, then through the TestClient
+creates one customer per --loans count, each with that many loans and
+--payments-per-loan payments on every loan, and fetches each ledger:
+
+    - every ledger must take the same number of SQL statements
+    - a malformed customer id must answer 422, as on the other customer routes
+
+Exits non-zero if a check fails.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import date, timedelta
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, QueryCounter, reset_database
+
+
+def create_customer(client, loans, payments_per_loan, today):
+    """Customer with `loans` loans, each with `payments_per_loan` payments; returns its id."""
+    customer_id = client.post("/customers/", json={
+        "name": f"Ledger {loans}", "phone": "9000000000", "address": "Test Road", "id_proof_url": "",
+    }).json()["id"]
+
+    start = today - timedelta(weeks=payments_per_loan)
+    created = client.post("/loans/bulk", json=[
+        {
+            "customer_id": customer_id, "principal_amount": "8000", "interest_amount": "2000",
+            "installment_amount": "500", "repayment_frequency": "weekly", "start_date": str(start),
+        }
+        for _ in range(loans)
+    ]).json()
+    loan_ids = [result["loan"]["id"] for result in created["results"]]
+
+    client.post("/payments/bulk", json=[
+        {"loan_id": loan_id, "paid_amount": "500", "payment_date": str(start + timedelta(weeks=k + 1))}
+        for loan_id in loan_ids
+        for k in range(payments_per_loan)
+    ])
+    return customer_id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--loans", default="1,10,50", help="Comma-separated loan counts, one customer each")
+    parser.add_argument("--payments-per-loan", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+
+    from ..app import models
+    from ..app.database import async_engine, async_read_engine, engine, read_engine
+    from ..app.main import app
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    engines = {engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine}
+    counter = QueryCounter(*engines)
+    failures = []
+
+    def check(condition, message):
+        print(("ok    " if condition else "FAIL  ") + message)
+        if not condition:
+            failures.append(message)
+
+    today = date.today()
+    with TestClient(app) as client:
+        queries = {}
+        for loans in (int(count) for count in args.loans.split(",")):
+            customer_id = create_customer(client, loans, args.payments_per_loan, today)
+            counter.count = 0
+            response = client.get(f"/customers/{customer_id}/ledger")
+            queries[loans] = counter.count
+            check(
+                response.status_code == 200 and len(response.json()["ledger"]) == loans,
+                f"ledger with {loans} loan(s): {counter.count} queries",
+            )
+
+        check(len(set(queries.values())) == 1, "query count does not grow with the number of loans")
+        check(client.get("/customers/not-a-uuid/ledger").status_code == 422, "malformed customer id answers 422")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Latency of the first and a deep page of GET /customers/ and GET /loans/,
+by cursor and by offset.
+
+    python -m microfinance_backend.benchmarks.pagination
+    python -m microfinance_backend.benchmarks.pagination --customers 200000 --page 2000 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes, migrates and seeds the benchmark database, then through the
+TestClient:
+
+    - times page 1 and page --page of each listing, reaching the deep page
+      with a cursor and with the old `skip` offset; the cursor page should
+      cost about the same as page 1, the offset page grows with --page
+    - walks both listings page by page with X-Next-Cursor over rows that
+      share a created_at second (posted through the API) and rows with
+      sub-second timestamps (seeded), and checks every row comes back
+      exactly once, in the same order as an offset walk
+
+Exits non-zero if a walk repeats, skips or reorders rows.
+Like the endpoint benchmark it never touches DATABASE_URL from .env.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, percentile, reset_database
+
+LISTINGS = {
+    "GET /customers/": ("/customers/", "Customer", False),
+    "GET /loans/": ("/loans/", "Loan", True),
+}
+
+
+def timed(client, url, params, requests):
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        client.get(url, params=params).raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentile(samples, 50), percentile(samples, 95)
+
+
+def walk(client, url, limit, max_rows):
+    """Every id of a listing, following X-Next-Cursor from page 1; stops past `max_rows`."""
+    ids, params = [], {"limit": limit}
+    # A cursor that re-reads its own row can loop on one page forever
+    while len(ids) <= max_rows:
+        response = client.get(url, params=params)
+        response.raise_for_status()
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": limit, "cursor": cursor}
+    return ids
+
+
+def walk_offset(client, url, limit):
+    ids, skip = [], 0
+    while True:
+        page = client.get(url, params={"limit": limit, "skip": skip}).json()
+        ids += [row["id"] for row in page]
+        if len(page) < limit:
+            return ids
+        skip += limit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--customers", type=int, default=200_000)
+    parser.add_argument("--page", type=int, default=2000, help="Deep page number (1-based)")
+    parser.add_argument("--limit", type=int, default=100, help="Rows per page")
+    parser.add_argument("--requests", type=int, default=20, help="Measured requests per page")
+    parser.add_argument("--walk-rows", type=int, default=300, help="Rows posted through the API for the walk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if (args.page - 1) * args.limit >= args.customers:
+        parser.error(f"--page {args.page} of {args.limit} rows is past the end of {args.customers} customers")
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select
+
+    from ..app import models
+    from ..app.database import engine
+    from ..app.main import app
+    from ..app.utils.pagination import encode_cursor
+    from .seed import seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    started = time.perf_counter()
+    counts = seed(args.customers, loans_per_customer=1, payments_per_loan=0, seed=args.seed)
+    print(f"seeded {counts['customers']} customers, {counts['loans']} loans in {time.perf_counter() - started:.1f} s")
+
+    failures = []
+    with TestClient(app) as client:
+        print(f"\n{'listing':<18} {'page':<22} {'p50 ms':>9} {'p95 ms':>9}")
+        for name, (url, model_name, descending) in LISTINGS.items():
+            model = getattr(models, model_name)
+            order = (model.created_at.desc(), model.id.desc()) if descending else (model.created_at, model.id)
+            skip = (args.page - 1) * args.limit
+            # The row just before the deep page, as X-Next-Cursor would name it
+            with engine.connect() as connection:
+                before = connection.execute(
+                    select(model.created_at, model.id).order_by(*order).offset(skip - 1).limit(1)
+                ).one()
+
+            pages = [
+                ("1", {"limit": args.limit}),
+                (f"{args.page} (cursor)", {"limit": args.limit, "cursor": encode_cursor(before.created_at, before.id)}),
+                (f"{args.page} (offset)", {"limit": args.limit, "skip": skip}),
+            ]
+            for label, params in pages:
+                p50, p95 = timed(client, url, params, args.requests)
+                print(f"{name:<18} {label:<22} {p50:>9.2f} {p95:>9.2f}")
+
+        # Walk check on a small book: API rows share created_at seconds
+        reset_database(models, engine, Config(str(ALEMBIC_INI)))
+        seed(args.walk_rows, loans_per_customer=1, payments_per_loan=0, seed=args.seed)
+        today = str(date.today())
+        for i in range(args.walk_rows):
+            customer_id = client.post("/customers/", json={
+                "name": f"Walk {i}", "phone": "9000000000", "address": "Walk Road", "id_proof_url": "",
+            }).json()["id"]
+            client.post("/loans/", json={
+                "customer_id": customer_id, "principal_amount": 800, "interest_amount": 200,
+                "installment_amount": 100, "repayment_frequency": "weekly", "start_date": today,
+            })
+
+        print()
+        for name, (url, _, _) in LISTINGS.items():
+            by_cursor = walk(client, url, limit=7, max_rows=2 * args.walk_rows)
+            by_offset = walk_offset(client, url, limit=7)
+            ok = by_cursor == by_offset and len(set(by_cursor)) == len(by_cursor) == 2 * args.walk_rows
+            print(("ok    " if ok else "FAIL  ") + f"{name} cursor walk returns {len(by_cursor)} rows, each once, in order")
+            if not ok:
+                failures.append(name)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
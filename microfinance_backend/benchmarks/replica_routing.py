@@ -0,0 +1,147 @@
+"""
+Check that reporting reads go to the replica and writes to the primary.
+
+    python -m microfinance_backend.benchmarks.replica_routing
+    python -m microfinance_backend.benchmarks.replica_routing \\
+        --database-url postgresql://localhost/microfinance_primary \\
+        --read-url postgresql://localhost/microfinance_replica
+
+Uses two separate, unreplicated databases (two SQLite files by default), so
+a row can only be seen through the engine it was written to. Both are wiped
+and migrated, then through the TestClient:
+
+    - a customer, loan and payment are posted; they must land on the primary
+    - GET routes without the escape hatch must not see them (replica)
+    - the same GETs with X-Read-Primary, or with the cookie the write set,
+      must see them (read-your-writes)
+    - every statement of a plain GET must run on a replica engine
+
+Exits non-zero if a check fails.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import date
+
+from .endpoints import ALEMBIC_INI, reset_database
+
+DEFAULT_PRIMARY_URL = "sqlite:///primary.db"
+DEFAULT_READ_URL = "sqlite:///replica.db"
+
+
+class EngineCounter:
+    """Statements per engine name, fed by cursor events."""
+
+    def __init__(self, **engines):
+        from sqlalchemy import event
+
+        self.counts = dict.fromkeys(engines, 0)
+        for name, engine in engines.items():
+            event.listen(engine, "before_cursor_execute", self._listener(name))
+
+    def _listener(self, name):
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            self.counts[name] += 1
+        return on_execute
+
+    def reset(self):
+        self.counts = dict.fromkeys(self.counts, 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_PRIMARY_URL)
+    parser.add_argument("--read-url", default=DEFAULT_READ_URL)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from the environment
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DATABASE_READ_URL"] = args.read_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select
+
+    from ..app import models
+    from ..app.database import async_engine, async_read_engine, engine, read_engine
+    from ..app.main import app
+    from ..app.utils.cache import dashboard_cache
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    # Both databases get the same schema and start empty
+    for url, target in ((args.database_url, engine), (args.read_url, read_engine)):
+        config = Config(str(ALEMBIC_INI))
+        config.attributes["database_url"] = url
+        reset_database(models, target, config)
+
+    counter = EngineCounter(
+        primary=engine,
+        async_primary=async_engine.sync_engine,
+        replica=read_engine,
+        async_replica=async_read_engine.sync_engine,
+    )
+    failures = []
+
+    def check(condition, message):
+        print(("ok    " if condition else "FAIL  ") + message)
+        if not condition:
+            failures.append(message)
+
+    today = str(date.today())
+    with TestClient(app) as client:
+        customer = client.post("/customers/", json={
+            "name": "Replica Check", "phone": "9000000000", "address": "Test Road", "id_proof_url": "",
+        }).json()
+        loan = client.post("/loans/", json={
+            "customer_id": customer["id"], "principal_amount": 800, "interest_amount": 200,
+            "installment_amount": 100, "repayment_frequency": "weekly", "start_date": today,
+        }).json()
+        counter.reset()
+        response = client.post("/payments/", json={
+            "loan_id": loan["id"], "paid_amount": "100", "payment_date": today,
+        })
+        check(response.status_code == 200, "payment posted")
+        check("read_primary" in response.headers.get("set-cookie", ""), "write sets the read-your-writes cookie")
+        check(counter.counts["replica"] + counter.counts["async_replica"] == 0, "writes never touch the replica")
+
+        with engine.connect() as connection:
+            written = connection.execute(select(func.count(models.Payment.id))).scalar()
+        check(written == 1, "payment is on the primary")
+
+        reads = [
+            ("GET /customers/{id}", f"/customers/{customer['id']}"),
+            ("GET /customers/{id}/loans", f"/customers/{customer['id']}/loans"),
+            ("GET /loans/{id}/state", f"/loans/{loan['id']}/state"),
+            ("GET /customers/{id}/ledger", f"/customers/{customer['id']}/ledger"),
+            ("GET /reports/aging", "/reports/aging"),
+        ]
+
+        # Plain reads (no cookie): the replica has none of the new rows
+        client.cookies.clear()
+        for name, url in reads:
+            counter.reset()
+            status = client.get(url).status_code
+            primary = counter.counts["primary"] + counter.counts["async_primary"]
+            check(status in (200, 404) and primary == 0, f"{name} reads the replica ({status}, {primary} primary queries)")
+
+        dashboard_cache.clear()
+        check(client.get("/dashboard/").json()["total_loans"] == 0, "GET /dashboard/ counts replica loans")
+        check(client.get("/customers/search", params={"q": "Replica"}).json() == [], "search reads the replica")
+
+        # Escape hatch: header
+        for name, url in reads[:3]:
+            response = client.get(url, headers={"X-Read-Primary": "1"})
+            check(response.status_code == 200, f"{name} with X-Read-Primary sees the write")
+
+        # Escape hatch: cookie from the last write
+        client.post("/payments/", json={"loan_id": loan["id"], "paid_amount": "100", "payment_date": today})
+        dashboard_cache.clear()
+        check(client.get("/dashboard/").json()["total_loans"] == 1, "GET /dashboard/ after a write reads the primary")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Time the vectorized schedule engine on a large synthetic loan book.
+
+    python -m microfinance_backend.benchmarks.schedules
+    python -m microfinance_backend.benchmarks.schedules --loans 1000000
+
+Builds --loans random loans in memory (no database) and times:
+
+    build_schedules        the full installment calendar of every loan
+    due_on                 "which loans are due on day X" over that calendar
+    installments_due_on    the same question without expanding calendars
+    per-loan loop          installment_due_date() called once per installment,
+                           on --loop-loans loans, scaled up to --loans
+
+Then checks the vectorized due dates and amounts against the scalar
+functions for --check-loans loans, and that due_on and installments_due_on
+agree. Exits non-zero on any mismatch.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from ..app.utils.schedule import (
+    FREQUENCIES, build_schedules, installment_due_date, installments_due_on, to_paise,
+)
+
+INSTALLMENTS = {"daily": 100, "weekly": 20, "monthly": 12}
+INSTALLMENT_AMOUNTS = (100, 250, 500, 1000)
+
+
+def make_book(rnd, size, today):
+    """Parallel lists (start_dates, frequencies, counts, installment_amounts, total_amounts)."""
+    starts, frequencies, counts, installments, totals = [], [], [], [], []
+    for _ in range(size):
+        frequency = rnd.choice(FREQUENCIES)
+        count = INSTALLMENTS[frequency]
+        installment = Decimal(rnd.choice(INSTALLMENT_AMOUNTS))
+        starts.append(today - timedelta(days=rnd.randrange(0, 400)))
+        frequencies.append(frequency)
+        counts.append(count)
+        installments.append(installment)
+        # Some loans end on a short last installment
+        totals.append(installment * count - Decimal(rnd.choice((0, 0, 50))))
+    return starts, frequencies, counts, installments, totals
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=100_000)
+    parser.add_argument("--loop-loans", type=int, default=5_000, help="Loans timed with the per-loan loop")
+    parser.add_argument("--check-loans", type=int, default=2_000, help="Loans checked against the scalar functions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(args.seed)
+    today = date.today()
+    starts, frequencies, counts, installments, totals = make_book(rnd, args.loans, today)
+
+    schedules, build_s = timed(lambda: build_schedules(starts, frequencies, counts, installments, totals))
+    due_positions, due_on_s = timed(lambda: schedules.due_on(today))
+    due_numbers, due_arith_s = timed(lambda: installments_due_on(starts, frequencies, counts, today))
+
+    def loop():
+        for start, frequency, count in zip(starts[:args.loop_loans], frequencies, counts):
+            for n in range(1, count + 1):
+                installment_due_date(start, frequency, n)
+    _, loop_s = timed(loop)
+    loop_s *= args.loans / min(args.loop_loans, args.loans)
+
+    print(f"{args.loans} loans, {len(schedules.due_dates)} installments")
+    print(f"{'step':<24} {'seconds':>9}")
+    for name, seconds in (
+        ("build_schedules", build_s),
+        ("due_on", due_on_s),
+        ("installments_due_on", due_arith_s),
+        ("per-loan loop (scaled)", loop_s),
+    ):
+        print(f"{name:<24} {seconds:>9.3f}")
+    print(f"speedup over the loop: {loop_s / build_s:.0f}x")
+
+    failures = []
+    for position in rnd.sample(range(args.loans), min(args.check_loans, args.loans)):
+        expected_dates = [
+            installment_due_date(starts[position], frequencies[position], n)
+            for n in range(1, counts[position] + 1)
+        ]
+        rows = schedules.for_loan(position)
+        if [due for _, due, _ in rows] != expected_dates:
+            failures.append(f"loan {position}: due dates differ")
+        amounts = [amount for _, _, amount in rows]
+        expected_last = int(to_paise([totals[position] - installments[position] * (counts[position] - 1)])[0])
+        if amounts[-1] != expected_last or sum(amounts) != int(to_paise([totals[position]])[0]):
+            failures.append(f"loan {position}: amounts differ")
+
+    if not np.array_equal(due_positions, np.flatnonzero(due_numbers)):
+        failures.append("due_on and installments_due_on disagree on the loans due today")
+
+    for failure in failures[:10]:
+        print(f"FAIL {failure}")
+    if not failures:
+        print("ok    vectorized calendars match the scalar functions")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Latency of GET /customers/search over a large customer table.
+
+    python -m microfinance_backend.benchmarks.search --customers 500000 \\
+        --database-url postgresql://localhost/microfinance_bench
+
+Wipes, migrates and seeds the benchmark database (customers only), then
+times name, partial-name, misspelt-name, address and phone-prefix searches
+through the TestClient and prints the query plan of each kind of search.
+Like the endpoint benchmark it never touches DATABASE_URL from .env.
+"""
+import argparse
+import logging
+import os
+import random
+import time
+
+from .endpoints import ALEMBIC_INI, DEFAULT_DATABASE_URL, percentile, reset_database
+
+SEARCHES = {
+    "full name": lambda rnd, names: rnd.choice(names),
+    "name prefix": lambda rnd, names: rnd.choice(names)[:4],
+    "surname": lambda rnd, names: rnd.choice(names).split()[-1],
+    "misspelt name": lambda rnd, names: rnd.choice(names)[:-1] + "x",
+    "street": lambda rnd, names: "Temple Street",
+    "phone prefix": lambda rnd, names: f"9{rnd.randrange(10**4):04d}",
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--customers", type=int, default=500_000)
+    parser.add_argument("--requests", type=int, default=100, help="Measured searches per kind")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Engines are created at import time from DATABASE_URL
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+
+    from ..app import models
+    from ..app.database import engine
+    from ..app.main import app
+    from ..app.utils.search import search_statement
+    from .seed import FIRST_NAMES, LAST_NAMES, seed
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    reset_database(models, engine, Config(str(ALEMBIC_INI)))
+    started = time.perf_counter()
+    counts = seed(args.customers, loans_per_customer=0, seed=args.seed)
+    print(f"seeded {counts['customers']} customers in {time.perf_counter() - started:.1f} s")
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE customers")
+
+    names = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    rnd = random.Random(args.seed)
+
+    print(f"\n{'search':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'avg hits':>9}")
+    with TestClient(app) as client:
+        for kind, make_query in SEARCHES.items():
+            client.get("/customers/search", params={"q": make_query(rnd, names)})
+            latencies, hits = [], []
+            for _ in range(args.requests):
+                query = make_query(rnd, names)
+                started = time.perf_counter()
+                response = client.get("/customers/search", params={"q": query})
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+                hits.append(len(response.json()))
+            print(
+                f"{kind:<16} {percentile(latencies, 50):>9.2f} {percentile(latencies, 95):>9.2f} "
+                f"{percentile(latencies, 99):>9.2f} {sum(hits) / len(hits):>9.1f}"
+            )
+
+    if engine.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+    with engine.connect() as connection:
+        for kind, make_query in SEARCHES.items():
+            statement = search_statement(engine.dialect.name, make_query(rnd, names)).limit(20)
+            sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            rows = connection.exec_driver_sql(prefix + sql).all()
+            print(f"\n-- {kind}")
+            print("\n".join("    " + " ".join(str(col) for col in row) for row in rows))
+
+
+if __name__ == "__main__":
+    main()
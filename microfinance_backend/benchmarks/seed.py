@@ -0,0 +1,242 @@
+"""
+Seed a database with a synthetic loan book.
+
+    DATABASE_URL=sqlite:///portfolio.db alembic upgrade head
+    DATABASE_URL=sqlite:///portfolio.db python -m microfinance_backend.benchmarks.seed --customers 1000
+
+Writes to DATABASE_URL (Postgres or a SQLite file); the schema must already
+be migrated. Every loan is given a payer profile:
+
+    on_time    pays each installment on its due date
+    late       pays each installment a few days late, now and then skips one
+    defaulter  pays like a late payer, then stops part way through the loan
+"""
+import argparse
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..app import models
+from ..app.database import engine
+from ..app.utils.profiles import rebuild_profiles
+from ..app.utils.schedule import installment_due_date
+
+BATCH_SIZE = 5000
+
+# frequency -> number of installments
+INSTALLMENTS = {"daily": 100, "weekly": 20, "monthly": 12}
+INSTALLMENT_AMOUNTS = (100, 250, 500, 1000)
+
+FIRST_NAMES = (
+    "Arun", "Bala", "Chitra", "Deepa", "Ganesh", "Hari", "Indira", "Jaya", "Kavitha", "Lakshmi",
+    "Mani", "Meena", "Murugan", "Nandini", "Prakash", "Priya", "Rajesh", "Revathi", "Saravanan",
+    "Selvi", "Senthil", "Suresh", "Tamil", "Uma", "Vasanth", "Vijay",
+)
+LAST_NAMES = (
+    "Anand", "Babu", "Devi", "Ganesan", "Karthik", "Krishnan", "Kumar", "Muthu", "Natarajan",
+    "Pandian", "Raja", "Raman", "Selvam", "Shankar", "Sundaram", "Velu",
+)
+STREETS = (
+    "Market Road", "Temple Street", "Gandhi Nagar", "Nehru Street", "Anna Salai", "Bazaar Street",
+    "Church Road", "Mill Road", "Station Road", "Lake View", "Kamaraj Nagar", "Periyar Street",
+)
+TOWNS = ("Madurai", "Salem", "Erode", "Tiruppur", "Karur", "Dindigul", "Theni", "Namakkal")
+
+LATE_MEAN_DAYS = 4
+LATE_SKIP_RATE = 0.1
+
+
+def _flush(connection, table, rows):
+    if rows:
+        connection.execute(insert(table), rows)
+        rows.clear()
+
+
+def _payment_dates(rnd, profile, start_date, frequency, installments, limit, today):
+    """Dates on which one loan's installments were paid, up to `today`."""
+    if profile == "defaulter":
+        installments = rnd.randrange(1, installments + 1)
+
+    dates = []
+    for k in range(1, installments + 1):
+        due = installment_due_date(start_date, frequency, k)
+        if profile == "on_time":
+            paid_on = due
+        else:
+            if rnd.random() < LATE_SKIP_RATE:
+                continue
+            paid_on = due + timedelta(days=int(rnd.expovariate(1 / LATE_MEAN_DAYS)))
+        if paid_on > today or len(dates) >= limit:
+            break
+        dates.append(paid_on)
+    return dates
+
+
+def seed(
+    customers: int,
+    loans_per_customer: int = 2,
+    payments_per_loan: int = 20,
+    seed: int = 0,
+    bind=engine,
+    frequencies=("daily", "weekly", "monthly"),
+    late_ratio: float = 0.25,
+    default_ratio: float = 0.05,
+    max_payments: int | None = None,
+):
+    """
+    Insert customers, loans, payments, loan events and loan balances, then
+    build the customer profiles; returns row counts.
+
+    Stops early, at a customer boundary, once `max_payments` payments exist.
+    """
+    rnd = random.Random(seed)
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    counts = {"customers": 0, "loans": 0, "payments": 0}
+
+    customer_rows, loan_rows, payment_rows, balance_rows, event_rows = [], [], [], [], []
+
+    with bind.begin() as connection:
+        for c in range(customers):
+            if max_payments is not None and counts["payments"] >= max_payments:
+                break
+
+            customer_id = uuid.uuid4()
+            customer_rows.append({
+                "id": customer_id,
+                "name": f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}",
+                "phone": f"9{rnd.randrange(10**9):09d}",
+                "address": f"{rnd.randrange(1, 999)} {rnd.choice(STREETS)}, {rnd.choice(TOWNS)}",
+                "id_proof_url": f"https://example.com/id-proofs/{customer_id}.jpg",
+                "status": "active",
+                "created_at": now - timedelta(seconds=customers - c),
+            })
+            counts["customers"] += 1
+
+            for _ in range(loans_per_customer):
+                frequency = rnd.choice(frequencies)
+                installments = INSTALLMENTS[frequency]
+                installment_amount = Decimal(rnd.choice(INSTALLMENT_AMOUNTS))
+                total_amount = installment_amount * installments
+                start_date = today - timedelta(days=rnd.randrange(1, 400))
+                end_date = installment_due_date(start_date, frequency, installments)
+
+                draw = rnd.random()
+                if draw < default_ratio:
+                    profile = "defaulter"
+                elif draw < default_ratio + late_ratio:
+                    profile = "late"
+                else:
+                    profile = "on_time"
+
+                loan_id = uuid.uuid4()
+                loan_rows.append({
+                    "id": loan_id,
+                    "customer_id": customer_id,
+                    "principal_amount": total_amount * Decimal("0.8"),
+                    "interest_amount": total_amount * Decimal("0.2"),
+                    "total_amount": total_amount,
+                    "installment_amount": installment_amount,
+                    "number_of_installments": installments,
+                    "loan_duration_days": (end_date - start_date).days,
+                    "repayment_frequency": frequency,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "status": "active",
+                    "created_at": now - timedelta(seconds=rnd.randrange(10**7)),
+                })
+                counts["loans"] += 1
+                event_rows.append({
+                    "loan_id": loan_id,
+                    "event_type": "disbursement",
+                    "amount": total_amount,
+                    "event_date": start_date,
+                    "payment_id": None,
+                    "created_at": now,
+                })
+
+                dates = _payment_dates(
+                    rnd, profile, start_date, frequency, installments, payments_per_loan, today
+                )
+                for payment_date in dates:
+                    payment_id = uuid.uuid4()
+                    payment_rows.append({
+                        "id": payment_id,
+                        "loan_id": loan_id,
+                        "paid_amount": installment_amount,
+                        "payment_date": payment_date,
+                        "collector_id": None,
+                        "created_at": now,
+                    })
+                    event_rows.append({
+                        "loan_id": loan_id,
+                        "event_type": "payment",
+                        "amount": installment_amount,
+                        "event_date": payment_date,
+                        "payment_id": payment_id,
+                        "created_at": now,
+                    })
+                counts["payments"] += len(dates)
+
+                paid = installment_amount * len(dates)
+                if paid >= total_amount:
+                    loan_rows[-1]["status"] = "completed"
+                balance_rows.append({
+                    "loan_id": loan_id,
+                    "total_paid": paid,
+                    "payment_count": len(dates),
+                    "last_payment_date": max(dates, default=None),
+                    "remaining_amount": total_amount - paid,
+                })
+
+            if len(payment_rows) >= BATCH_SIZE:
+                _flush(connection, models.Customer.__table__, customer_rows)
+                _flush(connection, models.Loan.__table__, loan_rows)
+                _flush(connection, models.Payment.__table__, payment_rows)
+                _flush(connection, models.LoanBalance.__table__, balance_rows)
+                _flush(connection, models.LoanEvent.__table__, event_rows)
+
+        _flush(connection, models.Customer.__table__, customer_rows)
+        _flush(connection, models.Loan.__table__, loan_rows)
+        _flush(connection, models.Payment.__table__, payment_rows)
+        _flush(connection, models.LoanBalance.__table__, balance_rows)
+        _flush(connection, models.LoanEvent.__table__, event_rows)
+
+    with Session(bind) as db:
+        rebuild_profiles(db)
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--loans-per-customer", type=int, default=2)
+    parser.add_argument("--payments-per-loan", type=int, default=20)
+    parser.add_argument("--frequency", choices=list(INSTALLMENTS), action="append",
+                        help="Repayment frequency to generate (repeatable; default all)")
+    parser.add_argument("--late-ratio", type=float, default=0.25, help="Share of late payers")
+    parser.add_argument("--default-ratio", type=float, default=0.05, help="Share of defaulters")
+    parser.add_argument("--max-payments", type=int, default=None, help="Stop once this many payments exist")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    counts = seed(
+        args.customers,
+        args.loans_per_customer,
+        args.payments_per_loan,
+        args.seed,
+        frequencies=tuple(args.frequency or INSTALLMENTS),
+        late_ratio=args.late_ratio,
+        default_ratio=args.default_ratio,
+        max_payments=args.max_payments,
+    )
+    print(", ".join(f"{count} {name}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
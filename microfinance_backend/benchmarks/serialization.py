@@ -0,0 +1,110 @@
+"""
+Serialization cost of a customer ledger with many payments.
+
+    python -m microfinance_backend.benchmarks.serialization --payments 5000
+
+No database: a synthetic ledger is rendered the old way (floats and str()
+per field, then jsonable_encoder and json.dumps via JSONResponse) and the
+new way (Decimal/UUID/date values straight into FastJSONResponse).
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from ..app.utils.serialization import FastJSONResponse
+
+
+def make_ledger(payments: int, loans: int):
+    start = date(2025, 1, 1)
+    ledger = []
+    per_loan = payments // loans
+    for _ in range(loans):
+        ledger.append({
+            "loan_id": uuid.uuid4(),
+            "principal_amount": Decimal("8000.00"),
+            "interest_amount": Decimal("2000.00"),
+            "total_amount": Decimal("10000.00"),
+            "installment_amount": Decimal("100.00"),
+            "number_of_installments": 100,
+            "installments_paid": per_loan,
+            "installments_remaining": 100 - per_loan,
+            "total_paid": Decimal("100.00") * per_loan,
+            "remaining_amount": Decimal("10000.00") - Decimal("100.00") * per_loan,
+            "start_date": start,
+            "end_date": start + timedelta(days=100),
+            "last_payment_date": start + timedelta(days=per_loan),
+            "next_due_date": start + timedelta(days=per_loan + 1),
+            "is_overdue": False,
+            "overdue_days": 0,
+            "status": "active",
+            "payments": [
+                {
+                    "payment_id": uuid.uuid4(),
+                    "amount": Decimal("100.00"),
+                    "date": start + timedelta(days=k),
+                    "notes": None,
+                }
+                for k in range(per_loan)
+            ],
+        })
+    return {"customer_id": uuid.uuid4(), "customer_name": "Bench", "customer_phone": "9000000000", "ledger": ledger}
+
+
+def old_path(body):
+    # What the endpoints used to do: convert by hand, then jsonable_encoder
+    shaped = {
+        **body,
+        "customer_id": str(body["customer_id"]),
+        "ledger": [
+            {
+                **{k: float(v) if isinstance(v, Decimal) else v for k, v in loan.items()},
+                "loan_id": str(loan["loan_id"]),
+                "payments": [
+                    {"payment_id": str(p["payment_id"]), "amount": float(p["amount"]), "date": p["date"], "notes": p["notes"]}
+                    for p in loan["payments"]
+                ],
+            }
+            for loan in body["ledger"]
+        ],
+    }
+    return JSONResponse(jsonable_encoder(shaped)).body
+
+
+def new_path(body):
+    return FastJSONResponse(body).body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payments", type=int, default=5000)
+    parser.add_argument("--loans", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    body = make_ledger(args.payments, args.loans)
+
+    print(f"ledger with {args.payments} payments over {args.loans} loans")
+    print(f"{'path':<34} {'median ms':>10} {'bytes':>9}")
+    medians = {}
+    for name, render in (("dicts + jsonable_encoder + json", old_path), ("pre-shaped rows + orjson", new_path)):
+        render(body)
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            payload = render(body)
+            samples.append((time.perf_counter() - started) * 1000)
+        medians[name] = statistics.median(samples)
+        print(f"{name:<34} {medians[name]:>10.2f} {len(payload):>9}")
+
+    old, new = medians.values()
+    print(f"speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""initial schema
+
+The baseline tables, exactly as `Base.metadata.create_all` made them before
+migrations were introduced. Databases created that way already have them;
+tables that exist are left alone, so `alembic upgrade head` (the Procfile
+release step) runs on those databases as well as on empty ones.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_initial_schema"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "customers" not in existing:
+        op.create_table(
+            "customers",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("phone", sa.String(), nullable=False),
+            sa.Column("address", sa.String(), nullable=True),
+            sa.Column("id_proof_url", sa.String(), nullable=True),
+            sa.Column("status", sa.String(), nullable=False, server_default="active"),
+            sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "loan_plans" not in existing:
+        op.create_table(
+            "loan_plans",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("plan_name", sa.String(), nullable=False),
+            sa.Column("payment_frequency", sa.String(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "loans" not in existing:
+        op.create_table(
+            "loans",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("customer_id", sa.Uuid(), sa.ForeignKey("customers.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("principal_amount", sa.Numeric(14, 2), nullable=False),
+            sa.Column("interest_amount", sa.Numeric(14, 2), nullable=False),
+            sa.Column("total_amount", sa.Numeric(14, 2), nullable=False),
+            sa.Column("installment_amount", sa.Numeric(14, 2), nullable=False),
+            sa.Column("number_of_installments", sa.Integer(), nullable=False),
+            sa.Column("loan_duration_days", sa.Integer(), nullable=False),
+            sa.Column("repayment_frequency", sa.String(), nullable=False),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False, server_default="active"),
+            sa.Column("notes", sa.String(), nullable=True),
+            sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "payments" not in existing:
+        op.create_table(
+            "payments",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("loan_id", sa.Uuid(), sa.ForeignKey("loans.id", ondelete="CASCADE")),
+            sa.Column("paid_amount", sa.Numeric(14, 2), nullable=False),
+            sa.Column("payment_date", sa.Date(), nullable=False),
+            sa.Column("collector_id", sa.Uuid(), nullable=True),
+            sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+            sa.Column("notes", sa.String(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("payments")
+    op.drop_table("loans")
+    op.drop_table("loan_plans")
+    op.drop_table("customers")
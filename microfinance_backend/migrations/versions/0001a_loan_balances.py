@@ -0,0 +1,60 @@
+"""loan_balances table
+
+Running per-loan payment totals. Created unless a `create_all` database
+already has it, then every loan without a row is backfilled from its
+payments in one INSERT ... SELECT.
+
+Revision ID: 0001a_loan_balances
+Revises: 0001_initial_schema
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a_loan_balances"
+down_revision: Union[str, Sequence[str], None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "loan_balances" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "loan_balances",
+            sa.Column("loan_id", sa.Uuid(), sa.ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("total_paid", sa.Numeric(14, 2), nullable=False, server_default="0"),
+            sa.Column("payment_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("last_payment_date", sa.Date(), nullable=True),
+            sa.Column("remaining_amount", sa.Numeric(14, 2), nullable=False),
+            sa.Column("updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+        )
+
+    op.execute(
+        """
+        INSERT INTO loan_balances (loan_id, total_paid, payment_count, last_payment_date, remaining_amount)
+        SELECT loans.id,
+               COALESCE(paid.total_paid, 0),
+               COALESCE(paid.payment_count, 0),
+               paid.last_payment_date,
+               loans.total_amount - COALESCE(paid.total_paid, 0)
+        FROM loans
+        LEFT JOIN (
+            SELECT loan_id,
+                   SUM(paid_amount) AS total_paid,
+                   COUNT(*) AS payment_count,
+                   MAX(payment_date) AS last_payment_date
+            FROM payments
+            GROUP BY loan_id
+        ) AS paid ON paid.loan_id = loans.id
+        WHERE NOT EXISTS (SELECT 1 FROM loan_balances WHERE loan_balances.loan_id = loans.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("loan_balances")
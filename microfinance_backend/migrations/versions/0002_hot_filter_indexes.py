@@ -0,0 +1,42 @@
+"""indexes for the hot filter columns
+
+Covers the columns the ledger, summary, collection, dashboard and keyset
+pagination queries filter and sort on. On Postgres the indexes are built
+CONCURRENTLY so a live book is not locked while they build.
+
+Revision ID: 0002_hot_filter_indexes
+Revises: 0001a_loan_balances
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_hot_filter_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001a_loan_balances"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_payments_loan_id_payment_date", "payments", ["loan_id", "payment_date"]),
+    ("ix_payments_payment_date", "payments", ["payment_date"]),
+    ("ix_loans_customer_id", "loans", ["customer_id"]),
+    ("ix_loans_status_end_date", "loans", ["status", "end_date"]),
+    ("ix_loans_created_at_id", "loans", ["created_at", "id"]),
+    ("ix_customers_created_at_id", "customers", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
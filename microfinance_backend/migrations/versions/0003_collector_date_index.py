@@ -0,0 +1,40 @@
+"""index payments by collector and date
+
+Backs the collector filter of GET /collections.
+
+Revision ID: 0003_collector_date_index
+Revises: 0002_hot_filter_indexes
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_collector_date_index"
+down_revision: Union[str, Sequence[str], None] = "0002_hot_filter_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_payments_collector_id_payment_date",
+            "payments",
+            ["collector_id", "payment_date"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_payments_collector_id_payment_date",
+            table_name="payments",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,60 @@
+"""customer search indexes
+
+Postgres: pg_trgm GIN indexes on name and address for substring / fuzzy
+matches, and a pattern-ops btree on phone for prefix lookups. Other
+databases get plain btree indexes under the same names, as declared on
+the Customer model.
+
+Revision ID: 0004_customer_search_indexes
+Revises: 0003_collector_date_index
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_customer_search_indexes"
+down_revision: Union[str, Sequence[str], None] = "0003_collector_date_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        op.create_index("ix_customers_name_trgm", "customers", ["name"], if_not_exists=True)
+        op.create_index("ix_customers_address_trgm", "customers", ["address"], if_not_exists=True)
+        op.create_index("ix_customers_phone_prefix", "customers", ["phone"], if_not_exists=True)
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_customers_name_trgm", "customers", ["name"],
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_customers_address_trgm", "customers", ["address"],
+            postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_customers_phone_prefix", "customers", ["phone"],
+            postgresql_ops={"phone": "varchar_pattern_ops"},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    names = ("ix_customers_phone_prefix", "ix_customers_address_trgm", "ix_customers_name_trgm")
+    if op.get_context().dialect.name != "postgresql":
+        for name in names:
+            op.drop_index(name, table_name="customers", if_exists=True)
+        return
+
+    with op.get_context().autocommit_block():
+        for name in names:
+            op.drop_index(name, table_name="customers", postgresql_concurrently=True, if_exists=True)
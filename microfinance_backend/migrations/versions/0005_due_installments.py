@@ -0,0 +1,45 @@
+"""due_installments table
+
+Precomputed daily due list, read by GET /collections/due.
+
+Revision ID: 0005_due_installments
+Revises: 0004_customer_search_indexes
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_due_installments"
+down_revision: Union[str, Sequence[str], None] = "0004_customer_search_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "due_installments",
+        sa.Column("due_date", sa.Date(), primary_key=True),
+        sa.Column("loan_id", sa.Uuid(), sa.ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("customer_id", sa.Uuid(), nullable=False),
+        sa.Column("collector_id", sa.Uuid(), nullable=True),
+        sa.Column("installment_no", sa.Integer(), nullable=False),
+        sa.Column("installment_amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("amount_due", sa.Numeric(14, 2), nullable=False),
+        sa.Column("remaining_amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("computed_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_due_installments_due_date_collector_id",
+        "due_installments",
+        ["due_date", "collector_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_due_installments_due_date_collector_id", table_name="due_installments")
+    op.drop_table("due_installments")
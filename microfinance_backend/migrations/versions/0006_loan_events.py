@@ -0,0 +1,88 @@
+"""loan_events and loan_snapshots tables
+
+Append-only loan event log with periodic per-loan snapshots. Existing loans
+and payments are backfilled as events, and fully paid loans are marked
+completed. Snapshots are written on demand; run
+`python -m microfinance_backend.app.cli snapshot-loans` once after upgrading
+so existing loans do not replay their whole history.
+
+Revision ID: 0006_loan_events
+Revises: 0005_due_installments
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_loan_events"
+down_revision: Union[str, Sequence[str], None] = "0005_due_installments"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EventId = sa.BigInteger().with_variant(sa.Integer(), "sqlite")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "loan_events",
+        sa.Column("id", EventId, primary_key=True, autoincrement=True),
+        sa.Column("loan_id", sa.Uuid(), sa.ForeignKey("loans.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("event_date", sa.Date(), nullable=False),
+        sa.Column("payment_id", sa.Uuid(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_loan_events_loan_id_id", "loan_events", ["loan_id", "id"])
+
+    op.create_table(
+        "loan_snapshots",
+        sa.Column("loan_id", sa.Uuid(), sa.ForeignKey("loans.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("last_event_id", EventId, nullable=False),
+        sa.Column("total_paid", sa.Numeric(14, 2), nullable=False),
+        sa.Column("payment_count", sa.Integer(), nullable=False),
+        sa.Column("installments_paid", sa.Integer(), nullable=False),
+        sa.Column("remaining_amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+
+    # Replay order is event id, so disbursements go in first and payments by date
+    op.execute(
+        """
+        INSERT INTO loan_events (loan_id, event_type, amount, event_date, created_at)
+        SELECT id, 'disbursement', total_amount, start_date, COALESCE(created_at, CURRENT_TIMESTAMP)
+        FROM loans
+        ORDER BY created_at, id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO loan_events (loan_id, event_type, amount, event_date, payment_id, created_at)
+        SELECT loan_id, 'payment', paid_amount, payment_date, id, COALESCE(created_at, CURRENT_TIMESTAMP)
+        FROM payments
+        WHERE loan_id IS NOT NULL
+        ORDER BY payment_date, created_at, id
+        """
+    )
+    # Paid totals come from payments: loan_balances may not hold a row for
+    # every loan that existed before it
+    op.execute(
+        """
+        UPDATE loans SET status = 'completed'
+        WHERE status = 'active'
+          AND total_amount <= (
+            SELECT COALESCE(SUM(paid_amount), 0) FROM payments WHERE payments.loan_id = loans.id
+          )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("loan_snapshots")
+    op.drop_index("ix_loan_events_loan_id_id", table_name="loan_events")
+    op.drop_table("loan_events")
@@ -0,0 +1,44 @@
+"""customer_profiles table
+
+Per-customer exposure and repayment aggregates, served by
+GET /customers/{id}/profile and checked by loan creation. Existing
+customers are backfilled on first use; run
+`python -m microfinance_backend.app.cli rebuild-profiles` after upgrading
+to build them all at once.
+
+Revision ID: 0009_customer_profiles
+Revises: 0008_jobs
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_customer_profiles"
+down_revision: Union[str, Sequence[str], None] = "0008_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "customer_profiles",
+        sa.Column("customer_id", sa.Uuid(), sa.ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("active_exposure", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("lifetime_borrowed", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("lifetime_repaid", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("payment_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("on_time_payments", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_days_late", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("active_loans", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed_loans", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("customer_profiles")
@@ -0,0 +1,41 @@
+"""due_list_builds table
+
+Records which dates have a built due list, so GET /collections/due can
+tell "nothing due" from "not built" without building anything itself.
+Dates already in due_installments are recorded as built.
+
+Revision ID: 0010_due_list_builds
+Revises: 0009_customer_profiles
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_due_list_builds"
+down_revision: Union[str, Sequence[str], None] = "0009_customer_profiles"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "due_list_builds",
+        sa.Column("due_date", sa.Date(), primary_key=True),
+        sa.Column("loans_due", sa.Integer(), nullable=False),
+        sa.Column("built_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now()),
+    )
+    op.execute(
+        """
+        INSERT INTO due_list_builds (due_date, loans_due)
+        SELECT due_date, COUNT(*) FROM due_installments GROUP BY due_date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("due_list_builds")
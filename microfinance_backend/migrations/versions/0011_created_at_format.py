@@ -0,0 +1,37 @@
+"""one created_at format for keyset pagination on SQLite
+
+SQLite keeps timestamps as text. Rows filled in by CURRENT_TIMESTAMP have
+no fraction while rows written by the app have six digits, so the cursor
+seek on (created_at, id) would compare two formats. Pads the older rows of
+the keyed tables; new rows are written with six digits (stored_now).
+Nothing to do on other databases.
+
+Revision ID: 0011_created_at_format
+Revises: 0010_due_list_builds
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_created_at_format"
+down_revision: Union[str, Sequence[str], None] = "0010_due_list_builds"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("customers", "loans")
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "sqlite":
+        return
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+
+def downgrade() -> None:
+    # Padded values are valid timestamps in the old format too
+    pass
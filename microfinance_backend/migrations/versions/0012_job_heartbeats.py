@@ -0,0 +1,30 @@
+"""jobs.heartbeat_at
+
+Running jobs are stamped by the process that runs them, so the stale sweep
+only fails jobs whose process is gone, not slow ones.
+
+Revision ID: 0012_job_heartbeats
+Revises: 0011_created_at_format
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012_job_heartbeats"
+down_revision: Union[str, Sequence[str], None] = "0011_created_at_format"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("heartbeat_at", sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs") as batch:
+        batch.drop_column("heartbeat_at")